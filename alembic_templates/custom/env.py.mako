@@ -61,6 +61,13 @@ def add_column(context, revision, op):
 				alembic.operations.ops.AlterColumnOp(op.table_name, column.name, modify_nullable = False, existing_type = column.type)
 			]
 
+def include_object(item, name, type_, reflected, compare_to):
+	"""Leaves out relations used internally by the database API, which are prefixed with '_db_'."""
+
+	if ((type_ == "table") and name.startswith("_db_")):
+		return False
+	return True
+
 def run_migrations_offline():
 	"""Run migrations in 'offline' mode.
 
@@ -74,7 +81,7 @@ def run_migrations_offline():
 
 	"""
 	url = config.get_main_option("sqlalchemy.url")
-	alembic.context.configure(url = url, target_metadata = target_metadata, literal_binds = True, process_revision_directives = writer)
+	alembic.context.configure(url = url, target_metadata = target_metadata, literal_binds = True, process_revision_directives = writer, include_object = include_object)
 
 	with alembic.context.begin_transaction():
 		alembic.context.run_migrations()
@@ -97,6 +104,7 @@ def run_migrations_online():
 			connection = connection,
 			target_metadata = target_metadata,
 			process_revision_directives = writer,
+			include_object = include_object,
 			render_as_batch=config.get_main_option('sqlalchemy.url').startswith('sqlite:///'),
 		)
 
@@ -14,8 +14,16 @@ import shutil
 
 import io
 import enum
+import array
 import types
+import queue
+import random
+import sqlite3
+import struct
+import hashlib
+import tempfile
 import decimal
+import weakref
 import subprocess
 
 # #Utility Modules
@@ -30,22 +38,15 @@ import contextlib
 import collections
 
 import inspect
-import unidecode
 import importlib
+import concurrent.futures
 
 import urllib
 import sqlalchemy
-import sqlalchemy_utils
 import sqlalchemy.ext.declarative
 
-import alembic
-import alembic.config
-import alembic.command
-from alembic.config import Config as alembic_config_Config
-
 #For multi-threading
 import threading
-from forks.pypubsub.src.pubsub import pub as pubsub_pub #Use my own fork
 
 import MyUtilities.common
 import MyUtilities.logger
@@ -54,8 +55,94 @@ import MyUtilities.caching
 from API_Database.utilities import json
 import API_Database.db_config as db_config
 
+#Optional Modules
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+class LazyModule():
+	"""Stands in for a module that is only imported the first time one of its attributes is used.
+	This keeps importing this module (and starting short-lived processes) cheap.
+
+	Example Input: LazyModule("unidecode")
+	Example Input: LazyModule("alembic", include = ("alembic.config", "alembic.command"))
+	"""
+
+	def __init__(self, name, include = ()):
+		self._name = name
+		self._include = include
+		self._module = None
+
+	def _load(self):
+		if (self._module is None):
+			module = importlib.import_module(self._name)
+			for name in self._include:
+				importlib.import_module(name)
+			self._module = module
+		return self._module
+
+	def __getattr__(self, key):
+		return getattr(self._load(), key)
+
+#Lazy Modules
+unidecode = LazyModule("unidecode")
+sqlalchemy_utils = LazyModule("sqlalchemy_utils")
+pubsub_pub = LazyModule("forks.pypubsub.src.pubsub.pub") #Use my own fork
+alembic = LazyModule("alembic", include = ("alembic.config", "alembic.command", "alembic.migration", "alembic.autogenerate", "alembic.operations", "alembic.util"))
+
 sessionMaker = sqlalchemy.orm.sessionmaker(autoflush = False)
 
+#Labels a session finds or adds are kept in 'session.info' until they are committed, since other threads must not see rows that may be rolled back
+labelCachePending = weakref.WeakKeyDictionary() #{connection: {relationHandle: {label: primary key}}}; for sessions that joined a transaction that is still open
+labelCacheWatching = weakref.WeakSet()
+
+def shareLabelCache(catalogue):
+	for relationHandle, labelCache in catalogue.items():
+		relationHandle.getLabelCache().update(labelCache)
+
+def shareLabelCache_connection(connection, catalogue):
+	"""Shares the labels in 'catalogue' once the transaction on 'connection' is committed, and forgets them if it is rolled back."""
+
+	pending = labelCachePending.setdefault(connection, {})
+	for relationHandle, labelCache in catalogue.items():
+		pending.setdefault(relationHandle, {}).update(labelCache)
+
+	if (connection in labelCacheWatching):
+		return
+
+	def onCommit(_connection):
+		shareLabelCache(labelCachePending.pop(connection, {}))
+
+	def onRollback(_connection, *args):
+		labelCachePending.pop(connection, None)
+
+	labelCacheWatching.add(connection)
+	sqlalchemy.event.listen(connection, "commit", onCommit)
+	sqlalchemy.event.listen(connection, "rollback", onRollback)
+	sqlalchemy.event.listen(connection, "rollback_savepoint", onRollback)
+
+@sqlalchemy.event.listens_for(sessionMaker, "after_commit")
+def shareLabelCache_commit(session):
+	catalogue = session.info.pop("labelCache", None)
+	if (not catalogue):
+		return
+
+	connection = session.bind
+	if (isinstance(connection, sqlalchemy.engine.Connection) and connection.in_transaction()):
+		#The session joined a transaction that is not done yet; see: Database.shareConnection()
+		shareLabelCache_connection(connection, catalogue)
+		return
+	shareLabelCache(catalogue)
+
+@sqlalchemy.event.listens_for(sessionMaker, "after_rollback")
+def clearLabelCache_rollback(session):
+	session.info.pop("labelCache", None)
+
+#Relations used by this module are prefixed with 'internalPrefix' so they can be told apart from the schema
+internalPrefix = "_db_"
+internalMetadata = sqlalchemy.MetaData()
+
 NULL = MyUtilities.common.NULL
 NULL_private = MyUtilities.common.Singleton("NULL", state = False, private = True)
 openPlus = MyUtilities.common.openPlus
@@ -65,14 +152,16 @@ openPlus = MyUtilities.common.openPlus
 	# pyyaml
 	# pyodbc
 	# alembic
-	# unidecode
+	# unidecode (lazy)
 	# sqlalchemy
-	# sqlalchemy_utils
+	# sqlalchemy_utils (lazy)
 
 	# pynsist
 	# wxPython
 	# cachetools
 
+	# numpy (optional; used for columnar results)
+
 ##MySQL Installer #https://dev.mysql.com/downloads/installer/
 	# MySQL Server
 	# Connector/Python (3.6)
@@ -125,6 +214,39 @@ class Iterator(object):
 			return self.data[key]
 
 #Decorators
+def wrap_schemaCache(cache):
+	"""Caches what a Database method returns until the schema of that database changes.
+	Entries are keyed by the instance and its schema epoch, so one cache can be shared by every instance.
+
+	cache (LFUCache) - Where to keep the answers
+
+	Example Usage: @wrap_schemaCache(cache_attributes)
+	"""
+
+	def decorator(function):
+		@functools.wraps(function)
+		def wrapper(self, *args, **kwargs):
+			try:
+				key = (self.cacheToken, self.getSchemaEpoch(), function.__name__, self._freeze(args), self._freeze(sorted(kwargs.items())))
+				hash(key)
+			except TypeError:
+				return function(self, *args, **kwargs)
+
+			try:
+				return cache[key]
+			except KeyError:
+				pass
+
+			answer = function(self, *args, **kwargs)
+			try:
+				cache[key] = answer
+			except ValueError:
+				#The answer is too large for the cache
+				pass
+			return answer
+		return wrapper
+	return decorator
+
 def wrap_errorCheck(fileName = "error_log.log", timestamp = True, raiseError = True):
 	def decorator(function):
 		@functools.wraps(function)
@@ -167,13 +289,82 @@ def wrap_errorCheck(fileName = "error_log.log", timestamp = True, raiseError = T
 					traceback.print_exc()
 
 				if (raiseError):
-					self.closeDatabase()
+					#Changes waiting for saveDatabase() are kept; the failed call was already undone by its savepoint, see: wrap_applyChanges()
 					raise error
 
 			return answer
 		return wrapper
 	return decorator
 
+def wrap_retry():
+	def decorator(function):
+		@functools.wraps(function)
+		def wrapper(self, *args, **kwargs):
+			"""Runs the function again if another process has the database locked.
+			The whole function is repeated, so its transaction starts over; see: Database._retryLocked().
+
+			Example Usage: @wrap_retry()
+			"""
+
+			return self._retryLocked(function, self, *args, **kwargs)
+		return wrapper
+	return decorator
+
+def wrap_applyChanges():
+	def decorator(function):
+		signature = inspect.signature(function)
+
+		@functools.wraps(function)
+		def wrapper(self, *args, **kwargs):
+			"""Keeps changes in a pending transaction until saveDatabase() is called if 'applyChanges' (or the default from openDatabase()) is False.
+			Inside of transaction(), the changes are saved when the with block is done instead.
+
+			Example Usage: @wrap_applyChanges()
+			"""
+
+			if (getattr(self.activeConnection, "connection", None) is not None):
+				return function(self, *args, **kwargs)
+
+			applyChanges = signature.bind_partial(self, *args, **kwargs).arguments.get("applyChanges")
+			if (applyChanges is None):
+				applyChanges = self.defaultCommit
+
+			if (not applyChanges):
+				#Each call gets its own savepoint, so one that fails part way through does not leave half of its changes to be saved
+				savepoint = self._getPendingConnection().begin_nested()
+				try:
+					answer = function(self, *args, **kwargs)
+				except:
+					if (savepoint.is_active):
+						savepoint.rollback()
+					raise
+				if (savepoint.is_active):
+					savepoint.commit()
+				return answer
+
+			answer = function(self, *args, **kwargs)
+			self.saveDatabase()
+			return answer
+		return wrapper
+	return decorator
+
+def wrap_writeBehind():
+	def decorator(function):
+		@functools.wraps(function)
+		def wrapper(self, *args, **kwargs):
+			"""Hands the function to the write queue if one is running, and returns a future for its answer; see: Database.startWriteQueue().
+
+			Example Usage: @wrap_writeBehind()
+			"""
+
+			writeQueue = self.writeQueue
+			if ((writeQueue is None) or writeQueue.isWriter() or (self.getActiveConnection() is not None)):
+				return function(self, *args, **kwargs)
+
+			return writeQueue.submit(function, self, *args, **kwargs)
+		return wrapper
+	return decorator
+
 sqlalchemy.sql.sqltypes.json._default_encoder = json._default_encoder
 sqlalchemy.sql.sqltypes.json._default_decoder = json._default_decoder
 
@@ -201,6 +392,16 @@ class _JSON(sqlalchemy.TypeDecorator):
 		except (ValueError, TypeError):
 			return None
 
+class ColumnArray(array.array):
+	"""A typed column of values for getValue(columnar = True).
+	Rows that were NULL hold 0 and are marked in 'mask'.
+	"""
+
+	def __new__(cls, typecode, *args):
+		self = super().__new__(cls, typecode, *args)
+		self.mask = None
+		return self
+
 #Utility Classes
 class Base(MyUtilities.common.EnsureFunctions, MyUtilities.common.CommonFunctions):
 	pass
@@ -254,6 +455,27 @@ class Base_Database(Base):
 		dataType_catalogue["smallint"], 
 	)
 
+	#Which array typecode holds each data type for columnar results; checked in order, so subclasses go first
+	dataType_array = (
+		(dataType_catalogue[bool].__class__, "b"),
+		(dataType_catalogue["smallint"], "h"),
+		(dataType_catalogue["bigint"], "q"),
+		(dataType_catalogue[int], "q"),
+		(dataType_catalogue[float].__class__, "d"),
+	)
+
+	@classmethod
+	def getArrayTypecode(cls, dataType):
+		"""Returns which array typecode can hold values of 'dataType'.
+		Returns None if they need to be kept as python objects.
+
+		Example Input: getArrayTypecode(sqlalchemy.Integer())
+		"""
+
+		for _dataType, typecode in cls.dataType_array:
+			if (isinstance(dataType, _dataType)):
+				return typecode
+
 	@classmethod
 	def getPrimaryKey(cls, relationHandle = None):
 		if (relationHandle is None):
@@ -313,6 +535,10 @@ class Base_Database(Base):
 		#sqlalchemy.Enum #use: https://docs.sqlalchemy.org/en/latest/core/type_basics.html#sqlalchemy.types.Enum
 		#money #use: https://docs.sqlalchemy.org/en/latest/core/type_basics.html#sqlalchemy.types.Numeric
 
+		if ((dataType == "int_unsigned") and (dataType not in cls.dataType_catalogue)):
+			#The MySQL dialect is only imported if it is needed
+			cls.dataType_catalogue["int_unsigned"] = importlib.import_module("sqlalchemy.dialects.mysql").INTEGER(unsigned = True)
+
 		if (dataType in cls.dataType_catalogue):
 			dataType = cls.dataType_catalogue[dataType]
 		elif (dataType.__class__ is enum.EnumMeta):
@@ -372,6 +598,24 @@ class Base_Database(Base):
 	def printSQL(cls, query):
 		print(sqlalchemy_utils.functions.render_statement(query))
 
+	@classmethod
+	def yieldBatch(cls, rows, batchSize = None):
+		"""Yields lists of at most 'batchSize' items from 'rows'.
+
+		batchSize (int) - How many items to put in each list
+			- If None: Will put all items in one list
+
+		Example Input: yieldBatch(rows)
+		Example Input: yieldBatch(rows, 1000)
+		"""
+
+		iterator = iter(rows)
+		while True:
+			batch = list(itertools.islice(iterator, batchSize))
+			if (not batch):
+				return
+			yield batch
+
 class MyColumn(sqlalchemy.Column):
 	def __init__(self, *args, used = None, **kwargs):
 		super().__init__(*args, **kwargs)
@@ -387,10 +631,11 @@ class Utility_Base(Base_Database):
 		"""
 		global sessionMaker
 		
-		session = sessionMaker(bind = self.engine)
+		session = sessionMaker(bind = self.getActiveConnection() or self.engine)
 		try:
 			yield session
-			session.commit()
+			self._dropInListTables(session)
+			self._retryLocked(session.commit)
 		except:
 			session.rollback()
 			raise
@@ -406,19 +651,25 @@ class Utility_Base(Base_Database):
 		raw (bool) - Determiens what module the connection belongs to
 			- If True: 'connection' is from the dialect
 			- If False: 'connection' is from sqlalchemy
+
+		If another connection is being shared on this thread, that connection is used instead and is left for its owner to commit; see: shareConnection()
 		"""
 
+		activeConnection = self.getActiveConnection()
+		if ((activeConnection is not None) and (not raw)):
+			yield activeConnection
+			return
+
+		connection = self._checkoutConnection(raw = raw)
 		if (raw):
-			connection = self.engine.raw_connection()
 			asTransaction = False
-		else:
-			connection = self.engine.connect()
 	
 		if (asTransaction):
 			transaction = connection.begin()
 			try:
 				yield connection
-				transaction.commit()
+				self._dropInListTables(connection)
+				self._retryLocked(transaction.commit)
 			except:
 				transaction.rollback()
 				raise
@@ -431,8 +682,75 @@ class Utility_Base(Base_Database):
 		except:
 			raise
 		finally:
+			if (not raw):
+				self._dropInListTables(connection)
 			connection.close()
 
+	def getActiveConnection(self):
+		"""Returns the connection being shared on this thread, or None; see: shareConnection(), transaction(), saveDatabase()."""
+
+		return getattr(self.activeConnection, "connection", None) or self.pendingConnection.get(threading.get_ident(), (None, None))[0]
+
+	def _getPendingConnection(self):
+		"""Returns the connection holding changes for this thread that have not been saved yet, starting one if needed; see: saveDatabase().
+		These are kept by thread in 'pendingConnection', so closeDatabase() can reach the ones for every thread.
+		"""
+
+		key = threading.get_ident()
+		connection = self.pendingConnection.get(key, (None, None))[0]
+		if (connection is None):
+			connection = self._checkoutConnection()
+			transaction = connection.begin()
+			if (self.isSQLite):
+				#The sqlite3 module waits for the first change to start the transaction; a savepoint made before then would be the transaction, and releasing it would commit
+				connection.connection.execute("BEGIN")
+			with self.threadLock:
+				self.pendingConnection[key] = (connection, transaction)
+		return connection
+
+	def _popPendingConnection(self, key = None):
+		"""Forgets the connection holding changes that have not been saved yet for the thread 'key', and returns it and its transaction.
+
+		key (int) - Which thread to use; see: threading.get_ident()
+			- If None: Will use this thread
+		"""
+
+		with self.threadLock:
+			return self.pendingConnection.pop(threading.get_ident() if (key is None) else key, (None, None))
+
+	@contextlib.contextmanager
+	def shareConnection(self, connection):
+		"""Makes every command on this thread use 'connection' until the with block is done.
+
+		Example Use:
+			with self.makeConnection() as connection:
+				with self.shareConnection(connection):
+					self.addTuple({"Lorem": {"ipsum": 1}})
+					self.addTuple({"Lorem": {"ipsum": 2}})
+		"""
+
+		previous = self.getActiveConnection()
+		self.activeConnection.connection = connection
+		try:
+			yield connection
+		finally:
+			self.activeConnection.connection = previous
+
+	def _checkoutConnection(self, raw = False):
+		"""Returns a connection from the pool, keeping track of how long it took to get one; see: getPoolStats()."""
+
+		start = time.perf_counter()
+		if (raw):
+			connection = self.engine.raw_connection()
+		else:
+			connection = self.engine.connect()
+		duration = time.perf_counter() - start
+
+		with self.threadLock:
+			self.poolStats["waitSeconds"] += duration
+			self.poolStats["longestWait"] = max(self.poolStats["longestWait"], duration)
+		return connection
+
 	def yieldColumn_fromTable(self, relation, catalogueList, exclude, alias, foreignAsDict = False, foreignDefault = None):
 		#Use: https://docs.sqlalchemy.org/en/latest/core/selectable.html#sqlalchemy.sql.expression.except_
 		#Use: https://docs.sqlalchemy.org/en/latest/core/metadata.html#accessing-tables-and-columns
@@ -484,146 +802,757 @@ class Utility_Base(Base_Database):
 				for foreignKey in self.ensure_container(foreignKeyList):
 					yield getattr(table.columns, attribute).label(formatAttribute(foreignKey, attribute))
 
-class Schema_Base(Base_Database):
-	foreignKeys = {}
-	defaultRows = ()
+class IdAllocator(Base):
+	"""Hands out unique values for an attribute of a relation without searching the relation every time.
+	Values are claimed in blocks through '_db_id_allocation', so separate processes never hand out the same value.
+	Gaps are only reused below 'gapLimit', which is where the relation ended before any block was claimed; above it, a gap may be a block another process has not used yet.
+	A block claimed on a caller's connection is only handed out on that connection until its transaction is committed, and is thrown away if it is rolled back.
+	"""
 
-	def __init__(self, kwargs = {}):
-		"""Automatically creates tuples for the provided relations if one does not exist."""
+	relationHandle = sqlalchemy.Table(f"{internalPrefix}id_allocation", internalMetadata,
+		sqlalchemy.Column("relation", sqlalchemy.String(256), primary_key = True),
+		sqlalchemy.Column("attribute", sqlalchemy.String(256), primary_key = True),
+		sqlalchemy.Column("reserved", sqlalchemy.Integer, nullable = False), #Every value below this has been claimed
+		sqlalchemy.Column("gapCursor", sqlalchemy.Integer, nullable = False), #Every gap below this has been claimed
+		sqlalchemy.Column("gapLimit", sqlalchemy.Integer, nullable = False), #Gaps at or above this are never reused
+	)
 
-		session = kwargs.pop("session", None)
+	def __init__(self, bind, relation, attribute, *, usedList = (), blockSize = 100, default = 1):
+		"""
+		bind (Engine) - What to connect with when no connection is given
+		relation (str) - Which relation (table) the values are for
+		attribute (str) - Which attribute (column) the values are for
+		usedList (list) - Other places values cannot come from; [(relation, attribute)]
+		blockSize (int) - How many values to claim at a time
+		default (int) - What value to start at if the relation is empty
 
-		#Increment primary key to lowest unique value
-		index = self.getPrimaryKey()
-		if (index not in kwargs):
-			kwargs[index] = self.uniqueMinimum(relation = self.__tablename__, attribute = index, session = session)
+		Example Input: IdAllocator(engine, "Containers", "id")
+		"""
 
-		if (self.checkUsed(catalogue = kwargs, session = session, autoAdd = True, returnOnPass = True, useForFail = None)):
-			raise ValueExistsError(kwargs)
+		self.bind = bind
+		self.relation = relation
+		self.attribute = attribute
+		self.usedList = tuple(usedList)
+		self.blockSize = blockSize
+		self.default = default
+
+		self.lock = threading.RLock()
+		self.block = collections.deque() #Values whose claim has been committed
+		self.pending = weakref.WeakKeyDictionary() #{connection: values claimed in its transaction}
+		self.watching = weakref.WeakSet()
+		self.gapList = None #[[start, end]] in ascending order; 'end' is not included
+		self.discarded = set()
+		self.explicitTop = default #New blocks start at or above every value that was given explicitly
 
-	@classmethod
-	def uniqueMinimum(cls, relation = None, attribute = None, *, session = None, minimum = None, default = 1, forceAttribute = False):
-		"""Returns the lowest unique value that is greater than the first entry on the table.
-		Special thanks to shamittomar for how to do custom auto-incrementing on https://stackoverflow.com/questions/5016907/mysql-find-smallest-unique-id-available/5016969#5016969
+	@contextlib.contextmanager
+	def _getConnection(self, connection):
+		if (connection is not None):
+			yield connection
+			return
 
-		relation (str) - Which relation (table) to look in
-			- If None: Will use the relation belonging to this class
+		with self.bind.begin() as _connection:
+			yield _connection
 
-		attribute (str) - Which attribute (column) to look in
-			- If None: Will use the primary column
+	def _getWhere(self):
+		return sqlalchemy.and_(self.relationHandle.c.relation == self.relation, self.relationHandle.c.attribute == self.attribute)
 
-		minimum (int) - What value any answer must be greater than or equal to
-			- If None: Will not apply a minimum
+	def _yieldSource(self):
+		for relation, attribute in ((self.relation, self.attribute), *self.usedList):
+			yield sqlalchemy.table(relation, sqlalchemy.column(attribute)).c[attribute]
 
-		default (int) - What value to start at if the relation is empty
+	def rebuild(self, connection = None):
+		"""Searches the relation for gaps below 'gapLimit', and makes sure it has a row in '_db_id_allocation'.
 
-		Example Input: uniqueMinimum()
-		Example Input: uniqueMinimum(relation = "Dictionary")
-		Example Input: uniqueMinimum(relation = "Dictionary", attribute = "pageNumber")
-		"""
+		connection (Connection) - What to run the search on
+			- If None: Will use a new transaction
 
-		def yieldLocation():
-			nonlocal attribute, minimum
+		Example Input: rebuild()
+		"""
 
-			yield f"(t2.{attribute} is NULL)"
-			yield f"(t1.{attribute} > {minimum or 0})"
+		with self.lock, self._getConnection(connection) as _connection:
+			self.relationHandle.create(_connection, checkfirst = True)
+
+			top = self.default
+			for column in self._yieldSource():
+				value = _connection.execute(sqlalchemy.select([sqlalchemy.func.max(column)]).where(column >= self.default)).scalar()
+				if (value is not None):
+					top = max(top, value + 1)
+			for value in self.discarded:
+				top = max(top, value + 1)
+
+			row = _connection.execute(sqlalchemy.select([self.relationHandle.c.reserved, self.relationHandle.c.gapLimit]).where(self._getWhere())).first()
+			if (row is None):
+				gapLimit = top
+				_connection.execute(self.relationHandle.insert().values(relation = self.relation, attribute = self.attribute, reserved = top, gapCursor = self.default, gapLimit = gapLimit))
+			else:
+				reserved, gapLimit = row
+				if (reserved < top):
+					_connection.execute(self.relationHandle.update().where(self._getWhere()).values(reserved = top))
+
+			query = sqlalchemy.union(*(sqlalchemy.select([column.label("value")]).where(sqlalchemy.and_(column >= self.default, column < gapLimit)) for column in self._yieldSource()))
+
+			gapList = []
+			bottom = self.default
+			for (value,) in _connection.execute(query.order_by("value")):
+				if (value > bottom):
+					gapList.append([bottom, value])
+				bottom = value + 1
+			if (bottom < gapLimit):
+				gapList.append([bottom, gapLimit])
+
+			self.gapList = gapList
+			self.block.clear()
+			for value in self.discarded:
+				self._removeGap(value)
+			self.discarded.clear()
+
+	def reset(self, connection = None):
+		"""Forgets all claimed values; use after the relation has been emptied.
+
+		Example Input: reset()
+		"""
 
-			for key, foreignHandle in cls.usedCatalogue.items():
-				yield f"(t1.{attribute} + 1 NOT IN (SELECT {foreignHandle.getPrimaryKey()} FROM {foreignHandle.__tablename__}))"
+		with self.lock, self._getConnection(connection) as _connection:
+			self.relationHandle.create(_connection, checkfirst = True)
+			_connection.execute(self.relationHandle.delete().where(self._getWhere()))
+			self.forget()
 
-		#################################################
+	def forget(self):
+		"""Throws away every value that has not been handed out yet, so the next one is found from the database again.
+		Use this when '_db_id_allocation' may have changed without this allocator knowing, such as after a restore.
 
-		relation = relation or cls.__tablename__
-		attribute = attribute or cls.getPrimaryKey()
+		Example Input: forget()
+		"""
 
-		if (session is not None):
-			#Changes must be applied to account for recently added items
-			session.commit()
+		with self.lock:
+			self.gapList = None
+			self.block.clear()
+			self.pending.clear()
+			self.discarded.clear()
+			self.explicitTop = self.default
 
-		command = f"SELECT MIN(t1.{attribute} + 1) FROM {relation} as t1 "
-		command += f"LEFT JOIN {relation} as t2 ON t1.{attribute} + 1 = t2.{attribute} "
-		command += f"WHERE ({' AND '.join(yieldLocation())})"
+	def next(self, connection = None):
+		"""Returns the next unique value.
 
-		answer = (cls.metadata.bind.execute(command).first() or (None,))[0]
+		connection (Connection) - What to claim a new block on, if one is needed
+			- If None: Will use a new transaction
+			~ Values claimed on 'connection' are only handed out on it until its transaction is committed
 
-		if (answer is None):
-			#There is no available minimum, so get the next maximum
-			command = f"SELECT MAX(t1.answer) FROM (SELECT MAX({attribute} + 1) as answer FROM {relation} "
-			for key, foreignHandle in cls.usedCatalogue.items():
-				command += f"UNION SELECT MAX({foreignHandle.getPrimaryKey()} + 1) as answer FROM {foreignHandle.__tablename__} "
-			command += ") as t1"
-	
-			answer = int((cls.metadata.bind.execute(command).first() or (None,))[0] or default)
-		
-		if ((minimum is not None) and (answer < minimum)):
-			answer = minimum
+		Example Input: next()
+		Example Input: next(session.connection())
+		"""
 
-		if (forceAttribute):
-			return {attribute: answer}
-		return answer
+		with self.lock:
+			if (self.block):
+				return self.block.popleft()
+
+			if (connection is None):
+				if (self.gapList is None):
+					self.rebuild()
+				self.block.extend(self._claimBlock())
+				return self.block.popleft()
+
+			block = self.pending.get(connection)
+			if (not block):
+				if (self.gapList is None):
+					self.rebuild(connection = connection)
+				block = self.pending[connection] = collections.deque(self._claimBlock(connection = connection))
+				self._watchTransaction(connection)
+			return block.popleft()
+
+	def _watchTransaction(self, connection):
+		"""Keeps the values claimed on 'connection' once its transaction is committed, and throws them away if it is rolled back."""
+
+		def onCommit(_connection):
+			with self.lock:
+				self.block.extend(self.pending.pop(connection, ()))
+
+		def onRollback(_connection, *args):
+			#The claim in '_db_id_allocation' was undone, so the gaps have to be found again as well
+			with self.lock:
+				if (self.pending.pop(connection, None) is not None):
+					self.gapList = None
+
+		if (connection in self.watching):
+			return
 
-	@classmethod
-	def checkExists(cls, catalogue = None, *, session = None, forceAttribute = False):
-		"""Returns if the value exists or not.
-		Special thanks to Laurent W for how to quickly check if a row exists on https://stackoverflow.com/questions/1676551/best-way-to-test-if-a-row-exists-in-a-mysql-table/10688065#10688065
+		self.watching.add(connection)
+		sqlalchemy.event.listen(connection, "commit", onCommit)
+		sqlalchemy.event.listen(connection, "rollback", onRollback)
+		sqlalchemy.event.listen(connection, "rollback_savepoint", onRollback)
 
-		catalogue (dict) - {attribute (str): value (any)}
-			- If not dict or None for key: Will check all attributes for the given value
+	def discard(self, value):
+		"""Makes sure 'value' is not handed out; use when a value is given explicitly.
 
-		Example Input: checkExists()
-		Example Input: checkExists({"word": "lorem"})
+		Example Input: discard(1234)
 		"""
 
-		if (session is not None):
-			#Changes must be applied to account for recently added items
-			session.commit()
-
-		answer = {}
-		assert catalogue is not None
-		for attribute, value in cls.ensure_dict(catalogue).items():
-			attribute = cls.ensure_default(attribute, default = cls.getPrimaryKey)
-			answer[attribute] = cls.metadata.bind.execute(f"SELECT EXISTS(SELECT 1 FROM {cls.__tablename__} WHERE ({attribute} = %s) LIMIT 1)", (value,)).first()[0]
+		if (not isinstance(value, int)):
+			return
 
-		if (forceAttribute or (len(answer) is not 1)):
-			return answer
-		else:
-			return next(iter(answer.values()), {})
+		with self.lock:
+			self.explicitTop = max(self.explicitTop, value + 1)
+			if (self.gapList is None):
+				self.discarded.add(value)
+				return
 
-	@classmethod
-	def checkUsed(cls, catalogue = None, *, session = None, autoAdd = False, forceAttribute = False, 
-		returnOnPass = False, returnOnFail = False, useForPass = True, useForFail = False, **kwargs):
-		"""Returns if the given value is used or not.
+			for block in (self.block, *self.pending.values()):
+				try:
+					block.remove(value)
+				except ValueError:
+					pass
+			self._removeGap(value)
+
+	def _removeGap(self, value):
+		for i, (start, end) in enumerate(self.gapList):
+			if (value < start):
+				return
+			if (value >= end):
+				continue
 
-		catalogue (dict) - {attribute (str): value (any)}
-			- If not dict or None for key: Will check all attributes for the given value
+			replacement = [gap for gap in ([start, value], [value + 1, end]) if (gap[0] < gap[1])]
+			self.gapList[i:i + 1] = replacement
+			return
 
-		autoAdd (bool) - Determines if the given value is automatically added to any linked catalogues
-		returnOnPass (bool) - Determines if True should be returned immidiately after a success
-		returnOnFail (bool) - Determines if False should be returned immidiately after a failure
-		
-		useForPass (any) - What should be used to signify a success
-			- If None: Will not record
-		useForFail (any) - What should be used to signify a failure
-			- If None: Will not record
+	def _takeGaps(self, gapCursor, reserved):
+		while (self.gapList and (self.gapList[0][1] <= gapCursor)):
+			self.gapList.pop(0)
+
+		block = []
+		while (self.gapList and (len(block) < self.blockSize)):
+			start, end = self.gapList[0]
+			start = max(start, gapCursor)
+			if (start >= reserved):
+				break
+
+			stop = min(end, reserved, start + self.blockSize - len(block))
+			block.extend(range(start, stop))
+			if (stop >= end):
+				self.gapList.pop(0)
+			else:
+				self.gapList[0][0] = stop
+		return block
 
-		forceAttribute (bool) - Determines if the attribute is returned in the answer
-			- If True: Answers will always contain the attribute
-			- If False: Answers will omit the attribute if there is only one in the answer
+	def _claimBlock(self, connection = None):
+		"""Claims the next block of values in '_db_id_allocation' and returns it.
 
-		Example Input: checkUsed(1234)
-		Example Input: checkUsed({None: 1234})
-		Example Input: checkUsed({"label": 1234})
-		Example Input: checkUsed(kwargs, autoAdd = True)
+		connection (Connection) - What to claim the block on
+			- If None: Will use a new transaction, which is committed before the block is returned
 		"""
 
-		if (not cls.usedCatalogue):
-			if (forceAttribute):
-				return {}
-			return
+		with self._getConnection(connection) as _connection:
+			where = self._getWhere()
 
-		answer = {}
-		catalogue = cls.ensure_dict(catalogue, default = None, useAsKey = False, convertNone = False)
-		for attribute, usedColumn in cls.usedCatalogue.items():
+			#Take the write lock before reading, so no other process can claim the same block
+			_connection.execute(self.relationHandle.update().where(where).values(reserved = self.relationHandle.c.reserved))
+			row = _connection.execute(sqlalchemy.select([self.relationHandle.c.reserved, self.relationHandle.c.gapCursor]).where(where)).first()
+			if (row is None):
+				self.rebuild(connection = _connection)
+				row = _connection.execute(sqlalchemy.select([self.relationHandle.c.reserved, self.relationHandle.c.gapCursor]).where(where)).first()
+			reserved, gapCursor = row
+
+			block = self._takeGaps(gapCursor, reserved)
+			if (block):
+				_connection.execute(self.relationHandle.update().where(where).values(gapCursor = block[-1] + 1))
+			else:
+				reserved = max(reserved, self.explicitTop)
+				block = range(reserved, reserved + self.blockSize)
+				_connection.execute(self.relationHandle.update().where(where).values(reserved = reserved + self.blockSize))
+
+		return block
+
+class WriteQueue(Base):
+	"""Runs write operations for a database on one thread, committing them in groups.
+	Only one thread ever asks for the write lock, and many operations share each commit (and its sync to disk).
+	"""
+
+	def __init__(self, parent, *, maxBatch = 100, maxLatency = 50):
+		"""
+		parent (Database) - Which database to write to
+		maxBatch (int) - The most operations to commit at once
+		maxLatency (int) - The longest to wait for more operations before committing, in milli-seconds
+
+		Example Input: WriteQueue(self)
+		Example Input: WriteQueue(self, maxBatch = 1000, maxLatency = 200)
+		"""
+
+		self.parent = parent
+		self.maxBatch = maxBatch
+		self.maxLatency = maxLatency
+
+		self.stopping = False
+		self.queue = queue.Queue()
+		self.stats = {"operations": 0, "commits": 0, "failures": 0}
+
+		self.thread = threading.Thread(target = self._run, name = "WriteQueue", daemon = True)
+		self.thread.start()
+
+	def isWriter(self):
+		"""Returns if this is being called from the writer thread."""
+
+		return threading.current_thread() is self.thread
+
+	def submit(self, function, *args, **kwargs):
+		"""Queues 'function' to be run on the writer thread.
+		Returns a future that is resolved once the operation has been committed.
+
+		Example Input: submit(myFunction, 1, 2)
+		"""
+
+		if (self.stopping):
+			errorMessage = "The write queue has been stopped"
+			raise RuntimeError(errorMessage)
+
+		future = concurrent.futures.Future()
+		self.queue.put((future, function, args, kwargs))
+		return future
+
+	def flush(self):
+		"""Waits until everything queued so far has been committed.
+
+		Example Input: flush()
+		"""
+
+		if (self.thread.is_alive()):
+			self.submit(lambda: None).result()
+
+	def stop(self, wait = True):
+		"""Stops the writer thread once everything queued so far has been committed.
+
+		wait (bool) - Determines if this waits for the writer thread to finish
+
+		Example Input: stop()
+		"""
+
+		if (not self.stopping):
+			self.stopping = True
+			self.queue.put(None)
+
+		if (wait):
+			self.thread.join()
+
+	def _getBatch(self):
+		"""Waits for an operation, then gathers more until there are 'maxBatch' of them or 'maxLatency' has passed.
+		Returns the operations and if the queue was stopped.
+		"""
+
+		item = self.queue.get()
+		if (item is None):
+			return [], True
+
+		batch = [item]
+		deadline = time.perf_counter() + self.maxLatency / 1000
+		while (len(batch) < self.maxBatch):
+			try:
+				item = self.queue.get(timeout = max(deadline - time.perf_counter(), 0))
+			except queue.Empty:
+				break
+
+			if (item is None):
+				return batch, True
+			batch.append(item)
+
+		return batch, False
+
+	def _runBatch(self, batch):
+		"""Runs every operation in 'batch' in one transaction; nested commands join it instead of starting their own."""
+
+		with self.parent.makeConnection() as connection:
+			with self.parent.shareConnection(connection):
+				return [function(*args, **kwargs) for future, function, args, kwargs in batch]
+
+	def _commit(self, batch):
+		try:
+			answerList = self.parent._retryLocked(self._runBatch, batch)
+		except Exception:
+			#Run each one on its own, so only the callers whose operation failed see an error
+			for item in batch:
+				future = item[0]
+				try:
+					answer = self.parent._retryLocked(self._runBatch, (item,))[0]
+				except Exception as error:
+					self.stats["failures"] += 1
+					future.set_exception(error)
+				else:
+					self.stats["commits"] += 1
+					future.set_result(answer)
+			return
+		
+		self.stats["commits"] += 1
+		for (future, *_), answer in zip(batch, answerList):
+			future.set_result(answer)
+
+	def _run(self):
+		while True:
+			batch, finished = self._getBatch()
+
+			batch = [item for item in batch if item[0].set_running_or_notify_cancel()]
+			if (batch):
+				self.stats["operations"] += len(batch)
+				self._commit(batch)
+
+			if (finished):
+				return
+
+class ResultCache(Base):
+	"""Keeps answers from getValue() until they are too old, are pushed out, or a relation they read from is changed.
+	Each answer is stored with the version of every relation it read from; see: Database.getRelationVersion().
+	Every caller gets its own copy of an answer, so changing it does not change what the next caller gets.
+	"""
+
+	def __init__(self, maxsize = 1000, maxBytes = None, ttl = None):
+		"""
+		maxsize (int) - How many answers to keep; the least recently used are removed first
+		maxBytes (int) - Roughly how much memory the answers may use
+			- If None: Will not limit memory
+		ttl (float) - How many seconds an answer can be used for
+			- If None: Answers are used until something changes
+
+		Example Input: ResultCache()
+		Example Input: ResultCache(maxsize = 100, maxBytes = 10 * 1024 ** 2, ttl = 60)
+		"""
+
+		self.maxsize = maxsize
+		self.maxBytes = maxBytes
+		self.ttl = ttl
+
+		self.lock = threading.RLock()
+		self.catalogue = collections.OrderedDict() #{key: (answer, versions, expires, size)}
+		self.bytes = 0
+
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	@classmethod
+	def getSize(cls, item):
+		"""Returns roughly how many bytes 'item' uses, including what it contains.
+
+		Example Input: getSize(answer)
+		"""
+
+		size = sys.getsizeof(item)
+		if (isinstance(item, dict)):
+			return size + sum(cls.getSize(key) + cls.getSize(value) for key, value in item.items())
+		if (isinstance(item, (list, tuple, set, frozenset))):
+			return size + sum(cls.getSize(value) for value in item)
+		return size
+
+	@classmethod
+	def copy(cls, item):
+		"""Returns a copy of 'item' that shares none of the containers in it.
+
+		Example Input: copy(answer)
+		"""
+
+		if (isinstance(item, dict)):
+			return {key: cls.copy(value) for key, value in item.items()}
+		if (isinstance(item, (list, tuple, set, frozenset))):
+			return type(item)(cls.copy(value) for value in item)
+		return item
+
+	def get(self, key, versions):
+		"""Returns the answer for 'key', or NULL_private if there is not a usable one.
+
+		versions (tuple) - The current version of each relation the answer reads from
+
+		Example Input: get(key, versions)
+		"""
+
+		with self.lock:
+			entry = self.catalogue.get(key)
+			if (entry is not None):
+				answer, _versions, expires, size = entry
+				if ((_versions == versions) and ((expires is None) or (expires > time.monotonic()))):
+					self.catalogue.move_to_end(key)
+					self.hits += 1
+					return self.copy(answer)
+				self._remove(key)
+
+			self.misses += 1
+			return NULL_private
+
+	def set(self, key, answer, versions):
+		"""Keeps 'answer' for 'key' until one of the relations in 'versions' changes.
+
+		Example Input: set(key, answer, versions)
+		"""
+
+		size = self.getSize(answer)
+		if ((self.maxBytes is not None) and (size > self.maxBytes)):
+			return
+
+		answer = self.copy(answer)
+		expires = None if (self.ttl is None) else (time.monotonic() + self.ttl)
+		with self.lock:
+			if (key in self.catalogue):
+				self._remove(key)
+
+			self.catalogue[key] = (answer, versions, expires, size)
+			self.bytes += size
+
+			while ((len(self.catalogue) > self.maxsize) or ((self.maxBytes is not None) and (self.bytes > self.maxBytes))):
+				self._remove(next(iter(self.catalogue)))
+				self.evictions += 1
+
+	def _remove(self, key):
+		entry = self.catalogue.pop(key)
+		self.bytes -= entry[3]
+
+	def clear(self):
+		with self.lock:
+			self.catalogue.clear()
+			self.bytes = 0
+
+	def getInfo(self):
+		with self.lock:
+			return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self.catalogue), "bytes": self.bytes,
+				"maxsize": self.maxsize, "maxBytes": self.maxBytes, "ttl": self.ttl}
+
+class Schema_Base(Base_Database):
+	foreignKeys = {}
+	defaultRows = ()
+
+	def __init__(self, kwargs = {}):
+		"""Automatically creates tuples for the provided relations if one does not exist."""
+
+		session = kwargs.pop("session", None)
+
+		#Increment primary key to lowest unique value
+		index = self.getPrimaryKey()
+		if (index not in kwargs):
+			kwargs[index] = self.getIdAllocator(index).next(connection = None if (session is None) else session.connection())
+		else:
+			self.getIdAllocator(index).discard(kwargs[index])
+
+		if (self.checkUsed(catalogue = kwargs, session = session, autoAdd = True, returnOnPass = True, useForFail = None)):
+			raise ValueExistsError(kwargs)
+
+	@classmethod
+	def uniqueMinimum(cls, relation = None, attribute = None, *, session = None, minimum = None, default = 1, forceAttribute = False):
+		"""Returns the lowest unique value that is greater than the first entry on the table.
+		Special thanks to shamittomar for how to do custom auto-incrementing on https://stackoverflow.com/questions/5016907/mysql-find-smallest-unique-id-available/5016969#5016969
+
+		relation (str) - Which relation (table) to look in
+			- If None: Will use the relation belonging to this class
+
+		attribute (str) - Which attribute (column) to look in
+			- If None: Will use the primary column
+
+		minimum (int) - What value any answer must be greater than or equal to
+			- If None: Will not apply a minimum
+
+		default (int) - What value to start at if the relation is empty
+
+		Example Input: uniqueMinimum()
+		Example Input: uniqueMinimum(relation = "Dictionary")
+		Example Input: uniqueMinimum(relation = "Dictionary", attribute = "pageNumber")
+		"""
+
+		def yieldLocation():
+			nonlocal attribute, minimum
+
+			yield f"(t2.{attribute} is NULL)"
+			yield f"(t1.{attribute} > {minimum or 0})"
+
+			for key, foreignHandle in cls.usedCatalogue.items():
+				yield f"(t1.{attribute} + 1 NOT IN (SELECT {foreignHandle.getPrimaryKey()} FROM {foreignHandle.__tablename__}))"
+
+		#################################################
+
+		relation = relation or cls.__tablename__
+		attribute = attribute or cls.getPrimaryKey()
+
+		if (session is not None):
+			#Changes must be applied to account for recently added items
+			session.commit()
+
+		command = f"SELECT MIN(t1.{attribute} + 1) FROM {relation} as t1 "
+		command += f"LEFT JOIN {relation} as t2 ON t1.{attribute} + 1 = t2.{attribute} "
+		command += f"WHERE ({' AND '.join(yieldLocation())})"
+
+		answer = (cls.metadata.bind.execute(command).first() or (None,))[0]
+
+		if (answer is None):
+			#There is no available minimum, so get the next maximum
+			command = f"SELECT MAX(t1.answer) FROM (SELECT MAX({attribute} + 1) as answer FROM {relation} "
+			for key, foreignHandle in cls.usedCatalogue.items():
+				command += f"UNION SELECT MAX({foreignHandle.getPrimaryKey()} + 1) as answer FROM {foreignHandle.__tablename__} "
+			command += ") as t1"
+	
+			answer = int((cls.metadata.bind.execute(command).first() or (None,))[0] or default)
+		
+		if ((minimum is not None) and (answer < minimum)):
+			answer = minimum
+
+		if (forceAttribute):
+			return {attribute: answer}
+		return answer
+
+	@classmethod
+	def getIdAllocator(cls, attribute = None):
+		"""Returns the IdAllocator that hands out unique values for 'attribute'.
+
+		attribute (str) - Which attribute (column) to hand out values for
+			- If None: Will use the primary column
+
+		Example Input: getIdAllocator()
+		"""
+
+		attribute = attribute or cls.getPrimaryKey()
+		catalogue = cls.metadata.info.setdefault("idAllocator", {})
+
+		key = (cls.__tablename__, attribute)
+		allocator = catalogue.get(key)
+		if ((allocator is None) or (allocator.bind is not cls.metadata.bind)):
+			usedList = ((foreignHandle.__tablename__, foreignHandle.getPrimaryKey()) for foreignHandle in getattr(cls, "usedCatalogue", {}).values())
+			allocator = catalogue[key] = IdAllocator(cls.metadata.bind, cls.__tablename__, attribute, usedList = usedList)
+		return allocator
+
+	@classmethod
+	def getLabelCache(cls, session = None):
+		"""Returns {label: primary key} for the rows in this relation that have been looked up by label.
+		Only rows that have been committed are in it, so it is safe to share between threads.
+
+		session (Session) - Which session to return the labels for that have not been committed yet
+			- If None: Will return the labels that have been committed
+			~ These are shared once 'session' is committed, and thrown away if it is rolled back
+
+		Example Input: getLabelCache()
+		Example Input: getLabelCache(session)
+		"""
+
+		if (session is not None):
+			return session.info.setdefault("labelCache", {}).setdefault(cls, {})
+
+		if ("_labelCache" not in cls.__dict__):
+			cls._labelCache = {}
+		return cls._labelCache
+
+	@classmethod
+	def clearLabelCache(cls, *args):
+		"""Forgets all labels looked up for this relation.
+		Can be used as a mapper event.
+
+		Example Input: clearLabelCache()
+		"""
+
+		cls._labelCache = {}
+
+	@classmethod
+	def checkExists(cls, catalogue = None, *, session = None, forceAttribute = False):
+		"""Returns if the value exists or not.
+		Special thanks to Laurent W for how to quickly check if a row exists on https://stackoverflow.com/questions/1676551/best-way-to-test-if-a-row-exists-in-a-mysql-table/10688065#10688065
+
+		catalogue (dict) - {attribute (str): value (any)}
+			- If not dict or None for key: Will check all attributes for the given value
+
+		Example Input: checkExists()
+		Example Input: checkExists({"word": "lorem"})
+		"""
+
+		if (session is not None):
+			#Changes must be applied to account for recently added items
+			session.commit()
+
+		answer = {}
+		assert catalogue is not None
+		for attribute, value in cls.ensure_dict(catalogue).items():
+			attribute = cls.ensure_default(attribute, default = cls.getPrimaryKey)
+			answer[attribute] = cls.metadata.bind.execute(f"SELECT EXISTS(SELECT 1 FROM {cls.__tablename__} WHERE ({attribute} = %s) LIMIT 1)", (value,)).first()[0]
+
+		if (forceAttribute or (len(answer) is not 1)):
+			return answer
+		else:
+			return next(iter(answer.values()), {})
+
+	@classmethod
+	def checkExistsMany(cls, valueList, attribute = None, *, session = None, chunkSize = 500):
+		"""Returns which of the given values exist, using one IN query for every 'chunkSize' values instead of one query per value.
+
+		valueList (list) - What values to look for
+		attribute (str) - Which attribute (column) to look in
+			- If None: Will use the primary key
+		session (Session) - What session to use; items added to it count as existing
+			- If None: Will use a new connection
+
+		Example Input: checkExistsMany([1, 2, 3])
+		Example Input: checkExistsMany(["lorem", "ipsum"], "label")
+		"""
+
+		attribute = attribute or cls.getPrimaryKey()
+		columnHandle = getattr(cls.__table__.columns, attribute)
+		valueList = tuple(set(cls.ensure_container(valueList)))
+
+		def yieldExisting(connection):
+			for batch in cls.yieldBatch(valueList, chunkSize):
+				for row in connection.execute(sqlalchemy.select([columnHandle]).where(columnHandle.in_(batch))):
+					yield row[0]
+
+		##############################################
+
+		if (session is not None):
+			#Recently added items must be sent to the database first
+			session.flush()
+			return set(yieldExisting(session))
+
+		with cls.makeConnection(asTransaction = False) as connection:
+			return set(yieldExisting(connection))
+
+	@classmethod
+	def checkUsed(cls, catalogue = None, *, session = None, autoAdd = False, forceAttribute = False, 
+		returnOnPass = False, returnOnFail = False, useForPass = True, useForFail = False, **kwargs):
+		"""Returns if the given value is used or not.
+
+		catalogue (dict) - {attribute (str): value (any)}
+			- If not dict or None for key: Will check all attributes for the given value
+			- If value is a list: Each value is checked, and the answer for that attribute is {value (any): result (any)}
+
+		autoAdd (bool) - Determines if values that are not used yet are added to their linked catalogues
+			~ All of them are added in one session
+		returnOnPass (bool) - Determines if True should be returned immidiately after a success
+		returnOnFail (bool) - Determines if False should be returned immidiately after a failure
+		
+		useForPass (any) - What should be used to signify a success
+			- If None: Will not record
+		useForFail (any) - What should be used to signify a failure
+			- If None: Will not record
+
+		forceAttribute (bool) - Determines if the attribute is returned in the answer
+			- If True: Answers will always contain the attribute
+			- If False: Answers will omit the attribute if there is only one in the answer
+
+		Example Input: checkUsed(1234)
+		Example Input: checkUsed({None: 1234})
+		Example Input: checkUsed({"label": 1234})
+		Example Input: checkUsed(kwargs, autoAdd = True)
+		Example Input: checkUsed({"label": [1234, 5678]}, autoAdd = True)
+		"""
+
+		def getResult(exists):
+			nonlocal returned
+
+			if (exists):
+				if (returnOnPass):
+					returned = useForPass
+				return useForPass
+			
+			if (returnOnFail):
+				returned = useForFail
+			return useForFail
+
+		##############################################
+
+		if (not cls.usedCatalogue):
+			if (forceAttribute):
+				return {}
+			return
+
+		answer = {}
+		missingList = []
+		returned = NULL_private
+		catalogue = cls.ensure_dict(catalogue, default = None, useAsKey = False, convertNone = False)
+		for attribute, usedColumn in cls.usedCatalogue.items():
 			if (attribute in catalogue):
 				value = catalogue[attribute]
 			elif (None in catalogue):
@@ -632,20 +1561,27 @@ class Schema_Base(Base_Database):
 				continue
 
 			index = usedColumn.getPrimaryKey()
-			if (usedColumn.checkExists({index: value}, session = session, **kwargs)):
-				if (returnOnPass):
-					return useForPass
-				elif (useForPass is not None):
-					answer[attribute] = useForPass
-			else:
-				if (returnOnFail):
-					return useForFail
-				elif (useForPass is not None):
-					answer[attribute] = useForFail
+			valueList = value if isinstance(value, (list, tuple, set)) else (value,)
+			existing = usedColumn.checkExistsMany(valueList, index, session = session)
+
+			resultCatalogue = {item: getResult(item in existing) for item in valueList}
+			if (returned is not NULL_private):
+				return returned
+
+			if (valueList is value):
+				answer[attribute] = resultCatalogue
+			elif (resultCatalogue[value] is not None):
+				answer[attribute] = resultCatalogue[value]
 
 			if (autoAdd):
-				with cls.makeSession() as session:
-					session.add(usedColumn(**{index: value}))
+				missingList.extend(usedColumn(**{index: item}) for item in resultCatalogue.keys() if (item not in existing))
+
+		if (missingList):
+			if (session is not None):
+				session.add_all(missingList)
+			else:
+				with cls.makeSession() as _session:
+					_session.add_all(missingList)
 
 		if (forceAttribute or (len(answer) is not 1)):
 			return answer
@@ -653,6 +1589,19 @@ class Schema_Base(Base_Database):
 			return next(iter(answer.values()), {})
 
 	#Context Managers
+	@classmethod
+	def getActiveConnection(cls):
+		"""Returns the connection the database this schema belongs to is sharing on this thread, or None; see: Database.transaction()."""
+
+		if (cls.metadata.bind is None):
+			return None
+
+		reference = Database.engineCatalogue.get(cls.metadata.bind)
+		database = reference and reference()
+		if (database is None):
+			return None
+		return database.getActiveConnection()
+
 	@classmethod
 	@contextlib.contextmanager
 	def makeSession(cls):
@@ -661,7 +1610,7 @@ class Schema_Base(Base_Database):
 		"""
 		global sessionMaker
 		
-		session = sessionMaker(bind = cls.metadata.bind)
+		session = sessionMaker(bind = cls.getActiveConnection() or cls.metadata.bind)
 		try:
 			yield session
 			session.commit()
@@ -675,6 +1624,11 @@ class Schema_Base(Base_Database):
 	@contextlib.contextmanager
 	def makeConnection(cls, asTransaction = True):
 
+		activeConnection = cls.getActiveConnection()
+		if (activeConnection is not None):
+			yield activeConnection
+			return
+
 		connection = cls.metadata.bind.connect()
 		if (asTransaction):
 			transaction = connection.begin()
@@ -708,6 +1662,8 @@ class Schema_Base(Base_Database):
 
 		with cls.makeSession() as session:              
 			session.query(cls).delete()
+			cls.getIdAllocator().reset(connection = session.connection())
+			cls.clearLabelCache()
 			for catalogue in cls.ensure_container(defaultRows):
 				if (not catalogue):
 					continue
@@ -764,8 +1720,12 @@ class Schema_AutoForeign(Schema_Base):
 		Special thanks to van for how to automatically add children on https://stackoverflow.com/questions/8839211/sqlalchemy-add-child-in-one-to-many-relationship
 		"""
 
+		session = kwargs.get("session", None)
 		super().__init__(kwargs = kwargs)
 
+		if (session is not None):
+			self.resolveForeign((kwargs,), session)
+
 		forcedCatalogue = {}
 		for variable, relationHandle in self.foreignKeys.items():
 			catalogue = kwargs.pop(variable, None)
@@ -774,6 +1734,11 @@ class Schema_AutoForeign(Schema_Base):
 			if (not isinstance(catalogue, dict)):
 				catalogue = {"label": catalogue}
 
+			labelCache = relationHandle.getLabelCache()
+			if ((len(catalogue) is 1) and (catalogue.get("label", NULL_private) in labelCache)):
+				kwargs[f"{variable}_id"] = labelCache[catalogue["label"]]
+				continue
+
 			with self.makeSession() as session:
 				child = session.query(relationHandle).filter(sqlalchemy.and_(getattr(relationHandle, key) == value for key, value in catalogue.items())).one_or_none()
 				if (child is None):
@@ -787,6 +1752,93 @@ class Schema_AutoForeign(Schema_Base):
 			setattr(self, variable, child)
 
 
+	@classmethod
+	def resolveForeign(cls, catalogueList, session):
+		"""Replaces foreign labels in each catalogue with the primary key of that foreign row.
+		Labels are looked up in the label cache first, then the rest are found with one query for each foreign relation.
+		Missing foreign rows are created together, so they are sent with one INSERT.
+
+		catalogueList (list) - The kwargs for each new row; these are modified in place
+		session (Session) - What session the rows are being added with
+
+		Example Input: resolveForeign([{"label": "lorem", "job": 1234}, {"label": "ipsum", "job": 1234}], session)
+		"""
+
+		for variable, relationHandle in cls.foreignKeys.items():
+			index = cls.getPrimaryKey(relationHandle)
+			labelCache = relationHandle.getLabelCache(session)
+			sharedCache = relationHandle.getLabelCache()
+
+			pendingCatalogue = collections.defaultdict(list)
+			for kwargs in catalogueList:
+				label = kwargs.get(variable, None)
+				if ((not label) or isinstance(label, dict)):
+					continue
+				pendingCatalogue[label].append(kwargs)
+
+			if (not pendingCatalogue):
+				continue
+
+			for label in pendingCatalogue.keys():
+				if ((label not in labelCache) and (label in sharedCache)):
+					labelCache[label] = sharedCache[label]
+
+			missingList = [label for label in pendingCatalogue.keys() if (label not in labelCache)]
+			for batch in cls.yieldBatch(missingList, 500):
+				for label, primaryKey in session.query(relationHandle.label, getattr(relationHandle, index)).filter(relationHandle.label.in_(batch)):
+					labelCache[label] = primaryKey
+
+			childList = [relationHandle(label = label, session = session) for label in missingList if (label not in labelCache)]
+			if (childList):
+				session.add_all(childList)
+				session.flush()
+				for child in childList:
+					labelCache[child.label] = getattr(child, index)
+
+			for label, kwargsList in pendingCatalogue.items():
+				for kwargs in kwargsList:
+					del kwargs[variable]
+					kwargs[f"{variable}_id"] = labelCache[label]
+
+	@classmethod
+	def uniqueLabel(cls, relationHandle, title, session):
+		"""Returns the first label in the form '{title}_{n}' that is not used in 'relationHandle'.
+		The used suffixes are found with one LIKE query on 'label'.
+		Labels that only differ by case are counted as used as well, since the database may compare them that way.
+
+		relationHandle (Schema_Base) - Which relation the label is for
+		title (str) - What the label starts with
+		session (Session) - What session to look in; rows that have not been flushed yet are also checked
+
+		Example Input: uniqueLabel(relationHandle, "Lorem", session)
+		"""
+
+		prefix = f"{title}_"
+
+		def yieldLabel():
+			nonlocal prefix
+
+			pattern = re.sub(r"([\\%_])", r"\\\1", prefix)
+			for (label,) in session.query(relationHandle.label).filter(relationHandle.label.like(f"{pattern}%", escape = "\\")):
+				yield label
+
+			for child in session.new:
+				if (isinstance(child, relationHandle) and isinstance(child.label, str)):
+					yield child.label
+
+		#################################################
+
+		usedSet = set()
+		for label in yieldLabel():
+			suffix = label[len(prefix):]
+			if ((label[:len(prefix)].casefold() == prefix.casefold()) and suffix.isdigit()):
+				usedSet.add(int(suffix))
+
+		n = 1
+		while (n in usedSet):
+			n += 1
+		return f"{prefix}{n}"
+
 	@classmethod
 	def formatForeign(cls, schema):
 		"""Automatically creates the neccissary things to accommodate the foreign keys.
@@ -811,7 +1863,15 @@ class Schema_AutoForeign(Schema_Base):
 				relationHandle = schema[foreignKey._table_key()]
 				cls.foreignKeys[variable] = relationHandle
 
-				setattr(cls, variable, sqlalchemy.orm.relationship(relationHandle, backref = cls.__name__.lower(), info = cls._foreignInfo.get(variable, {}))) #Many to One 
+				if (not cls.__mapper__.has_property(variable)):
+					#The schema may be loaded again by another Database
+					setattr(cls, variable, sqlalchemy.orm.relationship(relationHandle, backref = cls.__name__.lower(), info = cls._foreignInfo.get(variable, {}))) #Many to One 
+
+				#Labels may now point somewhere else
+				if ("_labelCache_listening" not in relationHandle.__dict__):
+					relationHandle._labelCache_listening = True
+					sqlalchemy.event.listen(relationHandle, "after_update", relationHandle.clearLabelCache)
+					sqlalchemy.event.listen(relationHandle, "after_delete", relationHandle.clearLabelCache)
 				#cascade="all, delete, delete-orphan" #https://docs.sqlalchemy.org/en/latest/orm/tutorial.html
 
 	# @classmethod
@@ -885,7 +1945,13 @@ class Schema_AutoForeign(Schema_Base):
 
 			relationHandle = self.foreignKeys[variable]
 			if ("label" in catalogue):
-				existing = session.query(relationHandle).filter(relationHandle.label == catalogue["label"]).one_or_none()
+				labelCache = relationHandle.getLabelCache()
+				if (catalogue["label"] in labelCache):
+					existing = session.query(relationHandle).get(labelCache[catalogue["label"]])
+				else:
+					existing = session.query(relationHandle).filter(relationHandle.label == catalogue["label"]).one_or_none()
+					if (existing is not None):
+						labelCache[catalogue["label"]] = getattr(existing, self.getPrimaryKey(relationHandle))
 				if (existing is None):
 					current = getattr(self, variable, None)
 					if ((current is not None) and (len(getattr(current, self.__class__.__name__.lower())) is 1)):
@@ -922,12 +1988,8 @@ class Schema_AutoForeign(Schema_Base):
 					continue
 
 			#Create new unique
-			n = 1
 			title = catalogue.get('label', variable.title())
-			while f"{title}_{n}" in {row.label for row in session.query(relationHandle).all()}:
-				n += 1
-
-			child = self.foreignKeys[variable](**{**catalogue, "label": f"{title}_{n}"}, session = session)
+			child = self.foreignKeys[variable](**{**catalogue, "label": self.uniqueLabel(relationHandle, title, session)}, session = session)
 			session.add(child)
 			setattr(self, variable, child)
 			forcedCatalogue[variable] = child
@@ -1038,7 +2100,7 @@ class Alembic(Base):
 		self.version_directory  = os.path.abspath(os.path.join(self.alembic_directory, "versions"))
 		self.ini_path           = os.path.abspath(os.path.join(self.source_directory, ini_filename or "alembic.ini"))
 
-		self.config = alembic_config_Config(self.ini_path)
+		self.config = alembic.config.Config(self.ini_path)
 		self.config.set_main_option("script_location", self.alembic_directory)
 		self.config.set_main_option("sqlalchemy.url", self.parent.fileName)
 
@@ -1155,6 +2217,7 @@ class Alembic(Base):
 		Example Input: upgrade("head-1")
 		"""
 		alembic.command.upgrade(self.config, target, sql = sql, tag = None)
+		self.parent.bumpSchemaEpoch()
 
 	def downgrade(self, target = "-1", sql = False):
 		"""
@@ -1176,6 +2239,7 @@ class Alembic(Base):
 		Example Input: downgrade("-2")
 		"""
 		alembic.command.downgrade(self.config, target, sql = sql, tag = None)
+		self.parent.bumpSchemaEpoch()
 
 	def check(self, returnDifference = False):
 		"""Makes sure the current database matches the current schema.
@@ -1197,7 +2261,7 @@ class Alembic(Base):
 	def _applyMonkeyPatches(self):
 		def mp_get_template_directory(mp_self):
 			return self.template_directory
-		alembic_config_Config.get_template_directory = mp_get_template_directory
+		alembic.config.Config.get_template_directory = mp_get_template_directory
 
 		def mp__generate_template(mp_self, source, destination, **kwargs):
 			if (source.endswith("alembic.ini.mako")):
@@ -1296,6 +2360,9 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		},
 	}
 
+	#SQLite builds before 3.32 allow at most this many bound variables in one statement
+	variableLimit = 999
+
 	def __init__(self, fileName = None, logger_name = None, logger_config = None, defaultFileExtension = None, **kwargs):
 		"""Defines internal variables.
 		A better way to handle multi-threading is here: http://code.activestate.com/recipes/526618/
@@ -1311,8 +2378,6 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 
 		MyUtilities.logger.LoggingFunctions.__init__(self, label = logger_name or __name__, config = logger_config or self.logger_config, force_quietRoot = __name__ == "__main__")
 
-		self._applyMonkeyPatches()
-
 		self.threadLock = threading.RLock()
 		self.TableBase = sqlalchemy.ext.declarative.declarative_base()
 
@@ -1321,6 +2386,11 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		self.schema = None
 		self.alembic = None
 		self.waiting = False
+		self.retryLocal = threading.local()
+		self.activeConnection = threading.local()
+		self.pendingConnection = {} #{thread id: (connection, transaction)}
+		self.writeQueue = None
+		self.lockStats = {"waits": 0, "attempts": 0, "failures": 0, "seconds": 0, "longest": 0}
 		self.fileName = None
 		self.schemaPath = None
 		self.alembicPath = None
@@ -1331,6 +2401,37 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		self.aliasError_replacement = None
 		self.resultError_replacement = None
 
+		self.inList_chunkSize = 500
+		self._inList_counter = itertools.count()
+
+		self.inspector = None
+		self.pragmaProfile = "default"
+		self.reflectionSnapshot = True
+		self.reflectedRelations = set()
+
+		self.schemaEpoch = 0
+		self.schemaEpoch_version = None
+		self.schemaEpoch_interval = 1
+		self.tableVersions = {}
+		self.externalChange_watching = False
+		self.externalChange_interval = 1
+		self.externalChange_nextCheck = 0
+		self.schemaEpoch_nextCheck = 0
+		self.cacheToken = next(self.cacheToken_counter)
+
+		self.resultCache = None
+		self.relationVersion = collections.defaultdict(int)
+		self.cache_resultRelations = MyUtilities.caching.LFUCache(maxsize = 1000)
+
+		self.statementCache_hits = 0
+		self.statementCache_misses = 0
+		self.cache_statement = MyUtilities.caching.LFUCache(maxsize = 1000)
+		self.cache_compiled = sqlalchemy.util.LRUCache(1000) #SQLAlchemy reads and writes this without a lock, so it must be a dict or LRUCache
+
+		self.poolSize = None
+		self.poolCheckedOut = 0
+		self.poolStats = {"connects": 0, "checkouts": 0, "checkins": 0, "waitSeconds": 0, "longestWait": 0}
+
 		#Initialization functions
 		if (fileName is not None):
 			if (fileName.endswith(".ini")):
@@ -1360,18 +2461,44 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 			print(exc_type, exc_value)
 			return False
 
+	#How many times each watched relation has been changed by anyone; kept up to date by triggers, see: watchRelations()
+	tableVersionHandle = sqlalchemy.Table(f"{internalPrefix}table_versions", internalMetadata,
+		sqlalchemy.Column("relation", sqlalchemy.String(256), primary_key = True),
+		sqlalchemy.Column("version", sqlalchemy.Integer, nullable = False, default = 0),
+	)
+
+	#Every row added, changed, or removed in a captured relation, in the order it happened; kept up to date by triggers, see: captureChanges()
+	changeLogHandle = sqlalchemy.Table(f"{internalPrefix}change_log", internalMetadata,
+		sqlalchemy.Column("sequence", sqlalchemy.Integer, primary_key = True),
+		sqlalchemy.Column("relation", sqlalchemy.String(256), nullable = False),
+		sqlalchemy.Column("rowId", sqlalchemy.Integer),
+		sqlalchemy.Column("key", _JSON), #The primary key of the row as a list
+		sqlalchemy.Column("operation", sqlalchemy.String(1), nullable = False), #'i', 'u', or 'd'
+		sqlite_autoincrement = True,
+	)
+
+	#Which Database each engine belongs to, so schema sessions and patched dialect functions can find it
+	engineCatalogue = weakref.WeakKeyDictionary()
+	mysqlPatched = False
+
 	def _applyMonkeyPatches(self):
-		#Ensure the MySQL dialect is imported
-		sqlalchemy.create_engine("mysql+mysqlconnector://")
+		"""Patches the MySQL dialect; only done the first time a MySQL database is opened."""
+
+		with self.threadLock:
+			if (Database.mysqlPatched):
+				return
+			Database.mysqlPatched = True
 
 		def mp_mysql__show_create_table(mp_self, connection, table, charset = None, full_name = None):
 			"""Fixes the lowercase foreign key tables and references."""
 			sql = old_mysql__show_create_table(mp_self, connection, table, charset = charset, full_name = full_name)
 
-			if (self.schema is None):
+			reference = Database.engineCatalogue.get(connection.engine)
+			database = reference and reference()
+			if ((database is None) or (database.schema is None)):
 				return sql
 
-			relationHandle = self.schema.relationCatalogue.get(full_name.strip("`"))
+			relationHandle = database.schema.relationCatalogue.get(full_name.strip("`"))
 			if (relationHandle is None):
 				return sql
 
@@ -1382,10 +2509,9 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 
 			return sql
 
-		self.dataType_catalogue["int_unsigned"] = sqlalchemy.dialects.mysql.INTEGER(unsigned = True)
-
-		old_mysql__show_create_table = sqlalchemy.dialects.mysql.base.MySQLDialect._show_create_table
-		sqlalchemy.dialects.mysql.base.MySQLDialect._show_create_table = mp_mysql__show_create_table
+		mysqlDialect = importlib.import_module("sqlalchemy.dialects.mysql.base").MySQLDialect
+		old_mysql__show_create_table = mysqlDialect._show_create_table
+		mysqlDialect._show_create_table = mp_mysql__show_create_table
 
 	#Caches
 	cache_info = MyUtilities.caching.LFUCache(maxsize = 100000)
@@ -1394,6 +2520,30 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 	cache_primaryKey = MyUtilities.caching.LFUCache(maxsize = 100000)
 	cache_attributes = MyUtilities.caching.LFUCache(maxsize = 100000)
 	cache_creationOrder = MyUtilities.caching.LFUCache(maxsize = 100000)
+	cache_shapingPlan = MyUtilities.caching.LFUCache(maxsize = 1000)
+	cacheList_schema = (cache_info, cache_defaults, cache_relations, cache_primaryKey, cache_attributes, cache_creationOrder)
+	cacheToken_counter = itertools.count()
+
+	#SQLite pragmas for each profile; see: https://www.sqlite.org/pragma.html
+	#Anything a profile does not give uses 'pragmaProfile_default', so switching profiles undoes the last one (except for journal_mode, which is kept in the file; see: profile())
+	#The default busy_timeout matches the 5 second wait the sqlite3 module gives each connection
+	pragmaProfile_default = {"synchronous": "FULL", "cache_size": -2000, "mmap_size": 0, "temp_store": "DEFAULT", "busy_timeout": 5000, "wal_autocheckpoint": 1000}
+	pragmaProfileCatalogue = {
+		"default": {},
+		"durable": {"journal_mode": "WAL", "synchronous": "FULL", "busy_timeout": 5000},
+		"read-heavy": {"journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -64000, "mmap_size": 268435456, "temp_store": "MEMORY", "busy_timeout": 5000},
+		"bulk-load": {"journal_mode": "WAL", "synchronous": "OFF", "cache_size": -256000, "temp_store": "MEMORY", "busy_timeout": 30000, "wal_autocheckpoint": 0},
+	}
+
+	#Error messages that mean another process or thread is holding a lock the command needs
+	lockErrorList = ("database is locked", "database table is locked", "database schema is locked", "Lock wait timeout exceeded", "Deadlock found")
+
+	#Statements that change rows, and which relation they change
+	relationVersion_pattern = re.compile(r"\s*(?:INSERT(?:\s+OR\s+\w+)?(?:\s+IGNORE)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+(?:\"([^\"]+)\"|`([^`]+)`|\[([^\]]+)\]|([^\s(]+))", re.IGNORECASE)
+	relationVersion_unknownPattern = re.compile(r"\s*(WITH|INSERT|REPLACE|UPDATE|DELETE)\b", re.IGNORECASE)
+
+	#Statements that can change the schema; temporary tables do not count
+	schemaEpoch_pattern = re.compile(r"\s*(CREATE|ALTER|DROP)\s+(?!TEMPORARY\b)(?!TABLE IF EXISTS inList_)", re.IGNORECASE)
 
 	#Event Functions
 	def setFunction_cmd_startWaiting(self, function):
@@ -1406,8 +2556,19 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 
 		pubsub_pub.subscribe(function, "event_cmd_startWaiting")
 
+	def setFunction_cmd_endWaiting(self, function):
+		"""Will trigger the given function when waiting for a database to unlock ends.
+
+		function (function) - What function to run
+			~ Is given the keyword arguments 'duration' (how many seconds were spent waiting), 'attempts' (how many retries were made), and 'success' (if the command eventually ran)
+
+		Example Input: setFunction_cmd_endWaiting(myFunction)
+		"""
+
+		pubsub_pub.subscribe(function, "event_cmd_endWaiting")
+
 	#Utility Functions
-	@MyUtilities.caching.cached(cache_primaryKey)
+	@wrap_schemaCache(cache_primaryKey)
 	def getPrimaryKey(self, relation):
 		"""Returns the primary key to use for the given relation.
 
@@ -1417,12 +2578,12 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		## TO DO ##
 		#Account for composite primary keys
 
-		inspector = sqlalchemy.inspect(self.engine)
+		inspector = self.getInspector()
 		catalogue = inspector.get_pk_constraint(relation)
 		return catalogue["constrained_columns"][0]
 
 	@wrap_errorCheck()
-	@MyUtilities.caching.cached(cache_relations)
+	@wrap_schemaCache(cache_relations)
 	def getRelationNames(self, exclude = None, include = None, excludeFunction = None, includeFunction = None):
 		"""Returns the names of all relations (tables) in the database.
 
@@ -1433,11 +2594,11 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		Example Input: getRelationNames(include = ["_Job"], includeFunction = lambda relation, myList: any(relation.startswith(item) for item in myList)
 		"""
 
-		inspector = sqlalchemy.inspect(self.engine)
-		return tuple(inspector.get_table_names())
+		inspector = self.getInspector()
+		return tuple(relation for relation in inspector.get_table_names() if (not relation.startswith(internalPrefix)))
 
 	@wrap_errorCheck()
-	@MyUtilities.caching.cached(cache_attributes)
+	@wrap_schemaCache(cache_attributes)
 	def getAttributeNames(self, relation, exclude = None, foreignAsDict = False):
 		"""Returns the names of all attributes (columns) in the given relation (table).
 
@@ -1456,7 +2617,7 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		"""
 
 		exclude = self.ensure_container(exclude)
-		inspector = sqlalchemy.inspect(self.engine)
+		inspector = self.getInspector()
 
 		if (foreignAsDict is not None):
 			relationHandle = self.schema.relationCatalogue.get(relation)
@@ -1487,7 +2648,7 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		return tuple(yieldAttribute())
 
 	@wrap_errorCheck()
-	@MyUtilities.caching.cached(cache_defaults)
+	@wrap_schemaCache(cache_defaults)
 	def getAttributeDefaults(self, relation, attribute = None, *, exclude = None, foreignAsDict = False, forceAttribute = False):
 		"""Returns the defaults of the requested attribute (columns) in the given relation (table).
 
@@ -1556,7 +2717,7 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		"""
 
 	@wrap_errorCheck()
-	@MyUtilities.caching.cached(cache_info)
+	@wrap_schemaCache(cache_info)
 	def getInfo(self, relation, attribute = None, exclude = None, forceAttribute = False):
 		"""Returns the info dict for the given columns in 'relation' in the form: {attribute (str): info (dict)}
 
@@ -1600,7 +2761,7 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 			return next(iter(answer.values()), ())
 
 	@wrap_errorCheck()
-	@MyUtilities.caching.cached(cache_creationOrder)
+	@wrap_schemaCache(cache_creationOrder)
 	def getCreationOrder(self, relation, attribute = None, exclude = None, forceAttribute = False):
 		"""Returns the order that the columns were created in the schema in the form: {attribute (str): order (int)}
 
@@ -1698,6 +2859,7 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		else:
 			return next(iter(answer.values()), ())
 
+	@wrap_retry()
 	def executeCommand(self, command, valueList = None):
 		"""Executes raw SQL to the engine.
 		Yields each row returned from the command.
@@ -1734,6 +2896,35 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 			return answer
 		return next(iter(answer.values()), ())
 
+	def checkExistsMany(self, relation, attribute, valueList, *, asMask = False):
+		"""Returns which of the given values exist in a relation, using one IN query for every 'inList_chunkSize' values.
+		Use this instead of calling checkExists() in a loop.
+
+		relation (str) - Which relation (table) to look in
+		attribute (str) - Which attribute (column) to look in
+			- If None: Will use the primary key
+		valueList (list) - What values to look for
+		asMask (bool) - Determines what is returned
+			- If True: Returns a list of bools in the same order as 'valueList'
+			- If False: Returns a set of the values that exist
+
+		Example Input: checkExistsMany("Containers", "label", labelList)
+		Example Input: checkExistsMany("Containers", None, [1, 2, 3], asMask = True)
+		"""
+
+		valueList = list(self.ensure_container(valueList))
+		table = self.metadata.tables[relation]
+		columnHandle = table.columns[attribute or self.getPrimaryKey(relation)]
+
+		existing = set()
+		with self.makeConnection(asTransaction = False) as connection:
+			for batch in self.yieldBatch(set(valueList), self.inList_chunkSize):
+				existing.update(row[0] for row in connection.execute(sqlalchemy.select([columnHandle]).where(columnHandle.in_(batch))))
+
+		if (asMask):
+			return [value in existing for value in valueList]
+		return existing
+
 	def checkUsed(self, myTuple, *, forceRelation = False, **kwargs):
 		"""Returns if the given value is used or not.
 
@@ -1770,13 +2961,17 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		return next(iter(answer.values()), ())
 
 	#Configure SQL functions
-	def configureLocation(self, handle, schema, table, fromSchema = False, nextToCondition = True, nextToCondition_None = None, checkForeign = True, forceMatch = True, 
+	def configureLocation(self, handle, schema, table, fromSchema = False, connection = None, nextToCondition = True, nextToCondition_None = None, checkForeign = True, forceMatch = True, 
 		nextTo = None, notNextTo = None, like = None, notLike = None, isNull = None, isNotNull = None, extra = None, like_caseSensative = False,
 		isIn = None, isNotIn = None, isAny = None, isNotAny = None, isAll = None, isNotAll = None, 
 		isBetween = None, isNotBetween = None, between_symetric = False, exclude = None,
 		greaterThan = None, lessThan = None, greaterThanOrEqualTo = None, lessThanOrEqualTo = None):
 		"""Sets up the WHERE portion of the SQL message.
 
+		connection (any) - What connection or session the query will be executed on
+			~ Lists for 'isIn' and 'isNotIn' that are longer than 'inList_chunkSize' are loaded into a temporary table on it that is joined against
+			- If None: Lists for 'isIn' and 'isNotIn' cannot be longer than 'inList_chunkSize'
+
 		Example Input: configureLocation("Users", like = {"name": "or"})
 		Example Input: configureLocation("Users", like = {"name": ["or", "em"]})
 
@@ -1792,7 +2987,11 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 						yield answer
 				return
 			
-			if (asList):
+			if (isinstance(value, sqlalchemy.sql.elements.BindParameter)):
+				#Values for cached statements are given later
+				pass
+
+			elif (asList):
 				value = self.ensure_container(value)
 
 			elif (not isinstance(value, (str, int, float))):
@@ -1850,11 +3049,11 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 
 			if (isIn):
 				for key, value in isIn.items():
-					for answer in yieldValue(schema, key, value, "in_", mode = 2, asList = True): # yield getattr(schema, key).in_(value)
+					for answer in yieldValue(schema, key, value, inList, asList = True): # yield getattr(schema, key).in_(value)
 						yield answer
 			if (isNotIn):
 				for key, value in isNotIn.items():
-					for answer in yieldValue(schema, key, value, "in_", mode = 2, asList = True): # yield ~(getattr(schema, key).in_(value))
+					for answer in yieldValue(schema, key, value, inList, asList = True): # yield ~(getattr(schema, key).in_(value))
 						yield ~answer
 			if (isAll):
 				for key, value in isAll.items():
@@ -1901,6 +3100,8 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 					for answer in yieldValue(schema, key, value, "between", mode = 2): # yield ~(getattr(schema, key).between(left, right, symetric = between_symetric))
 						yield ~answer
 
+		def inList(_handle, value):
+			return self.configureInList(_handle, value, connection = connection)
 
 		######################################################
 
@@ -1914,6 +3115,97 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		else:
 			return locationFunction(sqlalchemy.or_(*yieldLocation()))
 
+	def configureInList(self, handle, valueList, connection = None):
+		"""Sets up an IN condition that will not break the variable limit or the query plan for large lists.
+		- Lists up to 'inList_chunkSize' long use a plain IN clause
+		- Longer lists are loaded into a temporary table on 'connection' that is joined against
+		~ The same list is only loaded once for each connection; see: _getInListTable()
+
+		handle (any) - What column the condition applies to
+		valueList (list) - What values the column can have
+		connection (any) - What connection or session the query will be executed on
+			- If None: Lists longer than 'inList_chunkSize' raise a ValueError
+
+		Example Input: configureInList(table.columns.databaseId, [1, 2, 3])
+		Example Input: configureInList(table.columns.databaseId, idList, connection = connection)
+		"""
+
+		if (isinstance(valueList, sqlalchemy.sql.elements.BindParameter)):
+			return handle.in_(valueList)
+
+		if (not isinstance(valueList, (list, tuple))):
+			valueList = tuple(valueList)
+
+		if (len(valueList) <= self.inList_chunkSize):
+			return handle.in_(valueList)
+
+		if (not (self.isSQLite or self.isMySQL)):
+			return handle.in_(valueList)
+
+		if (connection is None):
+			errorMessage = f"A connection is needed to look for {len(valueList)} values at once; only {self.inList_chunkSize} can be given without one"
+			raise ValueError(errorMessage)
+
+		inListTable = self._getInListTable(connection, handle, valueList)
+		return handle.in_(sqlalchemy.select([inListTable.columns.value]))
+
+	def _getInListTable(self, connection, handle, valueList):
+		"""Returns a temporary table on 'connection' that holds the given values, reusing one made earlier for the same values.
+		This way, a list that is used for every row of changeTuple() or removeTuple() is only loaded once.
+		The table is remembered in the 'info' of 'connection', so _dropInListTables() can remove it once the queries are done.
+
+		Example Input: _getInListTable(connection, table.columns.databaseId, idList)
+		"""
+
+		try:
+			key = (str(handle.type), tuple(valueList))
+			hash(key)
+		except TypeError:
+			key = None
+
+		catalogue = connection.info.setdefault("inList_tables", {})
+		if (key in catalogue):
+			return catalogue[key]
+
+		inListTable = self._createInListTable(connection, handle, valueList)
+		catalogue[inListTable.name if (key is None) else key] = inListTable
+		return inListTable
+
+	def _createInListTable(self, connection, handle, valueList):
+		"""Loads the given values into a temporary table on 'connection'.
+
+		Example Input: _createInListTable(connection, table.columns.databaseId, idList)
+		"""
+
+		if (isinstance(connection, sqlalchemy.orm.session.Session)):
+			executor = connection.connection()
+		else:
+			executor = connection
+
+		inListTable = sqlalchemy.Table(f"inList_{next(self._inList_counter)}", sqlalchemy.MetaData(), sqlalchemy.Column("value", handle.type), prefixes = ["TEMPORARY"])
+		inListTable.create(executor)
+
+		query = inListTable.insert()
+		for batch in self.yieldBatch(valueList, self.inList_chunkSize):
+			executor.execute(query, [{"value": value} for value in batch])
+
+		return inListTable
+
+	def _dropInListTables(self, connection):
+		"""Removes the temporary tables made by _getInListTable() for 'connection'.
+
+		Example Input: _dropInListTables(connection)
+		"""
+
+		if ("inList_tables" not in connection.info):
+			return
+
+		for name in (inListTable.name for inListTable in connection.info.pop("inList_tables").values()):
+			if (self.isMySQL):
+				connection.execute(sqlalchemy.text(f"DROP TEMPORARY TABLE IF EXISTS {name}"))
+			else:
+				connection.execute(sqlalchemy.text(f"DROP TABLE IF EXISTS {name}"))
+
 	def configureOrder(self, handle, relation, schema, table, orderBy = None, direction = None, nullFirst = None):
 		"""Sets up the ORDER BY portion of the SQL message."""
 
@@ -2050,97 +3342,597 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 
 			# for _query in self.yieldValueQuery(**kwargs, yieldQueryOnly = True):
 
-			# 	print([_query])
-			# 	print(_query)
-			# 	print()
+			# 	print([_query])
+			# 	print(_query)
+			# 	print()
+
+			# 	# __query = _query.join(query)
+			# 	# print([__query])
+			# 	# print(__query)
+			# 	# print()
+			# 	# return query.select_from(__query)
+
+			# 	with self.makeSession(close = True) as session:
+			# 		__query = session.query(_query)
+					
+			# 		print([__query])
+			# 		print(__query)
+			# 		print()
+
+			# 		subquery = __query.subquery()
+
+			# 		___query = _handle.join(subquery)
+					
+			# 		print([___query])
+			# 		print(___query)
+			# 		print()
+
+			# 		return query.select_from(___query)
+
+
+
+			# 	# raise NotImplementedError()
+
+			# 	# if (isinstance(join_attribute, str)):
+			# 	# 	foreign_attribute = None
+			# 	# else:
+			# 	# 	join_attribute, foreign_attribute = join_attribute
+
+			# 	# if (join_attribute in _query.columns):
+			# 	# 	foreignHandle = _query.columns[join_attribute]
+			# 	# else:
+			# 	# 	for column in _query.columns:
+			# 	# 		foreignMatch = re.search("zfk_(.*)_zfk_(.*)", column.name)
+			# 	# 		if (not foreignMatch):
+			# 	# 			continue
+
+			# 	# 		if (foreign_attribute is None):
+			# 	# 			_foreign_attribute = column.table.name
+			# 	# 		else:
+			# 	# 			_foreign_attribute = foreign_attribute
+
+			# 	# 		if ((foreignMatch.group(1) == join_attribute) and (foreignMatch.group(1) == _foreign_attribute)):
+			# 	# 			foreignHandle = column
+			# 	# 			break
+			# 	# 	else:
+			# 	# 		raise NotImplementedError()
+
+
+
+			# 	# # print("@5", tuple(yieldAttribute(_query)))
+
+			# 	# # print("@5", _query.where(attributeHandle == getattr(_query.columns, join_attribute)))
+
+			# 	# if (fromSchema is None):
+			# 	# 	print()
+			# 	# 	print(_query)
+			# 	# 	print()
+			# 	# 	print(_query.where(attributeHandle == foreignHandle))
+			# 	# 	print()
+			# 	# 	handle = handle.join(_query.where(attributeHandle == foreignHandle))
+			# 	# 	print(handle) #Not working yet. Gives a syntax error. I am doing something wrong with how these two are joined.
+			# 	# 	raise NotImplementedError()
+			# 	# else:
+			# 	# 	subquery = _query.subquery()
+			# 	# 	handle = handle.join(subquery, attributeHandle == getattr(subquery.columns, join_attribute))
+		
+	#Interaction Functions
+	def setDefaultCommit(self, state):
+		self.defaultCommit = state
+
+	def setMultiProcess(self, value):
+		self.multiProcess = value
+
+	def setMultiProcessDelay(self, value):
+		self.multiProcess_delay = value
+
+	def setMultiProcessMaxDelay(self, value):
+		self.multiProcess_maxDelay = value
+
+	def setInListChunkSize(self, value):
+		self.inList_chunkSize = value
+
+	def setSchemaEpochInterval(self, value):
+		self.schemaEpoch_interval = value
+
+	def setExternalChangeInterval(self, value):
+		self.externalChange_interval = value
+
+	def refresh(self):
+		"""Ensures that the metadata is up to date with what is in the database.
+
+		Example Input: refresh()
+		"""
+
+		self.inspector = None
+		if (not self._refresh_snapshot()):
+			self.metadata.reflect(only = lambda relation, metadata: not relation.startswith(internalPrefix))
+		self.clearCache_statement()
+
+	def getSchemaEpoch(self):
+		"""Returns a number that changes whenever the schema of the database may have changed.
+		For SQLite files, 'PRAGMA schema_version' is also checked (at most every 'schemaEpoch_interval' seconds) to catch changes made by other processes.
+
+		Example Input: getSchemaEpoch()
+		"""
+
+		if (getattr(self, "isSQLite", False) and self.baseFileName and (time.monotonic() >= self.schemaEpoch_nextCheck)):
+			self.schemaEpoch_nextCheck = time.monotonic() + self.schemaEpoch_interval
+
+			with self.engine.connect() as connection:
+				version = connection.execute("PRAGMA schema_version").scalar()
+
+			if (version != self.schemaEpoch_version):
+				if (self.schemaEpoch_version is not None):
+					self.bumpSchemaEpoch()
+				self.schemaEpoch_version = version
+
+		return self.schemaEpoch
+
+	def bumpSchemaEpoch(self):
+		"""Marks everything cached about the schema of this database as out of date.
+
+		Example Input: bumpSchemaEpoch()
+		"""
+
+		with self.threadLock:
+			self.schemaEpoch += 1
+			self.inspector = None
+			self.clearCache_schema()
+			self.clearCache_statement()
+
+	def clearCache_schema(self):
+		"""Removes the entries for this database from the metadata caches.
+
+		Example Input: clearCache_schema()
+		"""
+
+		for cache in self.cacheList_schema:
+			with self.threadLock:
+				for key in [key for key in cache.keys() if (key[0] == self.cacheToken)]:
+					cache.pop(key, None)
+
+	def _bumpSchemaEpoch_onExecute(self, connection, cursor, statement, parameters, context, executemany):
+		if (self.schemaEpoch_pattern.match(statement)):
+			self.bumpSchemaEpoch()
+
+	def getRelationVersion(self, relationList):
+		"""Returns the version of each relation in 'relationList'.
+		A relation's version changes every time rows are added, changed, or removed from it through this database.
+
+		Example Input: getRelationVersion(("Users", "Names"))
+		"""
+
+		with self.threadLock:
+			return (self.relationVersion[None], *((relation, self.relationVersion[relation]) for relation in relationList))
+
+	def bumpRelationVersion(self, *relationList):
+		"""Marks that rows in the given relations have changed, so cached answers that read from them are not used again.
+
+		relationList (str) - Which relations changed
+			- If None: Will mark all relations as changed
+
+		Example Input: bumpRelationVersion("Users")
+		Example Input: bumpRelationVersion()
+		"""
+
+		with self.threadLock:
+			for relation in (relationList or (None,)):
+				self.relationVersion[relation] += 1
+
+	def _bumpRelationVersion_onExecute(self, connection, cursor, statement, parameters, context, executemany):
+		match = self.relationVersion_pattern.match(statement)
+		if (match is not None):
+			relation = next(item for item in match.groups() if item)
+		elif (self.relationVersion_unknownPattern.match(statement)):
+			relation = None
+		else:
+			return
+
+		#Bumped now for this connection, and again once the change is visible to others
+		self.bumpRelationVersion(relation)
+		connection.info.setdefault("changedRelations", set()).add(relation)
+
+	def _bumpRelationVersion_onEnd(self, connection):
+		relationList = connection.info.pop("changedRelations", None)
+		if (relationList):
+			self.bumpRelationVersion(*relationList)
+
+	def watchRelations(self, relationList = None, interval = 1):
+		"""Installs triggers that count every change to the given relations in '_db_table_versions', including changes made by other processes.
+		Cached answers and labels are then only dropped for the relations another process actually changed; see: checkExternalChanges().
+		Each row written to a watched relation also updates its count, so only watch relations that are read from more than written to.
+		Only supported for SQLite.
+
+		relationList (list) - Which relations to watch
+			- If None: Will watch every relation
+		interval (float) - How many seconds to wait between looking for changes made by other processes
+			- If None: Will only look when checkExternalChanges(force = True) is called
+
+		Example Input: watchRelations()
+		Example Input: watchRelations(["Choices_Job", "Choices_Customer"], interval = 0.1)
+		"""
+
+		if (not self.isSQLite):
+			errorMessage = f"Watching relations is not supported for {self.connectionType}"
+			raise NotImplementedError(errorMessage)
+
+		relationList = self.ensure_container(relationList) or self.getRelationNames()
+		handle = self.tableVersionHandle
+
+		with self.makeConnection(asTransaction = True) as connection:
+			handle.create(connection, checkfirst = True)
+			existing = {row[0] for row in connection.execute(sqlalchemy.select([handle.c.relation]))}
+			missing = [relation for relation in relationList if (relation not in existing)]
+			if (missing):
+				connection.execute(handle.insert(), [{"relation": relation, "version": 0} for relation in missing])
+
+		for relation in relationList:
+			for event in ("insert", "update", "delete"):
+				self.createTrigger(self.getVersionTriggerName(relation, event), relation, event = event, event_when = "after", reaction = "bumpVersion")
+
+		self.externalChange_interval = interval
+		self.externalChange_watching = True
+		self.checkExternalChanges(force = True)
+
+	def unwatchRelations(self, relationList = None):
+		"""Removes the triggers installed by watchRelations().
+
+		relationList (list) - Which relations to stop watching
+			- If None: Will stop watching every relation
+
+		Example Input: unwatchRelations()
+		Example Input: unwatchRelations("Choices_Job")
+		"""
+
+		if (relationList is None):
+			triggerList = [trigger for trigger in (self.getTrigger() or ()) if trigger.startswith(f"{internalPrefix}version_")]
+			self.externalChange_watching = False
+		else:
+			triggerList = [self.getVersionTriggerName(relation, event) for relation in self.ensure_container(relationList) for event in ("insert", "update", "delete")]
+
+		for trigger in triggerList:
+			self.removeTrigger(trigger)
+
+	@classmethod
+	def getVersionTriggerName(cls, relation, event):
+		return f"{internalPrefix}version_{re.sub(r'[^0-9A-Za-z_]', '_', relation)}_{event}"
+
+	def checkExternalChanges(self, force = False):
+		"""Drops what is cached for relations that were changed by another process since the last check.
+		'PRAGMA data_version' is checked first, so '_db_table_versions' is only read if something was committed by another connection.
+		Returns which relations changed.
+		Metadata caches do not need this; see: getSchemaEpoch().
+
+		force (bool) - Determines if the interval from watchRelations() is ignored
+
+		Example Input: checkExternalChanges()
+		Example Input: checkExternalChanges(force = True)
+		"""
+
+		if (not self.externalChange_watching):
+			return ()
+
+		now = time.monotonic()
+		if (not force):
+			if ((self.externalChange_interval is None) or (now < self.externalChange_nextCheck)):
+				return ()
+		self.externalChange_nextCheck = now + (self.externalChange_interval or 0)
+
+		handle = self.tableVersionHandle
+		with self.makeConnection(asTransaction = False) as connection:
+			#Each connection counts the commits made by the others, so the last value seen is kept with the connection
+			dataVersion = connection.execute("PRAGMA data_version").scalar()
+			if ((not force) and (connection.info.get("dataVersion") == dataVersion)):
+				return ()
+			connection.info["dataVersion"] = dataVersion
+
+			versionCatalogue = dict(tuple(row) for row in connection.execute(sqlalchemy.select([handle.c.relation, handle.c.version])))
+
+		with self.threadLock:
+			changedList = [relation for relation, version in versionCatalogue.items() if (self.tableVersions.get(relation, version) != version)]
+			self.tableVersions.update(versionCatalogue)
+
+		for relation in changedList:
+			self.bumpRelationVersion(relation)
+			self.clearCache_label(relation)
+
+		if (changedList):
+			self.log_info("External changes", relationList = changedList)
+		return changedList
+
+	def captureChanges(self, relationList = None):
+		"""Installs triggers that record every row added, changed, or removed in the given relations in '_db_change_log'.
+		Use yieldChanges() to get only what changed since the last time, instead of getting every value again.
+		Only supported for SQLite.
+
+		relationList (list) - Which relations to capture
+			- If None: Will capture every relation
+
+		Example Input: captureChanges()
+		Example Input: captureChanges(["Containers", "Customer"])
+		"""
+
+		if (not self.isSQLite):
+			errorMessage = f"Capturing changes is not supported for {self.connectionType}"
+			raise NotImplementedError(errorMessage)
+
+		with self.makeConnection(asTransaction = True) as connection:
+			self.changeLogHandle.create(connection, checkfirst = True)
+
+		for relation in (self.ensure_container(relationList) or self.getRelationNames()):
+			for event in ("insert", "update", "delete"):
+				self.createTrigger(self.getCaptureTriggerName(relation, event), relation, event = event, event_when = "after", reaction = "capture")
+
+	def stopCapture(self, relationList = None):
+		"""Removes the triggers installed by captureChanges(). What was already recorded is kept.
+
+		relationList (list) - Which relations to stop capturing
+			- If None: Will stop capturing every relation
+
+		Example Input: stopCapture()
+		Example Input: stopCapture("Containers")
+		"""
+
+		if (relationList is None):
+			triggerList = [trigger for trigger in (self.getTrigger() or ()) if trigger.startswith(f"{internalPrefix}capture_")]
+		else:
+			triggerList = [self.getCaptureTriggerName(relation, event) for relation in self.ensure_container(relationList) for event in ("insert", "update", "delete")]
+
+		for trigger in triggerList:
+			self.removeTrigger(trigger)
+
+	@classmethod
+	def getCaptureTriggerName(cls, relation, event):
+		return f"{internalPrefix}capture_{re.sub(r'[^0-9A-Za-z_]', '_', relation)}_{event}"
+
+	def _yieldCaptureSql(self, relation, event):
+		"""Yields the statements a 'capture' trigger runs for 'event' on 'relation'; see: createTrigger()."""
+
+		def getTable():
+			table = self.metadata.tables.get(relation)
+			if (table is not None):
+				return table
+
+			#The relation was made after the metadata was loaded
+			self.refresh()
+			table = self.metadata.tables.get(relation)
+			if (table is None):
+				errorMessage = f"Cannot capture changes for {relation}; it is not a relation in {self.__repr__()}"
+				raise KeyError(errorMessage)
+			return table
+
+		def hasRowId():
+			with self.makeConnection(asTransaction = False) as connection:
+				sql = connection.execute("SELECT sql FROM sqlite_master WHERE (type = 'table') AND (name = ?)", (relation,)).scalar()
+			return not re.search(r"\bWITHOUT\s+ROWID\s*;?\s*$", sql or "", re.IGNORECASE)
+
+		def getKey(reference):
+			return f"json_array({', '.join(f'{reference}.{quote(attribute)}' for attribute in keyList)})"
+
+		def getValues(reference, operation):
+			return f"'{relation_escaped}', {f'{reference}.rowid' if rowId else 'NULL'}, {getKey(reference)}, '{operation}'"
+
+		##############################################
+
+		quote = self.engine.dialect.identifier_preparer.quote
+		rowId = hasRowId()
+
+		#Relations made WITHOUT ROWID always have a primary key, and ones without a primary key always have a rowid
+		keyList = [column.name for column in getTable().primary_key.columns] or ["rowid"]
+		relation_escaped = relation.replace("'", "''")
+		command = f"INSERT INTO {quote(self.changeLogHandle.name)} (relation, {quote('rowId')}, key, operation)"
+
+		if (event == "i"):
+			yield f"{command} VALUES ({getValues('new', 'i')});"
+		elif (event == "d"):
+			yield f"{command} VALUES ({getValues('old', 'd')});"
+		else:
+			#A row whose primary key changed is removed from where it was
+			yield f"{command} SELECT {getValues('old', 'd')} WHERE ({getKey('old')} IS NOT {getKey('new')});"
+			yield f"{command} VALUES ({getValues('new', 'u')});"
+
+	def yieldChanges(self, since = 0, relation = None, *, chunkSize = 1000):
+		"""Yields what changed in captured relations after the change numbered 'since', in the order it happened; see: captureChanges().
+		Each change is {"sequence": number (int), "relation": relation (str), "rowId": rowid (int), "key": primary key (list), "operation": 'i', 'u', or 'd'}.
+		'rowId' is None for relations made WITHOUT ROWID, so use 'key' to find the row.
+		Save the last 'sequence' to use as 'since' next time.
+		Only the latest state of the row is available, so look the row up by 'key' for 'i' and 'u'.
+
+		since (int) - Which change to start after
+			- If 0: Will yield every change that has been recorded
+		relation (str) - Which relations to yield changes for
+			- If None: Will yield changes for every relation
+		chunkSize (int) - How many changes to read at a time
+
+		Example Input: yieldChanges()
+		Example Input: yieldChanges(lastSequence)
+		Example Input: yieldChanges(lastSequence, ["Containers", "Customer"])
+		"""
+
+		handle = self.changeLogHandle
+		query = sqlalchemy.select([handle]).where(handle.c.sequence > sqlalchemy.bindparam("since")).order_by(handle.c.sequence).limit(chunkSize)
+		if (relation is not None):
+			query = query.where(handle.c.relation.in_(list(self.ensure_container(relation))))
+
+		#Each chunk is its own query, so a long sync does not keep the database locked
+		while True:
+			with self.makeConnection(asTransaction = False) as connection:
+				rowList = [dict(row) for row in connection.execute(query, since = since)]
+
+			for row in rowList:
+				yield row
+
+			if (len(rowList) < chunkSize):
+				return
+			since = rowList[-1]["sequence"]
+
+	def getChangeSequence(self):
+		"""Returns the number of the latest recorded change; see: yieldChanges().
+		Use this as 'since' after copying every value, so only changes made after the copy are yielded.
+
+		Example Input: getChangeSequence()
+		"""
+
+		with self.makeConnection(asTransaction = False) as connection:
+			return connection.execute(sqlalchemy.select([sqlalchemy.func.max(self.changeLogHandle.c.sequence)])).scalar() or 0
+
+	def pruneChanges(self, sequence):
+		"""Removes recorded changes up to and including the change numbered 'sequence', once everything that syncs from them has them.
+
+		Example Input: pruneChanges(lastSequence)
+		"""
 
-			# 	# __query = _query.join(query)
-			# 	# print([__query])
-			# 	# print(__query)
-			# 	# print()
-			# 	# return query.select_from(__query)
+		handle = self.changeLogHandle
+		with self.makeConnection(asTransaction = True) as connection:
+			connection.execute(handle.delete().where(handle.c.sequence <= sequence))
 
-			# 	with self.makeSession(close = True) as session:
-			# 		__query = session.query(_query)
-					
-			# 		print([__query])
-			# 		print(__query)
-			# 		print()
+	def getInspector(self):
+		"""Returns an inspector for the engine. 
+		The same one is used until refresh() is called, so what it has already looked up does not need to be queried again.
 
-			# 		subquery = __query.subquery()
+		Example Input: getInspector()
+		"""
 
-			# 		___query = _handle.join(subquery)
-					
-			# 		print([___query])
-			# 		print(___query)
-			# 		print()
+		with self.threadLock:
+			if (self.inspector is None):
+				self.inspector = sqlalchemy.inspect(self.engine)
+			return self.inspector
 
-			# 		return query.select_from(___query)
+	def getSnapshotPath(self):
+		"""Returns where the reflection snapshot for the opened database is kept.
+		Returns None if the database does not use one.
 
+		Example Input: getSnapshotPath()
+		"""
 
+		if ((not self.reflectionSnapshot) or (not getattr(self, "isSQLite", False)) or (not self.baseFileName)):
+			return None
+		return f"{self.baseFileName}.reflection"
 
-			# 	# raise NotImplementedError()
+	def _refresh_snapshot(self):
+		"""Reflects the relations that are not in the schema, using the reflection snapshot next to the database file.
+		Only relations whose definitions in 'sqlite_master' have changed since the snapshot was saved are reflected from the database.
+		If anything changed, the snapshot is saved again.
+		Returns False if the database does not use a snapshot.
 
-			# 	# if (isinstance(join_attribute, str)):
-			# 	# 	foreign_attribute = None
-			# 	# else:
-			# 	# 	join_attribute, foreign_attribute = join_attribute
+		The snapshot is JSON that describes the columns, keys and indexes of each relation, so loading it cannot run code.
 
-			# 	# if (join_attribute in _query.columns):
-			# 	# 	foreignHandle = _query.columns[join_attribute]
-			# 	# else:
-			# 	# 	for column in _query.columns:
-			# 	# 		foreignMatch = re.search("zfk_(.*)_zfk_(.*)", column.name)
-			# 	# 		if (not foreignMatch):
-			# 	# 			continue
+		Example Input: _refresh_snapshot()
+		"""
 
-			# 	# 		if (foreign_attribute is None):
-			# 	# 			_foreign_attribute = column.table.name
-			# 	# 		else:
-			# 	# 			_foreign_attribute = foreign_attribute
+		def loadSnapshot():
+			nonlocal snapshotPath
 
-			# 	# 		if ((foreignMatch.group(1) == join_attribute) and (foreignMatch.group(1) == _foreign_attribute)):
-			# 	# 			foreignHandle = column
-			# 	# 			break
-			# 	# 	else:
-			# 	# 		raise NotImplementedError()
+			if (not os.path.exists(snapshotPath)):
+				return
 
+			try:
+				with open(snapshotPath, "r", encoding = "utf-8") as fileHandle:
+					snapshot = json.load(fileHandle)
+			except Exception as error:
+				self.log_info("Ignoring reflection snapshot", snapshotPath = snapshotPath, error = error)
+				return
 
+			if ((not isinstance(snapshot, dict)) or (snapshot.get("version") != __version__) or (snapshot.get("sqlalchemy") != sqlalchemy.__version__)):
+				return
+			if ((not isinstance(snapshot.get("definitions"), dict)) or (not isinstance(snapshot.get("tables"), dict))):
+				return
+			return snapshot
+
+		def describeTable(table):
+			dialect = self.engine.dialect
+
+			def getType(columnHandle):
+				if (isinstance(columnHandle.type, sqlalchemy.types.NullType)):
+					return ""
+				return str(columnHandle.type.compile(dialect = dialect))
+
+			def getDefault(columnHandle):
+				if (columnHandle.server_default is None):
+					return None
+				return str(getattr(columnHandle.server_default.arg, "text", columnHandle.server_default.arg))
+
+			return {
+				"columns": [{"name": columnHandle.name, "type": getType(columnHandle), "nullable": columnHandle.nullable, 
+					"primary": columnHandle.primary_key, "default": getDefault(columnHandle)} for columnHandle in table.columns],
+				"foreignKeys": [{"name": constraint.name, "columns": [element.parent.name for element in constraint.elements], 
+					"references": [element.target_fullname for element in constraint.elements]} for constraint in table.foreign_key_constraints],
+				"unique": [{"name": constraint.name, "columns": [columnHandle.name for columnHandle in constraint.columns]} 
+					for constraint in table.constraints if isinstance(constraint, sqlalchemy.UniqueConstraint)],
+				"indexes": [{"name": index.name, "columns": [columnHandle.name for columnHandle in index.columns], "unique": bool(index.unique)} for index in table.indexes],
+			}
+
+		def makeTable(relation, description):
+			dialect = self.engine.dialect
+
+			def yieldItem():
+				for column in description["columns"]:
+					yield sqlalchemy.Column(column["name"], dialect._resolve_type_affinity(column["type"]), nullable = column["nullable"], primary_key = column["primary"],
+						server_default = None if (column["default"] is None) else sqlalchemy.text(column["default"]))
+				for constraint in description["foreignKeys"]:
+					yield sqlalchemy.ForeignKeyConstraint(constraint["columns"], constraint["references"], name = constraint["name"])
+				for constraint in description["unique"]:
+					yield sqlalchemy.UniqueConstraint(*constraint["columns"], name = constraint["name"])
+
+			table = sqlalchemy.Table(relation, self.metadata, *yieldItem())
+			for index in description["indexes"]:
+				sqlalchemy.Index(index["name"], *(table.columns[column] for column in index["columns"]), unique = index["unique"])
+
+		def saveSnapshot(schemaVersion):
+			nonlocal snapshotPath, definitionCatalogue
+
+			tableCatalogue = {relation: describeTable(self.metadata.tables[relation]) for relation in definitionCatalogue.keys() if (relation in self.metadata.tables)}
+			snapshot = {"version": __version__, "sqlalchemy": sqlalchemy.__version__, "schema_version": schemaVersion, 
+				"definitions": {relation: list(definition) for relation, definition in definitionCatalogue.items()}, "tables": tableCatalogue}
+
+			with open(f"{snapshotPath}.tmp", "w", encoding = "utf-8") as fileHandle:
+				json.dump(snapshot, fileHandle)
+			os.replace(f"{snapshotPath}.tmp", snapshotPath)
 
-			# 	# # print("@5", tuple(yieldAttribute(_query)))
+		#################################################
 
-			# 	# # print("@5", _query.where(attributeHandle == getattr(_query.columns, join_attribute)))
+		snapshotPath = self.getSnapshotPath()
+		if (snapshotPath is None):
+			return False
 
-			# 	# if (fromSchema is None):
-			# 	# 	print()
-			# 	# 	print(_query)
-			# 	# 	print()
-			# 	# 	print(_query.where(attributeHandle == foreignHandle))
-			# 	# 	print()
-			# 	# 	handle = handle.join(_query.where(attributeHandle == foreignHandle))
-			# 	# 	print(handle) #Not working yet. Gives a syntax error. I am doing something wrong with how these two are joined.
-			# 	# 	raise NotImplementedError()
-			# 	# else:
-			# 	# 	subquery = _query.subquery()
-			# 	# 	handle = handle.join(subquery, attributeHandle == getattr(subquery.columns, join_attribute))
-		
-	#Interaction Functions
-	def setDefaultCommit(self, state):
-		self.defaultCommit = state
+		with self.engine.connect() as connection:
+			schemaVersion = connection.execute("PRAGMA schema_version").scalar()
 
-	def setMultiProcess(self, value):
-		self.multiProcess = value
+			definitionCatalogue = collections.defaultdict(list)
+			for relation, sql in connection.execute("SELECT tbl_name, sql FROM sqlite_master WHERE (type IN ('table', 'index')) AND (sql IS NOT NULL) ORDER BY tbl_name, type, name"):
+				if (((relation in self.metadata.tables) and (relation not in self.reflectedRelations)) or relation.startswith((internalPrefix, "sqlite_"))):
+					continue
+				definitionCatalogue[relation].append(sql)
+			definitionCatalogue = {relation: tuple(sqlList) for relation, sqlList in definitionCatalogue.items()}
+
+		snapshot = loadSnapshot()
+		reflectList = []
+		for relation, definition in definitionCatalogue.items():
+			if ((snapshot is not None) and (tuple(snapshot["definitions"].get(relation, ())) == definition) and (relation in snapshot["tables"])):
+				if (relation in self.metadata.tables):
+					continue
+				try:
+					makeTable(relation, snapshot["tables"][relation])
+					continue
+				except Exception as error:
+					self.log_info("Ignoring reflection snapshot", snapshotPath = snapshotPath, relation = relation, error = error)
 
-	def setMultiProcessDelay(self, value):
-		self.multiProcess_delay = value
+			if (relation in self.metadata.tables):
+				self.metadata.remove(self.metadata.tables[relation])
+			reflectList.append(relation)
 
-	def refresh(self):
-		"""Ensures that the metadata is up to date with what is in the database.
+		if (reflectList):
+			self.metadata.reflect(only = reflectList)
+		self.reflectedRelations.update(definitionCatalogue.keys())
 
-		Example Input: refresh()
-		"""
+		if ((snapshot is None) or reflectList or (snapshot["schema_version"] != schemaVersion) or (snapshot["definitions"].keys() != definitionCatalogue.keys())):
+			try:
+				saveSnapshot(schemaVersion)
+			except (OSError, TypeError, ValueError) as error:
+				self.log_info("Could not save reflection snapshot", snapshotPath = snapshotPath, error = error)
 
-		self.metadata.reflect()
+		return True
 
 	@wrap_errorCheck()
 	def openDatabase_fromConfig(self, filePath, section = None, settingsKwargs = None, **kwargs):
@@ -2176,9 +3968,9 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 
 	@wrap_errorCheck()
 	def openDatabase(self, fileName = None, schemaPath = None, alembicPath = None, *, applyChanges = True, multiThread = False, connectionType = None, 
-		openAlembic = False, readOnly = False, multiProcess = -1, multiProcess_delay = 100, forceExtension = False, reset = None, override_resetBypass = False,
-		port = None, host = None, user = None, password = None, echo = False, refresh_metaData = True, 
-		resultError_replacement = None, aliasError_replacement = None):
+		openAlembic = False, readOnly = False, multiProcess = -1, multiProcess_delay = 100, multiProcess_maxDelay = 5000, forceExtension = False, reset = None, override_resetBypass = False,
+		port = None, host = None, user = None, password = None, echo = False, refresh_metaData = True, reflectionSnapshot = True, profile = None, 
+		poolSize = None, poolTimeout = 30, resultError_replacement = None, aliasError_replacement = None):
 
 		"""Opens a database.If it does not exist, then one is created.
 		Note: If a database is already opened, then that database will first be closed.
@@ -2196,18 +3988,39 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		applyChanges (bool) - Determines the default for when changes are saved to the database
 			If True  - Save after every change. Slower, but more reliable because data will be saved in the database even if the program crashes
 			If False - Save when the user tells the API to using saveDatabase() or the applyChanges parameter in an individual function. Faster, but data rentention is not ensured upon crashing
-		multiThread (bool)  - If True: Will allow mnultiple threads to use the same database
+		multiThread (bool)  - Not used; every database can be used by multiple threads
+			~ File SQLite connections are pooled and handed to whichever thread needs one, so they are never tied to the thread that opened them
+			~ The in-memory database only has one connection, which is always shared between threads
+			~ Kept so that older calls to openDatabase() still work
 
 		multiProcess (int) - Determines how many times to try executing a command if another process is using the database
 			- If 0 or None: Do not retry
 			- If -1: Retry forever
 		multiProcess_delay (int) - How many milli-seconds to wait before trying to to execute a command again
+			~ The wait doubles after each attempt, and is randomized a little so that processes do not keep colliding
+		multiProcess_maxDelay (int) - The longest a single wait is allowed to grow to, in milli-seconds
 
 		openAlembic(bool) - Determines if the alembicPath should be used
 			- If True: Will start alembic
 			- If False: Will not start alembic
 			- If None: Will start alembic if fileName is not None
 
+		profile (str) - Which set of pragmas to use for SQLite connections; see: pragmaProfileCatalogue
+			- If None: Will use 'default'
+			- If 'bulk-load': WAL, no syncing and a large cache; fastest for loading data, but not safe if the computer loses power
+			- If 'read-heavy': WAL, normal syncing, a larger cache and memory mapping
+			- If 'durable': WAL and full syncing
+
+		reflectionSnapshot (bool) - Determines if relations that are not in the schema are reflected using a snapshot file next to the database
+			- If True: Only relations that changed since the snapshot was saved are reflected from the database. Only used for SQLite files
+			- If False: All relations that are not in the schema are reflected from the database
+
+		poolSize (int) - How many connections the pool keeps open
+			- If None: Will use 5 for MySQL, and 20 for SQLite files
+			~ MySQL may open up to the same number again while busy; these are counted as 'overflow' in getPoolStats()
+			~ SQLite files open as many extra connections as are needed, so a nested connection never waits on the one that is holding it up
+		poolTimeout (int) - How many seconds to wait for a MySQL connection to become free before giving up
+
 		Example Input: openDatabase()
 		Example Input: openDatabase("emaildb")
 		Example Input: openDatabase("emaildb.sqllite")
@@ -2215,6 +4028,8 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		Example Input: openDatabase("emaildb", applyChanges = False)
 		Example Input: openDatabase("emaildb", multiThread = True)
 		Example Input: openDatabase("emaildb", multiThread = True, multiProcess = 10)
+		Example Input: openDatabase("emaildb", profile = "read-heavy")
+		Example Input: openDatabase("emaildb", connectionType = "mysql", poolSize = 10)
 		"""
 
 		assert not isinstance(reset, str)
@@ -2229,102 +4044,429 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 			self.isMySQL = self.connectionType == "mysql"
 			self.isMsSQL = self.connectionType == "mssql"
 
-			self.baseFileName = fileName
+			self.baseFileName = fileName
+
+			if (self.isMySQL):
+				self.poolSize = poolSize or 5
+				engineKwargs = {"connect_args": {"time_zone": "+00:00"}, "pool_recycle": 3600, "poolclass": sqlalchemy.pool.QueuePool, 
+					"pool_size": self.poolSize, "max_overflow": self.poolSize, "pool_timeout": poolTimeout, "pool_pre_ping": True}
+				self.fileName = f"mysql+mysqlconnector://{user}:{password}@{host or 'localhost'}:{port or 3306}/{fileName}"
+
+			elif (self.isSQLite):
+				if (fileName):
+					#Every checkout gets its own connection, so a nested session or connection cannot commit or roll back the transaction it is nested in
+					#Idle connections are kept open, so the connection and pragma cost is only paid once per connection
+					#A local file cannot drop the connection like a server can, so there is no need to ping it before each checkout
+					self.poolSize = poolSize or 20
+					engineKwargs = {"poolclass": sqlalchemy.pool.QueuePool, "pool_size": self.poolSize, "max_overflow": -1, 
+						"connect_args": {"check_same_thread": False}}
+				else:
+					#Every connection must see the same in-memory database
+					self.poolSize = 1
+					engineKwargs = {"poolclass": sqlalchemy.pool.StaticPool, "connect_args": {"check_same_thread": False}}
+				self.fileName = f"sqlite:///{fileName}"
+			
+			elif (self.isAccess):
+				engineKwargs = {"encoding": "latin1", "convert_unicode": True}
+				self.fileName = f"access+fixed:///{fileName}?charset={engineKwargs['encoding']}"
+
+			elif (self.isMsSQL):
+				engineKwargs = {}
+				self.fileName = "mssql+pyodbc:///?odbc_connect={}".format(urllib.parse.quote_plus(f"DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={host or localhost};PORT={port or 3306};DATABASE={fileName};UID={user};PWD={password}"))
+
+			else:
+				errorMessage = f"Unknown connection type {connectionType}"
+				raise KeyError(errorMessage)
+
+			if (reset is False):
+				_reset = False
+			else:
+				if (self.isMySQL):
+					_reset = not sqlalchemy_utils.database_exists(self.fileName)
+				else:
+					_reset = not os.path.exists(fileName)
+
+			yield engineKwargs
+			sessionMaker.configure(bind = self.engine)
+			self.engineCatalogue[self.engine] = weakref.ref(self)
+
+			if (self.isMySQL):
+				self._applyMonkeyPatches()
+
+			if (self.isSQLite):
+				sqlalchemy.event.listen(self.engine, 'connect', self._fk_pragma_on_connect)
+				sqlalchemy.event.listen(self.engine, 'connect', self._profile_pragma_on_connect)
+				sqlalchemy.event.listen(self.engine, 'checkout', self._profile_pragma_on_checkout)
+			sqlalchemy.event.listen(self.engine, 'after_cursor_execute', self._bumpSchemaEpoch_onExecute)
+			sqlalchemy.event.listen(self.engine, 'after_cursor_execute', self._bumpRelationVersion_onExecute)
+			sqlalchemy.event.listen(self.engine, 'commit', self._bumpRelationVersion_onEnd)
+			sqlalchemy.event.listen(self.engine, 'rollback', self._bumpRelationVersion_onEnd)
+			sqlalchemy.event.listen(self.engine, 'connect', self._poolStats_on_connect)
+			sqlalchemy.event.listen(self.engine, 'checkout', self._poolStats_on_checkout)
+			sqlalchemy.event.listen(self.engine, 'checkin', self._poolStats_on_checkin)
+			self.bumpSchemaEpoch()
+
+			if (_reset):
+				self.createDatabase()
+			elif (reset):
+				self.removeDatabase()
+				self.createDatabase()
+				_reset = True
+
+			self.loadSchema(schemaPath, refresh_metaData = refresh_metaData)
+
+			if (openAlembic or ((openAlembic is None) and fileName)):
+				self.loadAlembic(alembicPath)
+			else:
+				self.alembic = None
+
+			if (_reset):
+				print(f"Creating Fresh Database for {fileName}")
+				self.createRelation()
+				self.resetRelation(override_resetBypass = override_resetBypass)
+
+				if (self.alembic):
+					self.alembic.stamp()
+
+		#########################
+
+		self.log_info("Opening Database", fileName = fileName, schemaPath = schemaPath, openAlembic = openAlembic)
+
+		if (not fileName):
+			fileName = "" #":memory:"
+			connectionType = "sqlite3"
+		else:
+			#Check for file extension
+			if (forceExtension and ("." not in fileName)):
+				fileName += f".{self.defaultFileExtension}"
+
+			if (connectionType is None):
+				if (fileName.endswith(("mdb", "accdb"))):
+					connectionType = "access"
+				else:
+					connectionType = "sqlite3"
+
+		#Configure Options
+		self.multiProcess = multiProcess
+		self.defaultCommit = applyChanges
+		self.connectionType = connectionType
+		self.multiProcess_delay = multiProcess_delay
+		self.multiProcess_maxDelay = multiProcess_maxDelay
+		self.reflectionSnapshot = reflectionSnapshot
+		self.setProfile(profile)
+		self.resultError_replacement = resultError_replacement
+
+		# if (self.resultError_replacement is None):
+		#   self.resultError_replacement = "!!! SELECT ERROR !!!"
+
+		with makeEngine() as engineKwargs:
+			self.log_info("Creating Engine", fileName = self.fileName, **engineKwargs)
+			self.engine = sqlalchemy.create_engine(self.fileName, **engineKwargs, echo = echo)
+
+	def _fk_pragma_on_connect(self, connection, record):
+		"""Turns foreign keys on for SQLite.
+		Modified code from conny on: https://stackoverflow.com/questions/2614984/sqlite-sqlalchemy-how-to-enforce-foreign-keys
+		"""
+
+		connection.execute('pragma foreign_keys=ON')
+
+	def _poolStats_on_connect(self, connection, record):
+		with self.threadLock:
+			self.poolStats["connects"] += 1
+
+	def _poolStats_on_checkout(self, connection, record, proxy):
+		with self.threadLock:
+			self.poolStats["checkouts"] += 1
+			self.poolCheckedOut += 1
+
+	def _poolStats_on_checkin(self, connection, record):
+		with self.threadLock:
+			self.poolStats["checkins"] += 1
+			self.poolCheckedOut -= 1
+
+	def getPoolStats(self, reset = False):
+		"""Returns how the connection pool is being used.
+		'connects' is how many new connections had to be made; 'checkouts' is how many times a connection was handed out.
+		'waitSeconds' and 'longestWait' is how long it took to get a connection from the pool.
+
+		reset (bool) - Determines if the counters start over afterwards
+
+		Example Input: getPoolStats()
+		Example Input: getPoolStats(reset = True)
+		"""
+
+		with self.threadLock:
+			answer = {**self.poolStats, "pool": type(self.engine.pool).__name__, "size": self.poolSize}
+			if (reset):
+				self.poolStats = {"connects": 0, "checkouts": 0, "checkins": 0, "waitSeconds": 0, "longestWait": 0}
+
+			answer["checkedOut"] = self.poolCheckedOut
+
+		pool = self.engine.pool
+		if (isinstance(pool, sqlalchemy.pool.QueuePool)):
+			answer["overflow"] = max(pool.overflow(), 0)
+		else:
+			answer["overflow"] = 0
+		return answer
+
+	def _profile_pragma_on_connect(self, connection, record):
+		"""Applies the pragmas for the current profile to a new SQLite connection."""
+
+		self._applyProfile(connection, record)
+
+	def _profile_pragma_on_checkout(self, connection, record, proxy):
+		"""Applies the pragmas for the current profile to a pooled SQLite connection if the profile has changed since it was last used."""
+
+		if (record.info.get("pragmaProfile") != self.pragmaProfile):
+			self._applyProfile(connection, record)
+
+	def _applyProfile(self, connection, record):
+		cursor = connection.cursor()
+		try:
+			for key, value in self.getProfilePragmas(self.pragmaProfile).items():
+				cursor.execute(f"PRAGMA {key} = {value}")
+		finally:
+			cursor.close()
+		record.info["pragmaProfile"] = self.pragmaProfile
+
+	@classmethod
+	def getProfilePragmas(cls, profile = None):
+		"""Returns the SQLite pragmas that 'profile' sets.
+
+		profile (str) - Which profile to use; see: pragmaProfileCatalogue
+			- If None: Will use 'default'
+
+		Example Input: getProfilePragmas("bulk-load")
+		"""
+
+		profile = profile or "default"
+		if (profile not in cls.pragmaProfileCatalogue):
+			errorMessage = f"Unknown profile {profile}; must be one of {tuple(cls.pragmaProfileCatalogue.keys())}"
+			raise KeyError(errorMessage)
+
+		return {**cls.pragmaProfile_default, **cls.pragmaProfileCatalogue[profile]}
+
+	def setProfile(self, profile = None):
+		"""Changes which pragmas are used for SQLite connections.
+		Connections that are checked out already keep their pragmas until they are returned to the pool and used again.
+
+		profile (str) - Which profile to use; see: pragmaProfileCatalogue
+			- If None: Will use 'default'
+
+		Example Input: setProfile("bulk-load")
+		"""
+
+		self.getProfilePragmas(profile)
+		self.pragmaProfile = profile or "default"
+
+	@contextlib.contextmanager
+	def profile(self, profile):
+		"""Uses a different profile for SQLite connections until the with block is done.
+		If the profile changes the journal_mode of the file, the journal_mode it had before is put back afterwards.
+
+		Example Use:
+			with database_API.profile("bulk-load"):
+				database_API.addTuple({"Lorem": rowList})
+		"""
+
+		previous = self.pragmaProfile
+		journalMode = self.getProfilePragmas(profile).get("journal_mode")
+		if ((journalMode is not None) and getattr(self, "isSQLite", False) and (getattr(self, "engine", None) is not None)):
+			journalMode = self.getJournalMode()
+		else:
+			journalMode = None
+
+		self.setProfile(profile)
+		try:
+			yield
+		finally:
+			self.setProfile(previous)
+			if ((journalMode is not None) and (self.getJournalMode() != journalMode)):
+				self.setJournalMode(journalMode)
+
+	def getJournalMode(self):
+		"""Returns the journal_mode the SQLite file is using.
+
+		Example Input: getJournalMode()
+		"""
+
+		with self.engine.connect() as connection:
+			return connection.execute("PRAGMA journal_mode").scalar().lower()
+
+	def setJournalMode(self, journalMode):
+		"""Changes the journal_mode the SQLite file is using.
+		Leaving WAL needs the only connection to the file, so the connections waiting in the pool are closed first.
+
+		journalMode (str) - Which journal mode to use; see: https://www.sqlite.org/pragma.html#pragma_journal_mode
+
+		Example Input: setJournalMode("delete")
+		"""
+
+		self.engine.dispose()
+		with self.engine.connect() as connection:
+			answer = connection.execute(f"PRAGMA journal_mode = {journalMode}").scalar().lower()
+
+		if (answer != journalMode.lower()):
+			self.log_info("Could not change journal_mode", journalMode = journalMode, current = answer)
+		return answer
+
+	def isLockError(self, error):
+		"""Returns if 'error' happened because another process or thread has the database locked.
+
+		Example Input: isLockError(error)
+		"""
+
+		if (not isinstance(error, sqlalchemy.exc.DBAPIError)):
+			return False
+
+		message = str(error.orig)
+		return any(item in message for item in self.lockErrorList)
+
+	def getRetryDelay(self, attempt):
+		"""Returns how many seconds to wait before trying a locked command again.
+		The wait doubles with each attempt until it reaches 'multiProcess_maxDelay', and is randomized so competing processes do not retry in step.
+
+		attempt (int) - How many times the command has been retried so far
+
+		Example Input: getRetryDelay(0)
+		"""
+
+		delay = min((self.multiProcess_delay or 0) * (2 ** min(attempt, 16)), self.multiProcess_maxDelay)
+		return delay * random.uniform(0.5, 1.5) / 1000
+
+	def getLockStats(self, reset = False):
+		"""Returns how much time has been spent waiting for the database to unlock.
+
+		reset (bool) - Determines if the counters start over afterwards
+
+		Example Input: getLockStats()
+		Example Input: getLockStats(reset = True)
+		"""
+
+		with self.threadLock:
+			answer = {**self.lockStats}
+			if (reset):
+				self.lockStats = {"waits": 0, "attempts": 0, "failures": 0, "seconds": 0, "longest": 0}
+		return answer
+
+	def _retryLocked(self, function, *args, **kwargs):
+		"""Runs 'function', trying again with a growing delay while the database is locked; see: multiProcess, multiProcess_delay.
+		Only the outermost call retries, since a statement cannot be repeated on its own once its transaction has failed.
+		For the same reason, nothing is retried while a connection is being shared; see: transaction().
 
-			if (self.isMySQL):
-				engineKwargs = {"connect_args": {"time_zone": "+00:00"}, "pool_recycle": 3600}
-				self.fileName = f"mysql+mysqlconnector://{user}:{password}@{host or 'localhost'}:{port or 3306}/{fileName}"
+		Example Input: _retryLocked(transaction.commit)
+		"""
 
-			elif (self.isSQLite):
-				engineKwargs = {}
-				self.fileName = f"sqlite:///{fileName}"
-			
-			elif (self.isAccess):
-				engineKwargs = {"encoding": "latin1", "convert_unicode": True}
-				self.fileName = f"access+fixed:///{fileName}?charset={engineKwargs['encoding']}"
+		def startWaiting():
+			self.waiting = True
+			pubsub_pub.sendMessage("event_cmd_startWaiting")
 
-			elif (self.isMsSQL):
-				engineKwargs = {}
-				self.fileName = "mssql+pyodbc:///?odbc_connect={}".format(urllib.parse.quote_plus(f"DRIVER={{ODBC Driver 17 for SQL Server}};SERVER={host or localhost};PORT={port or 3306};DATABASE={fileName};UID={user};PWD={password}"))
+		def endWaiting(attempts, success):
+			duration = time.perf_counter() - start
 
-			else:
-				errorMessage = f"Unknown connection type {connectionType}"
-				raise KeyError(errorMessage)
+			with self.threadLock:
+				self.lockStats["waits"] += 1
+				self.lockStats["attempts"] += attempts
+				self.lockStats["seconds"] += duration
+				self.lockStats["longest"] = max(self.lockStats["longest"], duration)
+				if (not success):
+					self.lockStats["failures"] += 1
 
-			if (reset is False):
-				_reset = False
-			else:
-				if (self.isMySQL):
-					_reset = not sqlalchemy_utils.database_exists(self.fileName)
-				else:
-					_reset = not os.path.exists(fileName)
+			self.waiting = False
+			pubsub_pub.sendMessage("event_cmd_endWaiting", duration = duration, attempts = attempts, success = success)
 
-			yield engineKwargs
-			sessionMaker.configure(bind = self.engine)
+		#########################################
 
-			if (self.isSQLite):
-				sqlalchemy.event.listen(self.engine, 'connect', self._fk_pragma_on_connect)
+		if (getattr(self.retryLocal, "active", False) or (self.getActiveConnection() is not None)):
+			return function(*args, **kwargs)
 
-			if (_reset):
-				self.createDatabase()
-			elif (reset):
-				self.removeDatabase()
-				self.createDatabase()
-				_reset = True
+		start = None
+		attempt = 0
+		self.retryLocal.active = True
+		try:
+			while True:
+				try:
+					answer = function(*args, **kwargs)
+				except sqlalchemy.exc.DBAPIError as error:
+					if (not self.isLockError(error)):
+						raise
+
+					if ((not self.multiProcess) or ((self.multiProcess != -1) and (attempt >= self.multiProcess))):
+						if (start is not None):
+							endWaiting(attempt, False)
+						raise
+
+					if (start is None):
+						start = time.perf_counter()
+						startWaiting()
+
+					time.sleep(self.getRetryDelay(attempt))
+					attempt += 1
+					continue
 
-			self.loadSchema(schemaPath, refresh_metaData = refresh_metaData)
+				if (start is not None):
+					endWaiting(attempt, True)
+				return answer
+		finally:
+			self.retryLocal.active = False
+
+	def startWriteQueue(self, maxBatch = 100, maxLatency = 50):
+		"""Turns on write-behind mode: addTuple(), changeTuple(), changeTuple_bulk() and removeTuple() are handed to one writer thread and return a future.
+		The writer commits them in groups, so many writes share one commit; each future is resolved once its write has been committed.
+		If one write in a group fails, the group is run again one write at a time so only that caller gets the error.
+		Writes that must be part of a transaction on the calling thread are not queued; they run right away and return their answer instead of a future:
+			~ Inside of transaction()
+			~ With 'applyChanges' as False, including when that is the default from openDatabase()
+			~ On a thread that has changes waiting for saveDatabase()
+
+		maxBatch (int) - The most writes to commit at once
+		maxLatency (int) - The longest a write waits for others to join its group, in milli-seconds
+
+		Example Input: startWriteQueue()
+		Example Input: startWriteQueue(maxBatch = 1000, maxLatency = 200)
+		"""
 
-			if (openAlembic or ((openAlembic is None) and fileName)):
-				self.loadAlembic(alembicPath)
-			else:
-				self.alembic = None
+		with self.threadLock:
+			if (self.writeQueue is not None):
+				self.writeQueue.maxBatch = maxBatch
+				self.writeQueue.maxLatency = maxLatency
+				return
 
-			if (_reset):
-				print(f"Creating Fresh Database for {fileName}")
-				self.createRelation()
-				self.resetRelation(override_resetBypass = override_resetBypass)
+			self.writeQueue = WriteQueue(self, maxBatch = maxBatch, maxLatency = maxLatency)
 
-				if (self.alembic):
-					self.alembic.stamp()
+	def stopWriteQueue(self, wait = True):
+		"""Turns off write-behind mode once everything queued so far has been committed.
 
-		#########################
+		wait (bool) - Determines if this waits for the queued writes to finish
 
-		self.log_info("Opening Database", fileName = fileName, schemaPath = schemaPath, openAlembic = openAlembic)
+		Example Input: stopWriteQueue()
+		"""
 
-		if (not fileName):
-			fileName = "" #":memory:"
-			connectionType = "sqlite3"
-		else:
-			#Check for file extension
-			if (forceExtension and ("." not in fileName)):
-				fileName += f".{self.defaultFileExtension}"
+		with self.threadLock:
+			writeQueue = self.writeQueue
+			self.writeQueue = None
 
-			if (connectionType is None):
-				if (fileName.endswith(("mdb", "accdb"))):
-					connectionType = "access"
-				else:
-					connectionType = "sqlite3"
+		if (writeQueue is not None):
+			writeQueue.stop(wait = wait)
 
-		#Configure Options
-		self.multiProcess = multiProcess
-		self.defaultCommit = applyChanges
-		self.connectionType = connectionType
-		self.multiProcess_delay = multiProcess_delay
-		self.resultError_replacement = resultError_replacement
+	def flushWriteQueue(self):
+		"""Waits until every write queued so far has been committed.
 
-		# if (self.resultError_replacement is None):
-		#   self.resultError_replacement = "!!! SELECT ERROR !!!"
+		Example Input: flushWriteQueue()
+		"""
 
-		with makeEngine() as engineKwargs:
-			self.log_info("Creating Engine", fileName = self.fileName, **engineKwargs)
-			self.engine = sqlalchemy.create_engine(self.fileName, **engineKwargs, echo = echo)
+		if (self.writeQueue is not None):
+			self.writeQueue.flush()
 
-	def _fk_pragma_on_connect(self, connection, record):
-		"""Turns foreign keys on for SQLite.
-		Modified code from conny on: https://stackoverflow.com/questions/2614984/sqlite-sqlalchemy-how-to-enforce-foreign-keys
+	def getWriteQueueStats(self):
+		"""Returns how many writes have gone through the write queue, and how many commits they needed.
+
+		Example Input: getWriteQueueStats()
 		"""
 
-		connection.execute('pragma foreign_keys=ON')
+		if (self.writeQueue is None):
+			return {"operations": 0, "commits": 0, "failures": 0}
+		return {**self.writeQueue.stats}
 
 	@wrap_errorCheck()
 	def removeDatabase(self, filePath = None):
@@ -2360,17 +4502,68 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 	@wrap_errorCheck()
 	def closeDatabase(self):
 		"""Closes the opened database.
+		Changes on any thread that were not saved yet are thrown away; see: saveDatabase().
 
 		Example Input: closeDatabase()
 		"""
 
+		with self.threadLock:
+			keyList = tuple(self.pendingConnection.keys())
+
+		for key in keyList:
+			connection, transaction = self._popPendingConnection(key)
+			if (connection is None):
+				continue
+
+			try:
+				transaction.rollback()
+			finally:
+				connection.close()
+
 	@wrap_errorCheck()
 	def saveDatabase(self):
 		"""Saves the opened database.
+		Commits the changes made on this thread with 'applyChanges' as False.
 
 		Example Input: saveDatabase()
 		"""
 
+		connection, transaction = self._popPendingConnection()
+		if (connection is None):
+			return
+
+		try:
+			self._dropInListTables(connection)
+			self._retryLocked(transaction.commit)
+		except:
+			transaction.rollback()
+			raise
+		finally:
+			connection.close()
+
+	@contextlib.contextmanager
+	def transaction(self):
+		"""Makes every command on this thread use one connection and transaction until the with block is done.
+		The changes are committed together when the with block is done, or thrown away if an error occurs.
+		If changes are already waiting for saveDatabase(), they are joined instead and saved with those.
+		Nesting transaction() only commits when the outermost one is done.
+
+		Example Use:
+			with database_API.transaction():
+				for item in itemList:
+					database_API.addTuple({"Lorem": item})
+				database_API.changeTuple({"Ipsum": {"count": len(itemList)}}, {"label": "Dolor"})
+		"""
+
+		activeConnection = self.getActiveConnection()
+		if (activeConnection is not None):
+			yield activeConnection
+			return
+
+		with self.makeConnection() as connection:
+			with self.shareConnection(connection):
+				yield connection
+
 	def autoSave(self, applyChanges):
 		"""
 		applyChanges (bool) - Determines if the database will be saved after the change is made.
@@ -2491,6 +4684,7 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		Example Input: removeRelation("Users")
 		"""
 
+		self.clearCache_label(relation)
 		if (relation is None):
 			self.metadata.drop_all()
 		else:
@@ -2620,23 +4814,51 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		"""
 
 	@wrap_errorCheck()
-	def addAttribute(self, relation, attribute, dataType = str, default = None, notNull = None, 
+	@wrap_applyChanges()
+	def addAttribute(self, relation, attribute, dataType = str, default = None, notNull = None,
 		primary = None, autoIncrement = None, unsigned = None, unique = None, foreign = None, applyChanges = None):
 		"""Adds an attribute (column) to a relation (table).
+		Keys cannot be added this way yet; 'primary', 'autoIncrement', 'unsigned', 'unique' and 'foreign' must be left as None.
+		The schema is not changed, so a relation from the schema only uses the new attribute in raw SQL until the schema is updated to match.
 
 		relation (str)      - What the relation is called in the .db
 		attribute (str)     - What the attribute will be called
-		dataType (type)     - What type the attribute will be
+		dataType (type)     - What type the attribute will be; see: Schema_Base.dataType_catalogue
+		default (any)       - What value existing and new tuples get if none is given
+			~ Must be given if 'notNull' is True
+		notNull (bool)      - If this attribute cannot be NULL
 		applyChanges (bool) - Determines if the database will be saved after the change is made
 			- If None: The default flag set upon opening the database will be used
 
 		Example Input: addAttribute("Users", "date created", dataType = int)
+		Example Input: addAttribute("Users", "active", dataType = bool, default = True, notNull = True)
 		Example Input: addAttribute("_Job_1, "customer", dataType = str, foreign = {"Choices_Customer": "label"})
 		"""
 
+		if (any(item is not None for item in (primary, autoIncrement, unsigned, unique, foreign))):
+			raise NotImplementedError()
+
+		table = self.metadata.tables.get(relation)
+		if (table is None):
+			errorMessage = f"There is no table {relation} in {self.metadata.__repr__()} for addAttribute()"
+			raise KeyError(errorMessage)
+
+		column = sqlalchemy.Column(attribute, self.dataType_catalogue.get(dataType, dataType), nullable = not notNull,
+			server_default = None if (default is None) else str(default))
+		quote = self.engine.dialect.identifier_preparer.quote
+		with self.makeConnection(asTransaction = True) as connection:
+			connection.execute(f"ALTER TABLE {quote(relation)} ADD COLUMN {sqlalchemy.schema.CreateColumn(column).compile(dialect = self.engine.dialect)}")
+
+		#Relations from the schema are shared by every database that uses it, so only reflected ones are changed
+		if (relation not in self.schema.relationCatalogue):
+			table.append_column(column)
+
 	@wrap_errorCheck()
+	@wrap_applyChanges()
+	@wrap_writeBehind()
+	@wrap_retry()
 	def addTuple(self, myTuple = None, applyChanges = None, autoPrimary = False, notNull = False, foreignNone = False, fromSchema = False,
-		primary = False, autoIncrement = False, unsigned = True, unique = False, checkForeign = True, incrementForeign = True):
+		primary = False, autoIncrement = False, unsigned = True, unique = False, checkForeign = True, incrementForeign = True, bulk = False, bulkSize = 1000):
 		"""Adds a tuple (row) to the given relation (table).
 		Special thanks to DSM for how to check if a key exists in a list of dictionaries on http://stackoverflow.com/questions/14790980/how-can-i-check-if-key-exists-in-list-of-dicts-in-python
 		Special thanks to Jimbo for help with spaces in database names on http://stackoverflow.com/questions/10920671/how-do-you-deal-with-blank-spaces-in-column-names-in-sql-server
@@ -2655,17 +4877,31 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 			- If True:  Will replace the value of the attribute 
 			- If False: Will not account for the value being a unique attribute
 			- If None:  Will only insert if that value for the attribute does not yet exist
+			~ If not False, foreign keys are not handled and the counts from upsertTuple() are returned
 		checkForeign (bool) - Determines if foreign keys will be take in account
 		foreignNone (bool)   - Determines what to do if an attribute with a foreign key will be None. Can be a dict of {attribute (str): state (bool)}
 			- If True: Will place the None in the foreign key relation
 			- If False: Will place the None in the domestic relation
 
+		bulk (bool) - Determines how the rows are sent to the database
+			- If True: Rows are grouped by relation and attributes, and each group is sent with executemany using one compiled INSERT
+				~ Foreign keys are not handled, and {relation: {"rows": count, "seconds": duration, "rowsPerSecond": rate}} is returned
+			- If False: Rows are sent one at a time
+		bulkSize (int) - How many rows to send in each executemany batch when 'bulk' is True
+
 		Example Input: addTuple({"Lorem": None}, autoPrimary = True)
 		Example Input: addTuple({"Lorem": {"Ipsum": "Dolor", "Sit": 5}})
 		Example Input: addTuple({"Lorem": {"Ipsum": "Dolor", "Sit": 5}}, unique = None)
 		Example Input: addTuple({"Lorem": [{"Ipsum": "Dolor", "Sit": 5}, {"Ipsum": "Amet", "Sit": 6}]})
+		Example Input: addTuple({"Customer": customerList}, bulk = True, bulkSize = 5000)
 		"""
 
+		if (unique is not False):
+			return self._upsertTuple(myTuple, replace = unique, bulkSize = bulkSize)
+
+		if (bulk):
+			return self._addTuple_bulk(myTuple, bulkSize = bulkSize)
+
 		if (fromSchema is None):
 			with self.makeConnection(asTransaction = True) as connection:
 				for relation, rows in myTuple.items():
@@ -2674,13 +4910,180 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 					for attributeDict in self.ensure_container(rows):
 						connection.execute(table.insert(values = attributeDict))
 		else:
+			#Labels other processes added or removed cannot be trusted
+			self.checkExternalChanges()
+
 			with self.makeSession() as session:
 				for relation, rows in myTuple.items():
 					schema = self.schema.relationCatalogue[relation]
-					for attributeDict in self.ensure_container(rows):
+					rowList = [dict(attributeDict) for attributeDict in self.ensure_container(rows)]
+					if (checkForeign and issubclass(schema, Schema_AutoForeign)):
+						schema.resolveForeign(rowList, session)
+
+					for attributeDict in rowList:
 						session.add(schema(**attributeDict, session = session))
 
+	def _addTuple_bulk(self, myTuple, bulkSize = 1000):
+		"""Inserts rows with executemany, compiling one INSERT for each group of rows that share a relation and set of attributes.
+		Returns the throughput for each relation in the form: {relation (str): {"rows": count (int), "seconds": duration (float), "rowsPerSecond": rate (float)}}
+
+		Example Input: _addTuple_bulk({"Customer": customerList})
+		Example Input: _addTuple_bulk({"Customer": customerList}, bulkSize = 5000)
+		"""
+
+		answer = {}
+		compiledCache = {}
+		with self.makeConnection(asTransaction = True) as connection:
+			connection = connection.execution_options(compiled_cache = compiledCache)
+			for relation, rows in myTuple.items():
+				timeStart = time.perf_counter()
+				table = self.metadata.tables[relation]
+
+				groupCatalogue = collections.defaultdict(list)
+				for attributeDict in self.ensure_container(rows):
+					groupCatalogue[frozenset(attributeDict.keys())].append(attributeDict)
+
+				count = 0
+				for group in groupCatalogue.values():
+					query = table.insert()
+					for batch in self.yieldBatch(group, bulkSize):
+						connection.execute(query, batch)
+						count += len(batch)
+
+				duration = time.perf_counter() - timeStart
+				answer[relation] = {"rows": count, "seconds": duration, "rowsPerSecond": (count / duration) if duration else None}
+				self.log_info("Bulk insert", relation = relation, **answer[relation])
+
+		return answer
+
+	@wrap_errorCheck()
+	@wrap_applyChanges()
+	@wrap_writeBehind()
+	@wrap_retry()
+	def upsertTuple(self, myTuple, replace = True, *, conflict = None, update = None, bulkSize = 1000, applyChanges = None):
+		"""Adds tuples (rows), or changes the ones that already exist, in one statement per batch instead of checking each row first.
+		Uses INSERT ... ON CONFLICT for SQLite (version 3.24 or newer), and INSERT ... ON DUPLICATE KEY UPDATE for MySQL.
+		Foreign keys are not handled.
+		Returns how many rows were inserted, updated, and skipped in the form: {relation (str): {"inserted": count (int), "updated": count (int), "skipped": count (int)}}
+
+		myTuple (dict) - What will be written. {relation: {attribute: value}} or {relation: [{attribute: value}]}
+		replace (bool) - Determines what happens to rows that already exist
+			- If True: The existing row is changed to match
+			- If False or None: The existing row is left alone
+		conflict (list) - Which attributes decide if a row already exists. Must be the primary key or have a unique constraint
+			- If None: Will use the primary key
+		update (list) - Which attributes to change if a row already exists
+			- If None: Will change every given attribute that is not in 'conflict'
+		bulkSize (int) - How many rows to send in each executemany batch
+		applyChanges (bool) - Determines if the database will be saved after the change is made
+			- If None: The default flag set upon opening the database will be used
+
+		Example Input: upsertTuple({"Customer": customerList})
+		Example Input: upsertTuple({"Customer": customerList}, replace = False)
+		Example Input: upsertTuple({"Customer": customerList}, conflict = "email", update = ("name", "phone"))
+		"""
+
+		return self._upsertTuple(myTuple, replace = replace, conflict = conflict, update = update, bulkSize = bulkSize)
+
+	def _upsertTuple(self, myTuple, replace = True, conflict = None, update = None, bulkSize = 1000):
+		def getUpdateList(attributeList, conflictList):
+			"""Returns which attributes are changed if a row already exists."""
+
+			return [attribute for attribute in (self.ensure_container(update) if (update is not None) else attributeList) 
+				if ((attribute in attributeList) and (attribute not in conflictList))]
+
+		def getQuery(table, attributeList, conflictList, updateList):
+			if (self.isMySQL):
+				query = importlib.import_module("sqlalchemy.dialects.mysql").insert(table)
+				if (replace and updateList):
+					return query.on_duplicate_key_update({attribute: query.inserted[attribute] for attribute in updateList})
+				return query.on_duplicate_key_update({conflictList[0]: table.columns[conflictList[0]]})
+
+			if (not self.isSQLite):
+				errorMessage = f"Upserting is not supported for {self.connectionType}"
+				raise NotImplementedError(errorMessage)
+
+			#SQLAlchemy cannot compile ON CONFLICT for SQLite yet, so the statement is written out; the bind parameters keep their column types
+			quote = self.engine.dialect.identifier_preparer.quote
+			bindList = [sqlalchemy.bindparam(f"p{i}", type_ = table.columns[attribute].type) for i, attribute in enumerate(attributeList)]
+
+			command = f"INSERT INTO {quote(table.name)} ({', '.join(quote(attribute) for attribute in attributeList)}) VALUES ({', '.join(f':{bindHandle.key}' for bindHandle in bindList)})"
+			command += f" ON CONFLICT ({', '.join(quote(attribute) for attribute in conflictList)})"
+			if (replace and updateList):
+				command += f" DO UPDATE SET {', '.join(f'{quote(attribute)} = excluded.{quote(attribute)}' for attribute in updateList)}"
+			else:
+				command += " DO NOTHING"
+
+			return sqlalchemy.text(command).bindparams(*bindList)
+
+		def getExisting(connection, table, conflictList, batch):
+			"""Returns the conflict keys in 'batch' that are already in the relation.
+			The keys are looked up in chunks, so each IN (...) stays under 'variableLimit'.
+			"""
+
+			keyList = {tuple(attributeDict[attribute] for attribute in conflictList) for attributeDict in batch}
+			columnList = [table.columns[attribute] for attribute in conflictList]
+
+			existing = set()
+			for chunk in self.yieldBatch(keyList, max(1, self.variableLimit // len(conflictList))):
+				if (len(conflictList) == 1):
+					where = columnList[0].in_([key[0] for key in chunk])
+				else:
+					where = sqlalchemy.tuple_(*columnList).in_(chunk)
+
+				existing.update(tuple(row) for row in connection.execute(sqlalchemy.select(columnList).where(where)))
+			return existing
+
+		##############################################
+
+		answer = {}
+		with self.makeConnection(asTransaction = True) as connection:
+			for relation, rows in myTuple.items():
+				table = self.metadata.tables[relation]
+				conflictList = list(self.ensure_container(conflict)) if (conflict is not None) else [column.name for column in table.primary_key.columns]
+				if (not conflictList):
+					errorMessage = f"{relation} has no primary key, so 'conflict' must be given"
+					raise ValueError(errorMessage)
+
+				groupCatalogue = collections.defaultdict(list)
+				for attributeDict in self.ensure_container(rows):
+					groupCatalogue[tuple(attributeDict.keys())].append(attributeDict)
+
+				seen = set()
+				counts = {"inserted": 0, "updated": 0, "skipped": 0}
+				for attributeList, group in groupCatalogue.items():
+					updateList = getUpdateList(attributeList, conflictList)
+					query = getQuery(table, attributeList, conflictList, updateList)
+					canConflict = all(attribute in attributeList for attribute in conflictList)
+
+					for batch in self.yieldBatch(group, bulkSize):
+						if (canConflict):
+							existing = getExisting(connection, table, conflictList, batch)
+						
+						for attributeDict in batch:
+							key = tuple(attributeDict[attribute] for attribute in conflictList) if canConflict else None
+							if ((key is None) or ((key not in existing) and (key not in seen))):
+								counts["inserted"] += 1
+							elif (replace and updateList):
+								counts["updated"] += 1
+							else:
+								counts["skipped"] += 1
+							seen.add(key)
+
+						if (self.isMySQL):
+							connection.execute(query, batch)
+						else:
+							connection.execute(query, [{f"p{i}": attributeDict[attribute] for i, attribute in enumerate(attributeList)} for attributeDict in batch])
+
+				answer[relation] = counts
+				self.log_info("Upsert", relation = relation, **counts)
+
+		return answer
+
 	@wrap_errorCheck()
+	@wrap_applyChanges()
+	@wrap_writeBehind()
+	@wrap_retry()
 	def changeTuple(self, myTuple, nextTo, value = None, forceMatch = None, applyChanges = None, checkForeign = True, updateForeign = None, fromSchema = False, **locationKwargs):
 		"""Changes a tuple (row) for a given relation (table).
 		Note: If multiple entries match the criteria, then all of those tuples will be chanegd.
@@ -2717,11 +5120,12 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		if (fromSchema is None):
 			with self.makeConnection(asTransaction = True) as connection:
 				for relation, rows in myTuple.items():
+					self.clearCache_label(relation)
 					table = self.metadata.tables[relation]
 					for attributeDict in self.ensure_container(rows):
 						#Does not handle foreign keys
 						query = table.update(values = attributeDict)
-						query = self.configureLocation(query, table.columns, table, fromSchema = fromSchema, nextTo = nextTo, **locationKwargs)
+						query = self.configureLocation(query, table.columns, table, fromSchema = fromSchema, connection = connection, nextTo = nextTo, **locationKwargs)
 						connection.execute(query)
 		else:
 			forcedList = []
@@ -2730,7 +5134,7 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 					schema = self.schema.relationCatalogue[relation]
 					for attributeDict in self.ensure_container(rows):
 						query = session.query(schema)
-						query = self.configureLocation(query, schema, None, fromSchema = fromSchema, nextTo = nextTo, **locationKwargs)
+						query = self.configureLocation(query, schema, None, fromSchema = fromSchema, connection = session, nextTo = nextTo, **locationKwargs)
 
 						if ((forceMatch is not False) and (query.count() is 0)):
 							if (forceMatch is None):
@@ -2755,6 +5159,82 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 					session.add_all(schema(**catalogue, session = session) for catalogue in forcedList)
 
 	@wrap_errorCheck()
+	@wrap_applyChanges()
+	@wrap_writeBehind()
+	@wrap_retry()
+	def changeTuple_bulk(self, myTuple, *, primaryKey = None, bulkSize = 1000, applyChanges = None):
+		"""Changes many tuples (rows) at once, finding each one by its primary key.
+		Rows that change the same attributes are sent together with executemany, using one UPDATE that is bound with bindparam.
+		If every row in a group gets the same values, a single UPDATE ... WHERE primaryKey IN (...) is used instead.
+		Note: Foreign keys are not handled.
+
+		myTuple (dict)   - What will be changed. {relation: [{primary key: value, attribute to change: new value}]}
+		primaryKey (str) - Which attribute is used to find each row. Can be a dict of {relation: attribute}
+			- If None: Will use the primary key of the relation
+		bulkSize (int)   - How many rows to send in each executemany batch
+			~ When every row gets the same values, each UPDATE ... IN (...) holds fewer keys so that it stays under 'variableLimit'
+		applyChanges (bool)  - Determines if the database will be saved after the change is made
+			- If None: The default flag set upon opening the database will be used
+			- If False: The changes wait for saveDatabase()
+
+		Returns how many rows were sent to be changed for each relation, and how long that took: {relation (str): {"rows": count (int), "seconds": duration (float), "rowsPerSecond": rate (float)}}
+		~ 'rows' counts the rows given, not the rows the database matched
+
+		Example Input: changeTuple_bulk({"Containers": [{"databaseId": 1, "location": "A2"}, {"databaseId": 2, "location": "B4"}]})
+		Example Input: changeTuple_bulk({"Containers": [{"databaseId": 1, "archived": True}, {"databaseId": 2, "archived": True}]})
+		Example Input: changeTuple_bulk({"Containers": [{"label": "lorem", "archived": True}]}, primaryKey = "label")
+		"""
+
+		answer = {}
+		compiledCache = {}
+		with self.makeConnection(asTransaction = True) as connection:
+			connection = connection.execution_options(compiled_cache = compiledCache)
+			for relation, rows in myTuple.items():
+				timeStart = time.perf_counter()
+				table = self.metadata.tables[relation]
+				self.clearCache_label(relation)
+
+				if (isinstance(primaryKey, dict)):
+					index = primaryKey.get(relation) or self.getPrimaryKey(relation)
+				else:
+					index = primaryKey or self.getPrimaryKey(relation)
+				indexHandle = table.columns[index]
+
+				groupCatalogue = collections.defaultdict(list)
+				for attributeDict in self.ensure_container(rows):
+					groupCatalogue[frozenset(attributeDict.keys())].append(attributeDict)
+
+				count = 0
+				for attributeSet, group in groupCatalogue.items():
+					attributeList = tuple(attribute for attribute in attributeSet if (attribute != index))
+					if (not attributeList):
+						continue
+
+					first = group[0]
+					if (all(row[attribute] == first[attribute] for row in group for attribute in attributeList)):
+						#Every row gets the same values, so push it down to one UPDATE ... WHERE
+						values = {attribute: first[attribute] for attribute in attributeList}
+						for batch in self.yieldBatch((row[index] for row in group), max(1, min(bulkSize, self.variableLimit - len(values)))):
+							connection.execute(table.update().where(indexHandle.in_(batch)).values(values))
+					else:
+						#Bind names must not match the column names
+						query = table.update().where(indexHandle == sqlalchemy.bindparam("b_index")).values(
+							{attribute: sqlalchemy.bindparam(f"b_{i}") for i, attribute in enumerate(attributeList)})
+
+						for batch in self.yieldBatch(group, bulkSize):
+							connection.execute(query, [{"b_index": row[index], **{f"b_{i}": row[attribute] for i, attribute in enumerate(attributeList)}} for row in batch])
+					count += len(group)
+
+				duration = time.perf_counter() - timeStart
+				answer[relation] = {"rows": count, "seconds": duration, "rowsPerSecond": (count / duration) if duration else None}
+				self.log_info("Bulk change", relation = relation, **answer[relation])
+
+		return answer
+
+	@wrap_errorCheck()
+	@wrap_applyChanges()
+	@wrap_writeBehind()
+	@wrap_retry()
 	def removeTuple(self, myTuple, applyChanges = None, checkForeign = True, incrementForeign = True, fromSchema = None, **locationKwargs):
 		"""Removes a tuple (row) for a given relation (table).
 		Note: If multiple entries match the criteria, then all of those tuples will be removed.
@@ -2786,18 +5266,20 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		if (fromSchema is None):
 			with self.makeConnection(asTransaction = True) as connection:
 				for relation, rows in myTuple.items():
+					self.clearCache_label(relation)
 					table = self.metadata.tables[relation]
 					for nextTo in self.ensure_container(rows):
 						query = table.delete()
-						query = self.configureLocation(query, table.columns, table, fromSchema = fromSchema, nextTo = nextTo, **locationKwargs)
+						query = self.configureLocation(query, table.columns, table, fromSchema = fromSchema, connection = connection, nextTo = nextTo, **locationKwargs)
 						connection.execute(query)
 		else:
 			with self.makeSession() as session:
 				for relation, rows in myTuple.items():
 					schema = self.schema.relationCatalogue[relation]
+					schema.clearLabelCache()
 					for nextTo in self.ensure_container(rows):
 						query = session.query(schema)
-						query = self.configureLocation(query, schema, None, fromSchema = fromSchema, nextTo = nextTo, **locationKwargs)
+						query = self.configureLocation(query, schema, None, fromSchema = fromSchema, connection = session, nextTo = nextTo, **locationKwargs)
 						query.delete()
 
 	def _setupYieldAllValues(self, relation = None, attribute = None, exclude = None):
@@ -2824,8 +5306,16 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		return myTuple, excludeList
 
 	@wrap_errorCheck()
-	def yieldAllValues(self, relation = None, attribute = None, exclude = None, **kwargs):
+	def yieldAllValues(self, relation = None, attribute = None, exclude = None, stream = False, **kwargs):
 		"""
+		stream (bool) - Determines what is yielded
+			- If True: Yields the rows themselves, reading them a chunk at a time; see getValue() for the other kwargs
+			- If False: Yields (relation, attributeList, query) for each relation
+
+		Example Use:
+			for relation, row in database_API.yieldAllValues(None, stream = True, forceRelation = True, chunkSize = 10000):
+				print(relation, row)
+
 		Example Use:
 			for relation, attributeList, query in database_API.yieldAllValues(None):
 				print([relation, attributeList, query])
@@ -2840,6 +5330,11 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 						print("   ", result)
 		"""
 		myTuple, excludeList = self._setupYieldAllValues(relation = relation, attribute = attribute, exclude = exclude)
+		if (stream):
+			for item in self.getValue(myTuple, exclude = excludeList, stream = True, **kwargs):
+				yield item
+			return
+
 		for item in self.yieldValueQuery(myTuple, exclude = excludeList, **kwargs):
 			yield item
 
@@ -2863,6 +5358,7 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		Example Input: getAllValues(["Users", "Names"], orderBy = {"Users": ["age", "height"]})
 		Example Input: getAllValues(["Users", "Names"], orderBy = {"Users": ["age", "height"], "Names": "extra_data"})
 		Example Input: getAllValues(["Users", "Names"], orderBy = "databaseId")
+		Example Input: getAllValues("Users", stream = True)
 
 		database_API.getAllValues("Containers", foreignAsDict = True, foreignDefault = ("label", "archived"))
 		database_API.getAllValues("Containers", foreignDefault = ("label", "archived"))
@@ -2871,6 +5367,217 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		myTuple, excludeList = self._setupYieldAllValues(relation = relation, attribute = attribute, exclude = exclude)
 		return self.getValue(myTuple, exclude = excludeList, **kwargs)
 
+	#Which location kwargs hold values that can be replaced by bind parameters in a cached statement
+	statementCache_locations = ("nextTo", "notNextTo", "greaterThan", "greaterThanOrEqualTo", "lessThan", "lessThanOrEqualTo", "isIn", "isNotIn", "like", "notLike")
+	statementCache_exclude = ("isNull", "isNotNull", "isAny", "isNotAny", "isAll", "isNotAll", "isBetween", "isNotBetween", "extra")
+
+	@classmethod
+	def _freeze(cls, item):
+		"""Returns a hashable version of 'item'.
+
+		Example Input: _freeze({"Users": ["name", "age"]})
+		"""
+
+		if (isinstance(item, dict)):
+			return (dict, tuple((key, cls._freeze(value)) for key, value in item.items()))
+		if (isinstance(item, (list, tuple))):
+			return tuple(cls._freeze(value) for value in item)
+		if (isinstance(item, (set, frozenset))):
+			return frozenset(cls._freeze(value) for value in item)
+		return item
+
+	def _getStatementKey(self, nextTo, locationKwargs, *args):
+		"""Returns a key for the shape of a query and a list of the values that fill its bind parameters.
+		If the query cannot be cached, returns (None, None).
+
+		args (tuple) - Hashable things that also determine the shape of the query
+
+		Example Input: _getStatementKey(nextTo, locationKwargs, relation, attributeList)
+		"""
+
+		valueList = []
+		shapeList = [args]
+		for name, value in (("nextTo", nextTo), *locationKwargs.items()):
+			if (value is None):
+				shapeList.append((name, None))
+
+			elif (name in self.statementCache_exclude):
+				return None, None
+
+			elif (name in self.statementCache_locations):
+				shape = self._shapeLocation(name, value, valueList)
+				if (shape is NULL_private):
+					return None, None
+				shapeList.append((name, shape))
+
+			else:
+				shapeList.append((name, self._freeze(value)))
+
+		return tuple(shapeList), valueList
+
+	def _shapeLocation(self, name, value, valueList):
+		"""Returns the shape of a location kwarg, appending each value to 'valueList'.
+		Mirrors how configureLocation() walks 'value'. Returns NULL_private if it cannot be cached.
+
+		Example Input: _shapeLocation("nextTo", {"age": 24}, valueList)
+		"""
+
+		if (isinstance(value, dict)):
+			shapeList = []
+			for key, _value in value.items():
+				shape = self._shapeLocation(name, _value, valueList)
+				if (shape is NULL_private):
+					return NULL_private
+				shapeList.append((key, shape))
+			return tuple(shapeList)
+
+		if (name in ("isIn", "isNotIn")):
+			value = tuple(self.ensure_container(value))
+			if ((not value) or (len(value) > self.inList_chunkSize)):
+				return NULL_private
+			valueList.append(value)
+			return "list"
+
+		if (isinstance(value, (str, int, float))):
+			valueList.append(value)
+			return "value"
+
+		if (not isinstance(value, (list, tuple, set))):
+			return NULL_private
+
+		shapeList = []
+		for item in value:
+			shape = self._shapeLocation(name, item, valueList)
+			if (shape is NULL_private):
+				return NULL_private
+			shapeList.append(shape)
+		return tuple(shapeList)
+
+	def _bindLocation(self, name, value, counter):
+		"""Returns a copy of a location kwarg where each value is replaced by a bind parameter.
+		Bind parameters are numbered in the same order that _shapeLocation() appends values.
+
+		Example Input: _bindLocation("nextTo", {"age": 24}, itertools.count())
+		"""
+
+		if (value is None):
+			return None
+
+		if (isinstance(value, dict)):
+			return {key: self._bindLocation(name, _value, counter) for key, _value in value.items()}
+
+		if (name in ("isIn", "isNotIn")):
+			return sqlalchemy.bindparam(f"location_{next(counter)}", expanding = True)
+
+		if (name not in self.statementCache_locations):
+			return value
+
+		if (isinstance(value, (str, int, float))):
+			return sqlalchemy.bindparam(f"location_{next(counter)}")
+
+		return [self._bindLocation(name, item, counter) for item in value]
+
+	def getCacheInfo_statement(self):
+		"""Returns how well the statement cache used by yieldValueQuery() and getValue() is doing.
+
+		Example Input: getCacheInfo_statement()
+		"""
+
+		with self.threadLock:
+			return {"hits": self.statementCache_hits, "misses": self.statementCache_misses, "size": len(self.cache_statement)}
+
+	def clearCache_statement(self):
+		"""Empties the statement cache used by yieldValueQuery() and getValue().
+
+		Example Input: clearCache_statement()
+		"""
+
+		with self.threadLock:
+			self.cache_statement.clear()
+			self.cache_compiled.clear()
+
+	def setResultCache(self, maxsize = 1000, maxBytes = None, ttl = None):
+		"""Turns on caching answers from getValue() until a relation they read from changes.
+		Only changes made through this database are seen; use 'ttl' if other processes change the same relations.
+		Lookups that cannot use the statement cache are not cached; see: statementCache_exclude
+
+		maxsize (int) - How many answers to keep
+			- If None or 0: Turns the cache off
+		maxBytes (int) - Roughly how much memory the answers may use
+			- If None: Will not limit memory
+		ttl (float) - How many seconds an answer can be used for
+			- If None: Answers are used until something changes
+
+		Example Input: setResultCache()
+		Example Input: setResultCache(maxBytes = 10 * 1024 ** 2, ttl = 60)
+		Example Input: setResultCache(None)
+		"""
+
+		with self.threadLock:
+			if (not maxsize):
+				self.resultCache = None
+			else:
+				self.resultCache = ResultCache(maxsize = maxsize, maxBytes = maxBytes, ttl = ttl)
+
+	def getCacheInfo_result(self):
+		"""Returns how well the result cache used by getValue() is doing.
+
+		Example Input: getCacheInfo_result()
+		"""
+
+		if (self.resultCache is None):
+			return {"hits": 0, "misses": 0, "evictions": 0, "size": 0, "bytes": 0}
+		return self.resultCache.getInfo()
+
+	def clearCache_result(self):
+		"""Empties the result cache used by getValue().
+
+		Example Input: clearCache_result()
+		"""
+
+		if (self.resultCache is not None):
+			self.resultCache.clear()
+
+	def _getResultRelations(self, resultKey, query):
+		"""Returns which relations 'query' reads from; they are only looked for once for each shape of query.
+
+		resultKey (tuple) - The key for 'query' from _yieldValueQuery()
+		"""
+
+		statementKey = resultKey[0]
+		with self.threadLock:
+			relationList = self.cache_resultRelations.get(statementKey)
+		
+		if (relationList is None):
+			statement = query.statement if isinstance(query, sqlalchemy.orm.Query) else query
+			relationList = tuple(sorted({table.name for table in sqlalchemy.sql.util.find_tables(statement) if isinstance(table, sqlalchemy.Table)}))
+			with self.threadLock:
+				self.cache_resultRelations[statementKey] = relationList
+
+		return relationList
+
+	def clearCache_label(self, relation = None):
+		"""Empties the label cache used for foreign keys; use after changing a relation without the schema.
+
+		relation (str) - Which relation to clear the label cache for
+			- If None: Will clear the label cache for all relations
+
+		Example Input: clearCache_label()
+		Example Input: clearCache_label("Choices_Job")
+		"""
+
+		if ((self.schema is None) or isinstance(self.schema, EmptySchema)):
+			return
+
+		if (relation is None):
+			relationList = self.schema.relationCatalogue.values()
+		else:
+			relationList = (self.schema.relationCatalogue.get(relation),)
+
+		for relationHandle in relationList:
+			if (relationHandle is not None):
+				relationHandle.clearLabelCache()
+
 	def _yieldValue_getConnection(self, fromSchema):
 		if (fromSchema is None or (self.schema is None) or (isinstance(self.schema, EmptySchema))):
 			return self.makeConnection(asTransaction = True)
@@ -2951,6 +5658,18 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 			- If None: The session is not returned
 				~ If 'fromSchema' is True: All values in 'myTuple' will be eagerly loaded before the session is closed
 
+		stream (bool)   - Determines if the answer is read from the database all at once
+			- If True: Returns a generator that reads 'chunkSize' rows at a time; the connection stays open until the generator is exhausted or closed
+				~ Yields each row, or (relation, row) if 'forceRelation' is True or there are multiple relations
+				~ 'valuesAsSet', 'attributeFirst', 'forceTuple', 'noAnswer' and 'includeSession' are ignored
+			- If False: Returns the whole answer
+		chunkSize (int) - How many rows to read at a time if 'stream' or 'columnar' is used
+		columnar (bool) - Determines if the answer is given as columns instead of rows
+			- If True: Returns {attribute: column}, where each column is a numpy array if numpy is installed, otherwise a ColumnArray
+			- If 'numpy': Each column is a numpy array; columns with NULL values are masked arrays
+			- If 'array': Each column is a ColumnArray, where NULL values are marked in its 'mask'
+			- If False: Returns rows
+
 		Example Input: getValue({"Users": "name"})
 		Example Input: getValue({"Users": "name"}, valuesAsList = True)
 		Example Input: getValue({"Users": "name"}, valuesAsRows = None)
@@ -2970,6 +5689,8 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		Example Input: getValue({"Users": "name", "Names": ["first_name", "extra_data"]})
 
 		Example Input: getValue({"Users": "name"}, {"age": 24})
+		Example Input: getValue({"Users": ["name", "age"]}, stream = True, chunkSize = 500)
+		Example Input: getValue({"Users": ["age", "height"]}, columnar = True)
 		Example Input: getValue({"Users": "name"}, {"age": 24, height: 6})
 		Example Input: getValue({"Users": "name"}, {"age": 24, height: 6}, nextToCondition = False)
 
@@ -2994,7 +5715,33 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 					yield item
 			return
 
-		#####################################################################
+		for relation, attributeList, query, params, resultKey in self._yieldValueQuery(myTuple, nextTo, connection = connection, 
+			count = count, fromSchema = fromSchema, foreignAsDict = foreignAsDict, includeSession = includeSession, 
+			orderBy = orderBy, limit = limit, direction = direction, nullFirst = nullFirst, alias = alias, join = join, 
+			includeDuplicates = includeDuplicates, exclude = exclude, forceMatch = forceMatch, foreignDefault = foreignDefault, **locationKwargs):
+
+			if (params):
+				query = query.params(params)
+
+			if (yieldQueryOnly):
+				yield query
+			else:
+				yield relation, attributeList, query
+
+	def _yieldValueQuery(self, myTuple, nextTo = None, *, connection = None, 
+		count = False, fromSchema = False, foreignAsDict = False, includeSession = None, 
+		orderBy = None, limit = None, direction = None, nullFirst = None, alias = None, join = None,
+		includeDuplicates = True, exclude = None, forceMatch = None, foreignDefault = None, **locationKwargs):
+		"""Yields (relation, attributeList, query, params, resultKey) for each relation in 'myTuple'; see yieldValueQuery() for the parameters.
+		Queries for the metadata and dictionary paths (fromSchema is None or False) are kept in the statement cache by their shape,
+		with every location value replaced by a bind parameter. Repeated lookups skip building the query, and for the metadata path,
+		compiling it as well, as long as the query is executed with 'params' on a connection using 'cache_compiled'.
+
+		params (dict) - What to bind to the query when executing it
+			- If None: Nothing needs to be bound
+		resultKey (tuple) - What the answer to the query can be kept under in the result cache, made without compiling the query; see: setResultCache()
+			- If None: The query cannot be cached
+		"""
 
 		if ((self.schema is None) or (isinstance(self.schema, EmptySchema))):
 			fromSchema = None
@@ -3023,6 +5770,24 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 
 				return connection.query(*schema.yieldColumn(attributeList, excludeList, alias, foreignAsDict = foreignAsDict, foreignDefault = foreignDefault)).select_from(schema)
 
+		def buildQuery(relation, attributeList, schema, table, _nextTo, _locationKwargs):
+			nonlocal self, connection, fromSchema, join, foreignAsDict, orderBy, direction, nullFirst, limit, includeDuplicates, count
+
+			query = startQuery(relation, attributeList, schema, table)
+			query = self.configureJoinForeign(query, relation, schema, table, attributeList, fromSchema = fromSchema)
+			query = self.configureJoinDomestic(query, relation, schema, table, connection, fromSchema, join, foreignAsDict)
+			query = self.configureOrder(query, relation, schema, table, orderBy = orderBy, direction = direction, nullFirst = nullFirst)
+			query = self.configureLocation(query, schema, table, fromSchema = fromSchema, connection = connection, nextTo = _nextTo, **_locationKwargs)
+
+			if (limit is not None):
+				query = query.limit(limit)
+			if (not includeDuplicates):
+				query = query.distinct()
+			if (count and (fromSchema is None)):
+				query = query.count()
+
+			return query
+
 		########################################################################
 
 		if (not isinstance(exclude, dict)):
@@ -3040,101 +5805,185 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 			schema = self.getSchema(relation)#, forceMatch = True)
 			table = self.metadata.tables[relation]
 
-			query = startQuery(relation, attributeList, schema, table)
-			query = self.configureJoinForeign(query, relation, schema, table, attributeList, fromSchema = fromSchema)
-			query = self.configureJoinDomestic(query, relation, schema, table, connection, fromSchema, join, foreignAsDict)
-			query = self.configureOrder(query, relation, schema, table, orderBy = orderBy, direction = direction, nullFirst = nullFirst)
-			query = self.configureLocation(query, schema, table, fromSchema = fromSchema, nextTo = nextTo, **locationKwargs)
+			if (fromSchema):
+				key = None
+			else:
+				key, valueList = self._getStatementKey(nextTo, locationKwargs, relation, self._freeze(attributeList), fromSchema, count, foreignAsDict, 
+					self._freeze(foreignDefault), self._freeze(orderBy), self._freeze(direction), nullFirst, limit, self._freeze(alias), self._freeze(join), 
+					includeDuplicates, self._freeze(excludeList))
 
-			if (limit is not None):
-				query = query.limit(limit)
-			if (not includeDuplicates):
-				query = query.distinct()
-			if (count and (fromSchema is None)):
-				query = query.count()
+			if (key is None):
+				yield relation, attributeList, buildQuery(relation, attributeList, schema, table, nextTo, locationKwargs), None, None
+				continue
 
-			if (yieldQueryOnly):
-				yield query
+			with self.threadLock:
+				query = self.cache_statement.get(key)
+				if (query is None):
+					self.statementCache_misses += 1
+				else:
+					self.statementCache_hits += 1
+
+			if (query is None):
+				counter = itertools.count()
+				query = buildQuery(relation, attributeList, schema, table, self._bindLocation("nextTo", nextTo, counter), 
+					{name: self._bindLocation(name, value, counter) for name, value in locationKwargs.items()})
+
+				with self.threadLock:
+					self.cache_statement[key] = query
+
+			params = {f"location_{i}": value for i, value in enumerate(valueList)}
+			resultKey = (key, self._freeze(valueList))
+			if (fromSchema is None):
+				yield relation, attributeList, query, params, resultKey
 			else:
-				yield relation, attributeList, query
+				yield relation, attributeList, query.with_session(connection).params(params), None, resultKey
 
-	def getValue(self, myTuple, nextTo = None, *args, 
-		count = False, fromSchema = False, foreignAsDict = False, includeSession = None, 
-		valuesAsSet = False, onlyOne = False, attributeFirst = False, noAnswer = NULL_private, 
-		forceRelation = False, forceAttribute = False, forceTuple = False, **kwargs):
-		if ((self.schema is None) or (isinstance(self.schema, EmptySchema))):
-			fromSchema = None
+	@classmethod
+	@MyUtilities.caching.cached(cache_shapingPlan)
+	def _getShapingPlan(cls, keyList):
+		"""Returns how to turn a result row with the labels 'keyList' into a nested catalogue.
+		The labels are only parsed once for each statement, so rows can be built by index.
+		The plan is (attribute, index, foreignList) for each attribute, where foreignList is ((foreign attribute, index), ...) for foreign keys and None otherwise.
+		If an attribute is given more than once, the plan is (None, ((index, attribute, foreign attribute), ...)) instead.
 
-		def _makeCatalogue(result):
-			nonlocal attributeList
+		keyList (tuple) - The labels of the result row
 
-			class _dict(dict):
-				"""Used to allow value to be a dict without messing up the process below."""
-			class _list(list):
-				"""Used to allow value to be a list without messing up the process below."""
+		Example Input: _getShapingPlan(("label", "zfk_job_zfk_label", "zfk_job_zfk_databaseId"))
+		"""
 
-			def _formatValue(existingValue, newValue):
+		entryList = []
+		for index, key in enumerate(keyList):
+			foreignMatch = re.search("zfk_(.*)_zfk_(.*)", key)
+			if (foreignMatch):
+				entryList.append((index, foreignMatch.group(1), foreignMatch.group(2)))
+			else:
+				entryList.append((index, key, None))
+
+		catalogue = {}
+		for index, attribute, foreign_attribute in entryList:
+			if (foreign_attribute is None):
+				if (attribute in catalogue):
+					return (None, tuple(entryList))
+				catalogue[attribute] = index
+				continue
 
-				if (isinstance(existingValue, _list)):
-					existingValue.append(newValue)
-				else:
-					existingValue = _list(existingValue, newValue)
-				return existingValue
+			foreignList = catalogue.setdefault(attribute, [])
+			if ((not isinstance(foreignList, list)) or any(foreign_attribute == item for item, _ in foreignList)):
+				return (None, tuple(entryList))
+			foreignList.append((foreign_attribute, index))
 
-			############################################
-			
-			catalogue = collections.defaultdict(_dict)
-			if (fromSchema is None):
-				iterator = result.items()
+		return tuple((attribute, None, tuple(value)) if isinstance(value, list) else (attribute, value, None) for attribute, value in catalogue.items())
+
+	@classmethod
+	def _applyShapingPlan(cls, plan, row):
+		"""Returns a nested catalogue for 'row' using a plan from _getShapingPlan().
+		If an attribute is a foreign key: {domestic attribute: {foreign attribute: foreign value}}
+
+		Example Input: _applyShapingPlan(plan, row)
+		"""
+
+		if (plan and (plan[0] is None)):
+			return cls._applyShapingPlan_merge(plan[1], row)
+
+		return {attribute: (row[index] if (foreignList is None) else {foreign_attribute: row[_index] for foreign_attribute, _index in foreignList}) 
+			for attribute, index, foreignList in plan}
+
+	@classmethod
+	def _applyShapingPlan_merge(cls, entryList, row):
+		"""Returns a nested catalogue for 'row' where attributes can be given more than once.
+		Repeated values are gathered into a list.
+
+		Example Input: _applyShapingPlan_merge(((0, "label", None), (1, "label", None)), row)
+		"""
+
+		class _dict(dict):
+			"""Used to allow value to be a dict without messing up the process below."""
+		class _list(list):
+			"""Used to allow value to be a list without messing up the process below."""
+
+		def _formatValue(existingValue, newValue):
+
+			if (isinstance(existingValue, _list)):
+				existingValue.append(newValue)
 			else:
-				iterator = result._asdict().items()
+				existingValue = _list((existingValue, newValue))
+			return existingValue
 
-			for key, value in iterator:
-				foreignMatch = re.search("zfk_(.*)_zfk_(.*)", key)
+		############################################
 
-				if (foreignMatch):
-					attribute = foreignMatch.group(1)
-					foreign_attribute = foreignMatch.group(2)
+		catalogue = collections.defaultdict(_dict)
+		for index, attribute, foreign_attribute in entryList:
+			value = row[index]
+
+			if (attribute not in catalogue):
+				if (foreign_attribute is None):
+					catalogue[attribute] = value
 				else:
-					attribute = key
-					foreign_attribute = None
+					catalogue[attribute][foreign_attribute] = value
+				continue
 
-				# if (attribute not in attributeList):
-				# 	continue
+			if (not isinstance(catalogue[attribute], _dict)):
+				_value = catalogue[attribute]
+				catalogue[attribute] = _dict()
+				catalogue[attribute][foreign_attribute] = _formatValue(_value, value)
+				continue
 
-				if (attribute not in catalogue):
-					if (foreign_attribute is None):
-						catalogue[attribute] = value
-					else:
-						catalogue[attribute][foreign_attribute] = value
-					continue
+			if (foreign_attribute not in catalogue[attribute]):
+				catalogue[attribute][foreign_attribute] = value
+			else:
+				catalogue[attribute][foreign_attribute] = _formatValue(catalogue[attribute][foreign_attribute], value)
+		return dict(catalogue)
 
-				if (not isinstance(catalogue[attribute], _dict)):
-					_value = catalogue[attribute]
-					catalogue[attribute] = _dict()
-					catalogue[attribute][foreign_attribute] = _formatValue(_value, value)
-					continue
+	@wrap_retry()
+	def getValue(self, myTuple, nextTo = None, *args, 
+		count = False, fromSchema = False, foreignAsDict = False, includeSession = None, 
+		valuesAsSet = False, onlyOne = False, attributeFirst = False, noAnswer = NULL_private, 
+		forceRelation = False, forceAttribute = False, forceTuple = False, stream = False, chunkSize = 1000, columnar = False, **kwargs):
+		if (columnar):
+			return self._getValue_columnar(myTuple, nextTo, *args, columnar = columnar, chunkSize = chunkSize, forceRelation = forceRelation, foreignAsDict = foreignAsDict, **kwargs)
 
-				if (foreign_attribute not in catalogue[attribute]):
-					catalogue[attribute][foreign_attribute] = value
-				else:
-					catalogue[attribute][foreign_attribute] = _formatValue(catalogue[attribute][foreign_attribute], value)
-			return dict(catalogue)
+		if ((self.schema is None) or (isinstance(self.schema, EmptySchema))):
+			fromSchema = None
+
+		def fetchResult(query, params):
+			nonlocal cachedConnection
+
+			result = cachedConnection.execute(query, **params)
+			if (not stream):
+				return result.fetchall()
+			return yieldChunk(result)
+
+		def yieldChunk(result):
+			nonlocal chunkSize
+
+			try:
+				while True:
+					rowList = result.fetchmany(chunkSize)
+					if (not rowList):
+						break
+					for row in rowList:
+						yield row
+			finally:
+				result.close()
+
+		def _makeCatalogue(result, plan):
+			return self._applyShapingPlan(plan, result)
 
 		if (fromSchema is None):
-			def yieldRow(query):
-				nonlocal connection, attributeList
+			def yieldRow(query, params):
+				nonlocal cachedConnection, attributeList
 
 				catalogue = self.engine.url.query
 				if (("charset" in catalogue) and (catalogue["charset"] != "utf8")):
 					def yieldResult():
-						nonlocal connection, query
+						nonlocal cachedConnection, query, params
 
 						if (onlyOne):
 							def _yieldResult():
-								yield connection.execute(query).first()
+								yield cachedConnection.execute(query, **params).first()
 						else:
-							_yieldResult = connection.execute(query).fetchall
+							def _yieldResult():
+								return fetchResult(query, params)
 
 						##############################
 
@@ -3155,12 +6004,14 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 			
 				elif (onlyOne):
 					def yieldResult():
-						yield connection.execute(query).first()
+						yield cachedConnection.execute(query, **params).first()
 				else:
-					yieldResult = connection.execute(query).fetchall
+					def yieldResult():
+						return fetchResult(query, params)
 
 				###################################
 
+				plan = None
 				for result in itertools.filterfalse(lambda x: x is None, yieldResult()):
 					if ((not forceAttribute) and (len(result) <= 1)):
 						yield result[0]
@@ -3169,10 +6020,12 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 						yield dict(result)
 
 					else:
-						yield _makeCatalogue(result)
+						if (plan is None):
+							plan = self._getShapingPlan(tuple(result.keys()))
+						yield _makeCatalogue(result, plan)
 
 		elif (fromSchema):
-			def yieldRow(query):
+			def yieldRow(query, params):
 				nonlocal count              
 
 				if (count):
@@ -3183,11 +6036,17 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 					yield query.first()
 					return
 
-				for result in query.all():
+				if (stream):
+					#Eager loading cannot be used with yield_per(); the session stays open until the stream is done, so lazy loading still works
+					answer = query.enable_eagerloads(False).yield_per(chunkSize)
+				else:
+					answer = query.all()
+
+				for result in answer:
 					yield result
 
 		else:
-			def yieldRow(query):
+			def yieldRow(query, params):
 				nonlocal count
 
 				if (count):
@@ -3196,9 +6055,12 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 
 				if (onlyOne):
 					answer = (query.first(),)
+				elif (stream):
+					answer = query.yield_per(chunkSize)
 				else:
 					answer = query.all()
 
+				plan = None
 				for result in answer:
 					if (result is None):
 						continue
@@ -3210,13 +6072,15 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 						yield result._asdict()
 
 					else:
-						yield _makeCatalogue(result)
+						if (plan is None):
+							plan = self._getShapingPlan(tuple(result.keys()))
+						yield _makeCatalogue(result, plan)
 
 		container = (tuple, set)[valuesAsSet]
-		def getResult(query):
+		def getResult(query, params):
 			nonlocal forceTuple, container, noAnswer
 
-			answer = container(yieldRow(query))
+			answer = container(yieldRow(query, params or {}))
 
 			if (not answer):
 				if (noAnswer is NULL_private):
@@ -3238,20 +6102,145 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 			else:
 				return answer[0]
 
+		def yieldStream():
+			nonlocal self, myTuple, nextTo, args, count, fromSchema, foreignAsDict, kwargs, cachedConnection, attributeList
+
+			with self._yieldValue_getConnection(fromSchema = fromSchema) as connection:
+				if (fromSchema is None):
+					cachedConnection = connection.execution_options(compiled_cache = self.cache_compiled, stream_results = True)
+
+				for relation, attributeList, query, params, resultKey in self._yieldValueQuery(myTuple, nextTo, *args, connection = connection, count = count, fromSchema = fromSchema, foreignAsDict = foreignAsDict, **kwargs):
+					if (forceRelation or (len(myTuple) > 1)):
+						for row in yieldRow(query, params or {}):
+							yield relation, row
+					else:
+						for row in yieldRow(query, params or {}):
+							yield row
+
+		def getResult_cached(query, params, resultKey):
+			nonlocal resultCache
+
+			if ((resultCache is None) or (resultKey is None)):
+				return getResult(query, params)
+
+			self.checkExternalChanges()
+			relationList = self._getResultRelations(resultKey, query)
+			key = (resultKey, count, forceAttribute, foreignAsDict, valuesAsSet, onlyOne, attributeFirst, forceTuple, self.getSchemaEpoch())
+
+			#The versions must be read before the query runs, so a change made while it runs is not hidden
+			versions = self.getRelationVersion(relationList)
+			answer = resultCache.get(key, versions)
+			if (answer is NULL_private):
+				answer = getResult(query, params)
+				resultCache.set(key, answer, versions)
+			return answer
+
 		########################################################################
 
+		if (stream):
+			return yieldStream()
+
+		resultCache = self.resultCache
+		if (fromSchema or includeSession or (includeSession is False) or (noAnswer is not NULL_private) or (self.getActiveConnection() is not None)):
+			#Answers that are objects, are tied to a session, or could include uncommitted changes are not cached
+			resultCache = None
+
 		results_catalogue = {}
 		with self._yieldValue_getConnection(fromSchema = fromSchema) as connection:
 			if (includeSession):
 				results_catalogue[None] = connection
 
-			for relation, attributeList, query in self.yieldValueQuery(myTuple, nextTo, *args, connection = connection, count = count, fromSchema = fromSchema, foreignAsDict = foreignAsDict, includeSession = includeSession, **kwargs):
-				results_catalogue[relation] = getResult(query)
+			if (fromSchema is None):
+				#Reuse the compiled form of cached statements
+				cachedConnection = connection.execution_options(compiled_cache = self.cache_compiled)
+
+			for relation, attributeList, query, params, resultKey in self._yieldValueQuery(myTuple, nextTo, *args, connection = connection, count = count, fromSchema = fromSchema, foreignAsDict = foreignAsDict, includeSession = includeSession, **kwargs):
+				results_catalogue[relation] = getResult_cached(query, params, resultKey)
 		
 			if (includeSession is False):
 				return connection, self.oneOrMany(results_catalogue, forceTuple = forceRelation, isDict = True)
 		return self.oneOrMany(results_catalogue, forceTuple = forceRelation, isDict = True)
 
+	def _getValue_columnar(self, myTuple, nextTo = None, *args, columnar = True, chunkSize = 1000, forceRelation = False, foreignAsDict = False, **kwargs):
+		"""Returns {attribute: column} for each relation in 'myTuple', filling each column straight from the cursor.
+		Always uses the metadata; see getValue() for the other kwargs.
+
+		columnar (str) - What each column will be
+			- If True: A numpy array if numpy is installed, otherwise the same as 'array'
+			- If 'numpy': A numpy array; columns with NULL values are masked arrays
+			- If 'array': A ColumnArray, where NULL values are marked in its 'mask'
+				~ Columns that cannot be held by an array (strings, dates, etc.) are lists
+				~ So are columns that hold a value their type does not allow, such as text or a very large number in an INTEGER column
+
+		Example Input: _getValue_columnar({"Users": ["age", "height"]})
+		"""
+
+		if (columnar is True):
+			columnar = ("array", "numpy")[numpy is not None]
+		elif ((columnar == "numpy") and (numpy is None)):
+			raise ImportError("numpy is required for getValue(columnar = 'numpy')")
+
+		def extendColumn(column, valueList):
+			if (not isinstance(column, ColumnArray)):
+				column.extend(valueList)
+				return column
+
+			length = len(column)
+			try:
+				column.extend(0 if (value is None) else value for value in valueList)
+			except (TypeError, OverflowError):
+				#SQLite lets any column hold any type, so a value the array cannot hold turns the column into a list
+				del column[length:]
+				if (column.mask is None):
+					return [*column, *valueList]
+				return [*(None if isNull else value for value, isNull in zip(column, column.mask)), *valueList]
+
+			if (None in valueList):
+				if (column.mask is None):
+					column.mask = array.array("b", itertools.repeat(0, length))
+				column.mask.extend(value is None for value in valueList)
+			elif (column.mask is not None):
+				column.mask.extend(itertools.repeat(0, len(valueList)))
+			return column
+
+		def finishColumn(column):
+			if (columnar != "numpy"):
+				return column
+
+			if (not isinstance(column, ColumnArray)):
+				data = numpy.empty(len(column), dtype = object)
+				data[:] = column
+				if (None not in column):
+					return data
+				return numpy.ma.MaskedArray(data, mask = [value is None for value in column])
+
+			data = numpy.frombuffer(column, dtype = column.typecode)
+			if (column.mask is None):
+				return data
+			return numpy.ma.MaskedArray(data, mask = numpy.frombuffer(column.mask, dtype = bool))
+
+		########################################################################
+
+		results_catalogue = {}
+		with self.makeConnection(asTransaction = True) as connection:
+			cachedConnection = connection.execution_options(compiled_cache = self.cache_compiled, stream_results = True)
+			for relation, attributeList, query, params, resultKey in self._yieldValueQuery(myTuple, nextTo, *args, connection = connection, fromSchema = None, foreignAsDict = foreignAsDict, **kwargs):
+				result = cachedConnection.execute(query, **(params or {}))
+				try:
+					keyList = result.keys()
+					columnList = [ColumnArray(typecode) if (typecode is not None) else [] for typecode in (self.getArrayTypecode(column.type) for column in query.columns)]
+
+					while True:
+						rowList = result.fetchmany(chunkSize)
+						if (not rowList):
+							break
+						columnList = [extendColumn(column, valueList) for column, valueList in zip(columnList, zip(*rowList))]
+				finally:
+					result.close()
+
+				results_catalogue[relation] = {key: finishColumn(column) for key, column in zip(keyList, columnList)}
+		return self.oneOrMany(results_catalogue, forceTuple = forceRelation, isDict = True)
+
 	@wrap_errorCheck()
 	def createProcedure(self, label, procedure, procedureArgs = None, applyChanges = None):
 		"""Creates a stored procedure.
@@ -3332,6 +6321,11 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 			~ 'lastModified' - Updates 'reaction_attribute' in 'reaction_relation' to the current date
 				- reaction_attribute default: 'lastModified'
 
+			~ 'bumpVersion' - Adds 1 to the version of 'reaction_relation' in '_db_table_versions'; see: watchRelations()
+
+			~ 'capture' - Records which row of 'reaction_relation' was changed, and how, in '_db_change_log'; see: captureChanges()
+				- Use event_when = 'after' so rolled back statements are not recorded
+
 			~ 'ignore'
 
 			~ 'validate'
@@ -3347,14 +6341,16 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 			- If None: The default flag set upon opening the database will be used
 
 		Example Input: createTrigger("Users_lastModified", "Users", reaction = "lastModified")
+		Example Input: createTrigger("Users_version", "Users", event = "insert", event_when = "after", reaction = "bumpVersion")
 		"""
 
 		def yield_raw_sql():
+			quote = self.engine.dialect.identifier_preparer.quote
 
 			yield "CREATE TRIGGER"
 			if (noReplication != None):
 				yield "IF NOT EXISTS"
-			yield f"{label}"
+			yield quote(label)
 
 			#Create Condition
 			if (event_when[0] == "b"):
@@ -3372,16 +6368,23 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 				yield "DELETE"
 
 			if (event_attribute != None):
-				yield f"OF {event_attribute}"
+				yield f"OF {quote(event_attribute)}"
 			
-			yield f"ON {event_relation} FOR EACH ROW"
+			yield f"ON {quote(event_relation)} FOR EACH ROW"
 
 			#Create Reation
+			yield "BEGIN"
 			if (reaction[0] == "l"):
-				yield f"UPDATE {reaction_relation} SET {reaction_attribute} = strftime('%m/%d/%Y %H:%M:%S:%s','now', 'localtime') WHERE (rowid = new.rowid);"
+				yield f"UPDATE {quote(reaction_relation)} SET {quote(reaction_attribute)} = strftime('%m/%d/%Y %H:%M:%S:%s','now', 'localtime') WHERE (rowid = new.rowid);"
+			elif (reaction[0] == "b"):
+				relation_escaped = reaction_relation.replace("'", "''")
+				yield f"UPDATE {quote(self.tableVersionHandle.name)} SET version = version + 1 WHERE (relation = '{relation_escaped}');"
+			elif (reaction[0] == "c"):
+				yield from self._yieldCaptureSql(reaction_relation, event[0])
 			else:
 				errorMessage = f"Unknown reaction {reaction} in createTrigger() for {self.__repr__()}"
 				raise KeyError(errorMessage)
+			yield "END"
 
 		############################
 
@@ -3430,6 +6433,25 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		Example Input: getTrigger("Users_lastModified")
 		"""
 
+		if (self.isSQLite):
+			command = "SELECT name FROM sqlite_master WHERE (type = 'trigger')"
+		elif (self.isMySQL):
+			command = "SELECT TRIGGER_NAME FROM information_schema.TRIGGERS WHERE (TRIGGER_SCHEMA = DATABASE())"
+		else:
+			errorMessage = f"Getting triggers is not supported for {self.connectionType}"
+			raise NotImplementedError(errorMessage)
+
+		with self.makeConnection(asTransaction = False) as connection:
+			triggerList = [row[0] for row in connection.execute(command)]
+
+		if (label is not None):
+			if (label in triggerList):
+				return label
+			return None
+
+		excludeList = self.ensure_container(exclude)
+		return [trigger for trigger in triggerList if (trigger not in excludeList)]
+
 	@wrap_errorCheck()
 	def removeTrigger(self, label = None, applyChanges = None):
 		"""Removes an event trigger.
@@ -3453,7 +6475,7 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 
 			for trigger in triggerList:
 				#Execute SQL
-				self.executeCommand("DROP TRIGGER IF EXISTS [{}]".format(trigger))
+				self.executeCommand(f"DROP TRIGGER IF EXISTS {self.engine.dialect.identifier_preparer.quote(trigger)}")
 
 			#Save Changes
 			if (applyChanges == None):
@@ -3481,15 +6503,272 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 	def removeIndex(self, relation = None, attribute = None, name = None, noReplication = False):
 		"""Removes an index for the given attribute."""
 
-	def backup(self, destination = None, *, username = None, password = None, closeIO = None):
+	#Backups
+	backup_compressList = ("gzip", "bz2", "lzma")
+	backup_deltaHeader = b"SQLite page delta 1\n"
+
+	@classmethod
+	def openCompressed(cls, filePath, mode = "rb", compress = None):
+		"""Opens a binary file, compressing or decompressing it as it is written or read.
+
+		compress (str) - How the file is compressed
+			~ 'gzip', 'bz2', 'lzma'
+			- If None: The file is not compressed
+
+		Example Input: openCompressed("backup.db.gz", "wb", compress = "gzip")
+		"""
+
+		if (compress is None):
+			return open(filePath, mode)
+
+		if (compress not in cls.backup_compressList):
+			errorMessage = f"Unknown compression {compress}; must be one of {cls.backup_compressList}"
+			raise KeyError(errorMessage)
+
+		return importlib.import_module(compress).open(filePath, mode)
+
+	@classmethod
+	def getBackupManifestPath(cls, destination):
+		return f"{destination}.manifest"
+
+	@classmethod
+	def getBackupCompression(cls, filePath):
+		"""Returns how the file at 'filePath' is compressed, or None if it is not; see: openCompressed().
+
+		Example Input: getBackupCompression("backup/data.db.gz")
+		"""
+
+		with open(filePath, "rb") as fileHandle:
+			header = fileHandle.read(6)
+
+		if (header.startswith(b"\x1f\x8b")):
+			return "gzip"
+		if (header.startswith(b"BZh")):
+			return "bz2"
+		if (header.startswith(b"\xfd7zXZ\x00")):
+			return "lzma"
+		return None
+
+	def _backup_snapshot(self, filePath, pages = 1024, sleep = 0.005, progress = None):
+		"""Copies the database into the SQLite file 'filePath' with the online backup API, a few pages at a time.
+		Other connections can keep reading and writing between each step; if one of them writes, the copy continues from where it was.
+		Returns (pageSize, pageCount) for the copy.
+		"""
+
+		def onStep(status, remaining, total):
+			if (progress is not None):
+				progress(total - remaining, total)
+			if (sleep and remaining):
+				time.sleep(sleep)
+
+		##############################################
+
+		with self.makeConnection(raw = True) as connection:
+			source = getattr(connection, "connection", connection) #The pool wraps the sqlite3 connection
+			if (not hasattr(source, "backup")):
+				errorMessage = "The SQLite online backup API needs Python 3.7 or newer; use backup(binary = False) instead"
+				raise NotImplementedError(errorMessage)
+
+			target = sqlite3.connect(filePath)
+			try:
+				source.backup(target, pages = pages, progress = onStep, sleep = sleep or 0)
+				pageSize = target.execute("PRAGMA page_size").fetchone()[0]
+				pageCount = target.execute("PRAGMA page_count").fetchone()[0]
+			finally:
+				target.close()
+
+		return pageSize, pageCount
+
+	@classmethod
+	def _yieldPage(cls, filePath, pageSize):
+		with open(filePath, "rb") as fileHandle:
+			while True:
+				page = fileHandle.read(pageSize)
+				if (not page):
+					return
+				yield page
+
+	@contextlib.contextmanager
+	def _backup_liveFile(self):
+		"""Keeps the database file from changing until the with block is done, so its pages can be read straight from it.
+		Yields (filePath, pageSize, pageCount), or None if the file does not hold everything that was committed (or there is no file).
+		"""
+
+		filePath = self.engine.url.database
+		if ((not filePath) or (filePath == ":memory:")):
+			yield None
+			return
+
+		with self.makeConnection(raw = True) as connection:
+			connection = getattr(connection, "connection", connection) #The pool wraps the sqlite3 connection
+			isolation_level = connection.isolation_level
+			connection.isolation_level = None #Transactions are started and ended here instead of by the sqlite3 module
+			cursor = connection.cursor()
+			try:
+				#Writers cannot change the file while this reads it; in WAL mode, what they write stays in the WAL
+				cursor.execute("BEGIN")
+				cursor.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+
+				if (cursor.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"):
+					#A checkpoint cannot copy pages newer than what this is reading, so the file only matches it if everything in the WAL was copied
+					with self.makeConnection(raw = True) as checkpointConnection:
+						busy, logPages, copiedPages = getattr(checkpointConnection, "connection", checkpointConnection).execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+					if (busy or (logPages != copiedPages)):
+						yield None
+						return
+
+				yield (filePath, cursor.execute("PRAGMA page_size").fetchone()[0], cursor.execute("PRAGMA page_count").fetchone()[0])
+			finally:
+				if (connection.in_transaction):
+					cursor.execute("ROLLBACK")
+				cursor.close()
+				connection.isolation_level = isolation_level
+
+	def _backup_binary(self, destination, compress = None, incremental = False, **kwargs):
+		"""Writes a binary copy of the database to 'destination' (a file path or a binary stream).
+		For incremental backups after the first one, the pages of the database file are compared against the checksums in the manifest,
+		so only the pages that changed are read and nothing else is copied.
+		Returns what was written in the form: {"file": file path (str), "pages": pages written (int), "pageCount": pages in the database (int), "incremental": is a delta (bool)}
+		"""
+
+		def writeFull(snapshotPath):
+			if (isinstance(destination, str)):
+				with self.openCompressed(destination, "wb", compress = compress) as fileHandle, open(snapshotPath, "rb") as snapshotHandle:
+					shutil.copyfileobj(snapshotHandle, fileHandle)
+				return
+
+			with open(snapshotPath, "rb") as snapshotHandle:
+				if (compress is None):
+					shutil.copyfileobj(snapshotHandle, destination)
+					return
+
+				#Closing the compressor leaves 'destination' open
+				with importlib.import_module(compress).open(destination, "wb") as fileHandle:
+					shutil.copyfileobj(snapshotHandle, fileHandle)
+
+		def writeDelta(sourcePath, pageSize, pageCount, changedList):
+			filePath = f"{destination}.{len(manifest['deltas']) + 1}.delta"
+			with self.openCompressed(filePath, "wb", compress = compress) as fileHandle, open(sourcePath, "rb") as sourceHandle:
+				fileHandle.write(self.backup_deltaHeader)
+				fileHandle.write(json.dumps({"pageSize": pageSize, "pageCount": pageCount, "pages": len(changedList)}).encode() + b"\n")
+				for index in changedList:
+					sourceHandle.seek(index * pageSize)
+					fileHandle.write(struct.pack(">I", index))
+					fileHandle.write(sourceHandle.read(pageSize))
+
+			manifest["deltas"].append({"file": os.path.basename(filePath), "pages": len(changedList), "pageCount": pageCount, "time": time.time()})
+			return {"file": filePath, "pages": len(changedList), "pageCount": pageCount, "incremental": True}
+
+		def getHashes(filePath, pageSize, pageCount):
+			hashList = []
+			for page in itertools.islice(self._yieldPage(filePath, pageSize), pageCount):
+				hashList.append(hashlib.blake2b(page, digest_size = 16).hexdigest())
+				if ((progress is not None) and (not len(hashList) % (kwargs.get("pages") or 1))):
+					progress(len(hashList), pageCount)
+			return hashList
+
+		def getChanged(hashList):
+			oldList = manifest["hashes"]
+			return [index for index, item in enumerate(hashList) if ((index >= len(oldList)) or (oldList[index] != item))]
+
+		def backup_live():
+			"""Compares the database file against the manifest without copying it. Returns None if the file cannot be read directly."""
+
+			with self._backup_liveFile() as live:
+				if ((live is None) or (live[1] != manifest["pageSize"])):
+					return None
+
+				filePath, pageSize, pageCount = live
+				hashList = getHashes(filePath, pageSize, pageCount)
+				answer = writeDelta(filePath, pageSize, pageCount, getChanged(hashList))
+
+			return answer, pageCount, hashList
+
+		def backup_snapshot():
+			"""Compares a copy made with the online backup API against the manifest, or starts a new base if there is no usable manifest."""
+
+			nonlocal manifest
+
+			with tempfile.TemporaryDirectory() as folder:
+				#The online backup gives a consistent copy without keeping the database locked
+				snapshotPath = os.path.join(folder, "snapshot.db")
+				pageSize, pageCount = self._backup_snapshot(snapshotPath, **kwargs)
+
+				if (not incremental):
+					writeFull(snapshotPath)
+					return {"file": destination if isinstance(destination, str) else None, "pages": pageCount, "pageCount": pageCount, "incremental": False}, pageCount, None
+
+				hashList = [hashlib.blake2b(page, digest_size = 16).hexdigest() for page in self._yieldPage(snapshotPath, pageSize)]
+				if ((manifest is None) or (manifest["pageSize"] != pageSize)):
+					writeFull(snapshotPath)
+					manifest = {"base": os.path.basename(destination), "compress": compress, "pageSize": pageSize, "deltas": []}
+					return {"file": destination, "pages": pageCount, "pageCount": pageCount, "incremental": False}, pageCount, hashList
+
+				return writeDelta(snapshotPath, pageSize, pageCount, getChanged(hashList)), pageCount, hashList
+
+		##############################################
+
+		progress = kwargs.get("progress")
+		manifestPath = self.getBackupManifestPath(destination) if (incremental) else None
+		if (incremental and (not isinstance(destination, str))):
+			errorMessage = "Incremental backups must be written to a file path"
+			raise ValueError(errorMessage)
+
+		manifest = None
+		if (incremental and os.path.exists(manifestPath) and os.path.exists(destination)):
+			with open(manifestPath, "r") as fileHandle:
+				manifest = json.loads(fileHandle.read())
+			if (manifest.get("compress") != compress):
+				manifest = None
+
+		result = backup_live() if (manifest is not None) else None
+		if (result is None):
+			result = backup_snapshot()
+		answer, pageCount, hashList = result
+
+		if (not incremental):
+			return answer
+
+		manifest["pageCount"] = pageCount
+		manifest["hashes"] = hashList
+
+		#Replace the manifest in one step, so a crash cannot leave half of one behind
+		with open(f"{manifestPath}.tmp", "w") as fileHandle:
+			fileHandle.write(json.dumps(manifest))
+		os.replace(f"{manifestPath}.tmp", manifestPath)
+
+		self.log_info("Backup", **{key: value for key, value in answer.items() if (key != "file")}, file = answer["file"])
+		return answer
+
+	def backup(self, destination = None, *, username = None, password = None, closeIO = None, 
+		binary = False, incremental = False, compress = None, pages = 1024, sleep = 0.005, progress = None):
 		"""Backs up the database to the given destination.
 		If 'destination' is None, returns an io stream with the backup in it.
 
 		Modified code from Jeremy Brown on: https://stackoverflow.com/questions/3600948/python-subprocess-mysqldump-and-pipes/3601157#3601157
 		Special thanks to Cristian Porta for how to run mysqldump without generating password warnings on: https://stackoverflow.com/questions/20751352/suppress-warning-messages-using-mysql-from-within-terminal-but-password-written/20854048#20854048
 		Use: https://lyceum-allotments.github.io/2017/03/python-and-pipes-part-5-subprocesses-and-pipes/
+		Use: https://www.sqlite.org/backup.html
+
+		binary (bool) - Determines how a SQLite database is backed up
+			- If True: Copies the database file with the online backup API, 'pages' at a time, so writers are not locked out for the whole backup
+				~ Returns {"file": file path (str), "pages": pages written (int), "pageCount": pages in the database (int), "incremental": is a delta (bool)} unless 'destination' is None
+			- If False: Writes SQL that rebuilds the database
+		incremental (bool) - Determines if only the pages that changed since the last backup to 'destination' are written; 'destination' must be a file path
+			- If True: Makes a binary backup. The first one is a full copy at 'destination'; later ones are written to '{destination}.{n}.delta'
+				~ '{destination}.manifest' keeps a checksum for each page; later backups compare the database file against them instead of copying it; see: restore()
+			- If False: The whole database is written
+		compress (str) - How to compress the backup as it is written
+			~ 'gzip', 'bz2', 'lzma'
+			- If None: The backup is not compressed
+		pages (int) - How many pages to copy in each step of a binary backup
+		sleep (float) - How many seconds to wait between each step of a binary backup
+		progress (function) - What to call after each step of a binary backup with (pages copied, pages total)
 
 		Example Input: backup()
+		Example Input: backup("backup/data.sql")
+		Example Input: backup("backup/data.db", binary = True)
+		Example Input: backup("backup/data.db", incremental = True, compress = "gzip")
 		"""
 		global openPlus
 
@@ -3513,6 +6792,14 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 
 		##########################################################################
 
+		if (self.isSQLite and (binary or incremental)):
+			if (destination is None):
+				fileHandle = io.BytesIO()
+				self._backup_binary(fileHandle, compress = compress, pages = pages, sleep = sleep, progress = progress)
+				fileHandle.seek(0)
+				return fileHandle
+			return self._backup_binary(destination, compress = compress, incremental = incremental, pages = pages, sleep = sleep, progress = progress)
+
 		if (self.isMySQL):
 			dumpRoutine = dump_mySQL()
 		elif (self.isSQLite):
@@ -3520,6 +6807,18 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		else:
 			raise NotImplementedError(self.fileName)
 
+		if (compress is not None):
+			if (destination is None):
+				destination = io.BytesIO()
+			fileHandle = self.openCompressed(destination, "wb", compress = compress) if isinstance(destination, str) else importlib.import_module(compress).open(destination, "wb")
+			with fileHandle:
+				for item in dumpRoutine:
+					fileHandle.write(item.encode())
+			if (isinstance(destination, io.BytesIO)):
+				destination.seek(0)
+				return destination
+			return
+
 		with openPlus(destination, closeIO = self.ensure_default(closeIO, default = lambda: (not isinstance(destination, (io.IOBase, type(None)))))) as fileHandle:
 			for item in dumpRoutine:
 				fileHandle.write(item)
@@ -3527,13 +6826,265 @@ class Database(Utility_Base, MyUtilities.logger.LoggingFunctions):
 		if (destination is None):
 			return fileHandle
 
-	def restore(self, backupFile):
-		"""Restores a backup.
+	@wrap_errorCheck()
+	def restore(self, backupFile, *, replace = True, upTo = None, batchSize = 10000, pages = 1024, progress = None):
+		"""Restores a backup made with backup(), replacing what is in the database.
+		Binary backups are copied in with the online backup API. SQL backups are loaded into a new file in large transactions,
+		with indexes and triggers created only after all of the rows are in, and foreign keys checked once at the end; that file is then copied in the same way.
+		If anything goes wrong, the database is left as it was.
+		The 'bulk-load' profile is used while restoring; see: pragmaProfileCatalogue.
+		Compressed backups are found by their contents, so they do not need to be named a certain way.
+		Returns how long it took in the form: {"seconds": duration (float), ...}
+			~ For SQL backups, 'foreignKeyErrors' is how many restored rows do not match their foreign keys
+		Only supported for SQLite.
+
+		backupFile (str) - Where the backup is; can also be a stream returned by backup()
+			~ If '{backupFile}.manifest' exists, the deltas from incremental backups are applied as well
+		replace (bool) - Determines what happens to what is in the database when restoring a SQL backup
+			- If True: Every relation, index, trigger, and view is replaced by what is in the backup
+			- If False: The backup is added to what is already there, in one transaction
+		upTo (int) - How many deltas to apply from an incremental backup
+			- If None: Will apply all of them
+		batchSize (int) - How many SQL statements to run in each transaction when loading a SQL backup into a new file
+		pages (int) - How many pages to copy in each step for a binary backup
+		progress (function) - What to call as the backup is restored with (amount done, amount total)
+			~ Pages for a binary backup, and bytes read for a SQL backup
+
+		Example Input: restore("backup/data.db")
+		Example Input: restore("backup/data.db", upTo = 3)
+		Example Input: restore("backup/data.sql.gz", progress = lambda done, total: print(f"{done / total:.0%}"))
+		"""
+
+		if (not self.isSQLite):
+			errorMessage = f"Restoring is not supported for {self.connectionType}"
+			raise NotImplementedError(errorMessage)
+
+		with tempfile.TemporaryDirectory() as folder:
+			if (isinstance(backupFile, str)):
+				filePath = backupFile
+				if (os.path.exists(self.getBackupManifestPath(filePath))):
+					filePath = self._restore_applyDeltas(filePath, os.path.join(folder, "rebuilt.db"), upTo = upTo)
+			else:
+				filePath = os.path.join(folder, "backup")
+				with open(filePath, "wb") as fileHandle:
+					shutil.copyfileobj(backupFile, fileHandle)
+
+			compress = self.getBackupCompression(filePath)
+			with self.openCompressed(filePath, "rb", compress = compress) as fileHandle:
+				isBinary = fileHandle.read(16) == b"SQLite format 3\x00"
+
+			with self.profile("bulk-load"):
+				if (isBinary):
+					if (compress is not None):
+						#SQLite can only read a backup that is not compressed
+						with self.openCompressed(filePath, "rb", compress = compress) as fileHandle, open(os.path.join(folder, "restore.db"), "wb") as targetHandle:
+							shutil.copyfileobj(fileHandle, targetHandle)
+						filePath = os.path.join(folder, "restore.db")
+					answer = self._restore_binary(filePath, pages = pages, progress = progress)
+				else:
+					answer = self._restore_sql(filePath, compress = compress, replace = replace, batchSize = batchSize, pages = pages, progress = progress)
+
+		#Everything cached about the old database is wrong now
+		self.bumpSchemaEpoch()
+		self.bumpRelationVersion()
+		self.clearCache_result()
+		self.clearCache_label()
+		for allocator in self.metadata.info.get("idAllocator", {}).values():
+			allocator.forget()
+		self.refresh()
+
+		self.log_info("Restore", **answer)
+		return answer
 
-		Example Input: restore()
+	def _restore_applyDeltas(self, filePath, rebuiltPath, upTo = None):
+		"""Writes the full backup at 'filePath' to 'rebuiltPath' with the pages from its deltas applied in order; see: backup().
+		Returns 'rebuiltPath'.
 		"""
 
-		raise NotImplementedError()
+		with open(self.getBackupManifestPath(filePath), "r") as fileHandle:
+			manifest = json.loads(fileHandle.read())
+		compress = manifest.get("compress")
+
+		with self.openCompressed(filePath, "rb", compress = compress) as fileHandle, open(rebuiltPath, "wb") as targetHandle:
+			shutil.copyfileobj(fileHandle, targetHandle)
+
+		folder = os.path.dirname(filePath)
+		with open(rebuiltPath, "r+b") as targetHandle:
+			for delta in manifest["deltas"][:upTo]:
+				with self.openCompressed(os.path.join(folder, delta["file"]), "rb", compress = compress) as fileHandle:
+					if (fileHandle.readline() != self.backup_deltaHeader):
+						errorMessage = f"{delta['file']} is not a delta made by backup()"
+						raise ValueError(errorMessage)
+
+					header = json.loads(fileHandle.readline().decode())
+					pageSize = header["pageSize"]
+					for i in range(header["pages"]):
+						index = struct.unpack(">I", fileHandle.read(4))[0]
+						targetHandle.seek(index * pageSize)
+						targetHandle.write(fileHandle.read(pageSize))
+					targetHandle.truncate(header["pageCount"] * pageSize)
+
+		return rebuiltPath
+
+	def _restore_binary(self, filePath, pages = 1024, progress = None):
+		"""Copies the SQLite file at 'filePath' over the database with the online backup API."""
+
+		def onStep(status, remaining, total):
+			nonlocal pageCount
+
+			pageCount = total
+			if (progress is not None):
+				progress(total - remaining, total)
+
+		##############################################
+
+		pageCount = 0
+		timeStart = time.perf_counter()
+
+		source = sqlite3.connect(filePath)
+		try:
+			with self.makeConnection(raw = True) as connection:
+				target = getattr(connection, "connection", connection) #The pool wraps the sqlite3 connection
+				if (not hasattr(source, "backup")):
+					errorMessage = "The SQLite online backup API needs Python 3.7 or newer"
+					raise NotImplementedError(errorMessage)
+
+				source.backup(target, pages = pages, progress = onStep)
+				target.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+		finally:
+			source.close()
+
+		duration = time.perf_counter() - timeStart
+		return {"pages": pageCount, "seconds": duration, "pagesPerSecond": (pageCount / duration) if duration else None}
+
+	def _restore_sql(self, filePath, compress = None, replace = True, batchSize = 10000, pages = 1024, progress = None):
+		"""Runs the SQL backup at 'filePath'.
+		If 'replace' is True, the backup is loaded into a new file in transactions of 'batchSize' statements, and that file is copied over the database with the online backup API.
+		If 'replace' is False, the backup is added to the database in one transaction.
+		Either way, a backup that fails part way through leaves the database as it was.
+		Indexes and triggers are created after the rows are added, so indexes are built once and triggers do not fire for restored rows.
+		"""
+
+		#Statements that are run after every row has been added
+		deferPattern = re.compile(r"\s*CREATE\s+(?:UNIQUE\s+INDEX|INDEX|TRIGGER)\b", re.IGNORECASE)
+		skipPattern = re.compile(r"\s*(?:BEGIN(?:\s+TRANSACTION)?|COMMIT)\s*;\s*$", re.IGNORECASE)
+
+		def yieldStatement(fileHandle):
+			buffer = ""
+			for line in io.TextIOWrapper(fileHandle, encoding = "utf-8"):
+				buffer += line
+				if (sqlite3.complete_statement(buffer)):
+					yield buffer.strip()
+					buffer = ""
+
+			if (buffer.strip()):
+				yield buffer.strip()
+
+		def load(cursor, commitBatches):
+			"""Runs every statement in the backup on 'cursor', which must already be in a transaction.
+
+			commitBatches (bool) - Determines if a new transaction is started after every 'batchSize' statements
+			"""
+			nonlocal rowCount, statementCount
+
+			with open(filePath, "rb") as rawHandle:
+				fileHandle = importlib.import_module(compress).open(rawHandle, "rb") if (compress is not None) else rawHandle
+				for statement in yieldStatement(fileHandle):
+					if (skipPattern.match(statement)):
+						continue
+					if (deferPattern.match(statement)):
+						deferredList.append(statement)
+						continue
+
+					cursor.execute(statement)
+					statementCount += 1
+					if (statement[:6].upper() == "INSERT"):
+						rowCount += 1
+
+					if (not statementCount % batchSize):
+						if (commitBatches):
+							cursor.execute("COMMIT")
+							cursor.execute("BEGIN")
+						if (progress is not None):
+							progress(rawHandle.tell(), totalBytes)
+
+			for statement in deferredList:
+				cursor.execute(statement)
+
+		def restore_replace(folder):
+			with self.makeConnection(raw = True) as connection:
+				pageSize = getattr(connection, "connection", connection).execute("PRAGMA page_size").fetchone()[0]
+
+			#Nothing in the database is touched until every statement has worked
+			loadPath = os.path.join(folder, "load.db")
+			target = sqlite3.connect(loadPath, isolation_level = None)
+			try:
+				cursor = target.cursor()
+				cursor.execute(f"PRAGMA page_size = {int(pageSize)}") #The online backup cannot change the page size of a database in WAL mode
+				for key, value in self.getProfilePragmas("bulk-load").items():
+					if (key != "journal_mode"):
+						cursor.execute(f"PRAGMA {key} = {value}")
+				cursor.execute("PRAGMA journal_mode = OFF") #The file is thrown away if anything goes wrong, so it does not need a journal
+
+				cursor.execute("BEGIN")
+				load(cursor, True)
+				cursor.execute("COMMIT")
+				foreignKeyErrors = len(cursor.execute("PRAGMA foreign_key_check").fetchall())
+				cursor.close()
+			finally:
+				target.close()
+
+			self._restore_binary(loadPath, pages = pages)
+			return foreignKeyErrors
+
+		def restore_add():
+			with self.makeConnection(raw = True) as connection:
+				connection = getattr(connection, "connection", connection) #The pool wraps the sqlite3 connection
+				isolation_level = connection.isolation_level
+				connection.isolation_level = None #Transactions are started and committed here instead of by the sqlite3 module
+				cursor = connection.cursor()
+				foreignKeys = cursor.execute("PRAGMA foreign_keys").fetchone()[0]
+				try:
+					#Rows are not added in an order that satisfies the foreign keys, so they are checked at the end instead
+					cursor.execute("PRAGMA foreign_keys = OFF")
+					cursor.execute("BEGIN")
+					load(cursor, False)
+					cursor.execute("COMMIT")
+
+					foreignKeyErrors = len(cursor.execute("PRAGMA foreign_key_check").fetchall())
+					cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+				except:
+					if (connection.in_transaction):
+						cursor.execute("ROLLBACK")
+					raise
+				finally:
+					cursor.execute(f"PRAGMA foreign_keys = {int(foreignKeys)}")
+					cursor.close()
+					connection.isolation_level = isolation_level
+
+			return foreignKeyErrors
+
+		##############################################
+
+		totalBytes = os.path.getsize(filePath)
+		timeStart = time.perf_counter()
+
+		rowCount = 0
+		statementCount = 0
+		deferredList = []
+
+		if (replace):
+			with tempfile.TemporaryDirectory() as folder:
+				foreignKeyErrors = restore_replace(folder)
+		else:
+			foreignKeyErrors = restore_add()
+
+		if (progress is not None):
+			progress(totalBytes, totalBytes)
+
+		duration = time.perf_counter() - timeStart
+		return {"statements": statementCount + len(deferredList), "rows": rowCount, "bytes": totalBytes, "foreignKeyErrors": foreignKeyErrors,
+			"seconds": duration, "rowsPerSecond": (rowCount / duration) if duration else None}
 
 	#Alias Functions
 	save = backup
@@ -3678,6 +7229,79 @@ def sandbox():
 		# database_API.openDatabase("test_map_example.db", "test_map_2")
 		# database_API.checkSchema()
 
+	def benchmark_shapingPlan(rowCount = 100000, attributeCount = 10, foreignCount = 5):
+		"""Compares building foreignAsDict rows with a regex for every cell against a precompiled shaping plan."""
+
+		keyList = tuple(itertools.chain((f"attribute_{i}" for i in range(attributeCount)), 
+			(f"zfk_foreign_{i}_zfk_{key}" for i in range(foreignCount) for key in ("databaseId", "label"))))
+		rowList = [tuple(range(len(keyList))) for i in range(rowCount)]
+
+		def makeCatalogue_regex(row):
+			catalogue = collections.defaultdict(dict)
+			for key, value in zip(keyList, row):
+				foreignMatch = re.search("zfk_(.*)_zfk_(.*)", key)
+				if (foreignMatch):
+					catalogue[foreignMatch.group(1)][foreignMatch.group(2)] = value
+				else:
+					catalogue[key] = value
+			return dict(catalogue)
+
+		start = time.perf_counter()
+		answer_regex = [makeCatalogue_regex(row) for row in rowList]
+		duration_regex = time.perf_counter() - start
+
+		start = time.perf_counter()
+		plan = Database._getShapingPlan(keyList)
+		answer_plan = [Database._applyShapingPlan(plan, row) for row in rowList]
+		duration_plan = time.perf_counter() - start
+
+		assert answer_regex == answer_plan
+		print(f"regex: {duration_regex * 1e6 / rowCount:.2f} us/row; plan: {duration_plan * 1e6 / rowCount:.2f} us/row; speedup: {duration_regex / duration_plan:.1f}x")
+
+	def benchmark_importTime(module = "API_Database.db_sql", top = 15):
+		"""Shows how long importing 'module' takes in a fresh process, and which imports cost the most.
+		Uses: https://docs.python.org/3/using/cmdline.html#id5
+		"""
+
+		process = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], stderr = subprocess.PIPE, universal_newlines = True)
+
+		timeList = []
+		for line in process.stderr.splitlines():
+			match = re.search(r"import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)", line)
+			if (match):
+				timeList.append((int(match.group(2)), len(match.group(3)), match.group(4)))
+
+		total = next((cumulative for cumulative, depth, name in timeList if (name == module)), None)
+		print(f"import {module}: {total / 1000 if total else None} ms")
+		for cumulative, depth, name in sorted((item for item in timeList if (item[1] <= 3)), reverse = True)[:top]:
+			print(f"   {cumulative / 1000:8.2f} ms  {name}")
+
+	def benchmark_pragmaProfile(rowCount = 20000, fileName = "benchmark_pragmaProfile.db"):
+		"""Compares how fast rows can be added and read with each SQLite profile."""
+
+		for profile in Database.pragmaProfileCatalogue.keys():
+			for ending in ("", "-wal", "-shm", ".reflection"):
+				if (os.path.exists(f"{fileName}{ending}")):
+					os.remove(f"{fileName}{ending}")
+
+			database_API = build()
+			database_API.openDatabase(fileName, profile = profile, openAlembic = False)
+			with database_API.makeConnection() as connection:
+				connection.execute("CREATE TABLE Lorem (id INTEGER PRIMARY KEY, label TEXT, value REAL)")
+			database_API.refresh()
+
+			start = time.perf_counter()
+			for i in range(0, rowCount, 100):
+				database_API.addTuple({"Lorem": [{"label": f"lorem_{j}", "value": j / 3} for j in range(i, i + 100)]}, fromSchema = None)
+			duration_add = time.perf_counter() - start
+
+			start = time.perf_counter()
+			for i in range(100):
+				database_API.getValue({"Lorem": ["label", "value"]}, {"id": i + 1}, fromSchema = None)
+			duration_get = time.perf_counter() - start
+
+			print(f"{profile:>12}: addTuple {rowCount / duration_add:10.0f} rows/s; getValue {100 / duration_get:8.0f} calls/s")
+
 	def test_access():
 		database_API = build()
 		database_API.openDatabase("R:/Material Log - Database/Users/Josh Mayberry/User Database.mdb", openAlembic = False)
@@ -3868,6 +7492,9 @@ def sandbox():
 
 	# test_sqlite()
 	test_sqlite_2()
+	# benchmark_shapingPlan()
+	# benchmark_importTime()
+	# benchmark_pragmaProfile()
 	# test_access()
 	# test_mysql()
 
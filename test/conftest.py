@@ -0,0 +1,46 @@
+# pylint: skip-file
+
+import sqlite3
+
+import pytest
+import sqlalchemy
+
+import API_Database.db_sql as Database
+
+#Scripts that are run by hand, not by pytest
+collect_ignore = ["test_map_2.py"]
+
+@pytest.fixture
+def databasePath(tmp_path, monkeypatch):
+	monkeypatch.chdir(tmp_path) #Keeps the error log out of the repository
+	return str(tmp_path / "test.db")
+
+@pytest.fixture
+def database(databasePath):
+	database_API = Database.Database(databasePath, schemaPath = "schema_sample", multiProcess = 0)
+	yield database_API
+	database_API.closeDatabase()
+	database_API.engine.dispose()
+
+@pytest.fixture
+def limitVariables(database):
+	"""Makes the connections of 'database' allow at most 999 bound variables, like SQLite builds before 3.32."""
+
+	if (not hasattr(sqlite3, "SQLITE_LIMIT_VARIABLE_NUMBER")):
+		pytest.skip("Changing SQLite limits needs Python 3.11")
+
+	def onConnect(connection, record):
+		connection.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+
+	sqlalchemy.event.listen(database.engine, "connect", onConnect)
+	database.engine.dispose()
+	return database
+
+def selectRows(filePath, sql, *args):
+	"""Reads the database file with its own connection, so nothing is shared with the code being tested."""
+
+	connection = sqlite3.connect(filePath)
+	try:
+		return connection.execute(sql, args).fetchall()
+	finally:
+		connection.close()
@@ -0,0 +1,37 @@
+# pylint: skip-file
+
+import API_Database.db_sql as Database
+
+Mapper = Database.makeBase()
+
+class Customer(Mapper, Database.Schema_Base):
+	__tablename__ = "Customer"
+
+	id = Database.Schema_Base.schema_column(primary = True)
+	name = Database.Schema_Base.schema_column(dataType = str, notNull = True)
+	age = Database.Schema_Base.schema_column()
+
+	def __init__(self, **kwargs):
+		Database.Schema_Base.__init__(self, kwargs)
+		Mapper.__init__(self, **kwargs)
+
+class City(Mapper, Database.Schema_Base):
+	__tablename__ = "City"
+
+	id = Database.Schema_Base.schema_column(primary = True)
+	label = Database.Schema_Base.schema_column(dataType = str, unique = True, notNull = True)
+
+	def __init__(self, **kwargs):
+		Database.Schema_Base.__init__(self, kwargs)
+		Mapper.__init__(self, **kwargs)
+
+class Person(Mapper, Database.Schema_AutoForeign):
+	__tablename__ = "Person"
+
+	id = Database.Schema_Base.schema_column(primary = True)
+	name = Database.Schema_Base.schema_column(dataType = str)
+	city_id = Database.Schema_Base.schema_column(foreignKey = City.id)
+
+	def __init__(self, **kwargs):
+		Database.Schema_AutoForeign.__init__(self, kwargs)
+		Mapper.__init__(self, **kwargs)
@@ -0,0 +1,82 @@
+# pylint: skip-file
+
+import sqlite3
+
+import pytest
+
+import API_Database.db_sql as Database
+
+from conftest import selectRows
+
+def fill(database, start, stop):
+	database.addTuple({"Customer": [{"id": i, "name": f"customer {i}" * 20, "age": i % 50} for i in range(start, stop)]}, bulk = True)
+
+def test_backup_sqlDefault(database, tmp_path):
+	fill(database, 1, 10)
+	destination = str(tmp_path / "backup.sql")
+	database.backup(destination)
+
+	with open(destination, "r") as fileHandle:
+		text = fileHandle.read()
+	assert text.startswith("BEGIN TRANSACTION;")
+	assert "INSERT INTO \"Customer\"" in text
+
+@pytest.mark.parametrize("profile", ("default", "durable"))
+def test_backup_incremental(database, databasePath, tmp_path, monkeypatch, profile):
+	database.setProfile(profile)
+	fill(database, 1, 2000)
+	destination = str(tmp_path / "backup.db")
+
+	answer = database.backup(destination, incremental = True)
+	assert answer["incremental"] is False
+	pageCount = answer["pageCount"]
+
+	#Later backups read the pages straight from the database file instead of copying it first
+	snapshotList = []
+	snapshot = Database.Database._backup_snapshot
+	monkeypatch.setattr(Database.Database, "_backup_snapshot", lambda *args, **kwargs: snapshotList.append(args) or snapshot(*args, **kwargs))
+
+	database.changeTuple({"Customer": {"age": 99}}, {"id": 1500})
+	answer = database.backup(destination, incremental = True)
+	assert answer["incremental"] is True
+	assert answer["file"] == f"{destination}.1.delta"
+	assert 0 < answer["pages"] < pageCount / 10
+
+	answer = database.backup(destination, incremental = True)
+	assert answer["pages"] == 0
+	assert snapshotList == []
+
+	#Restoring the base with its deltas gives the database as it was for the last backup
+	database.changeTuple({"Customer": {"age": 0}}, {"id": 1500})
+	database.restore(destination)
+	assert selectRows(databasePath, "SELECT age FROM Customer WHERE id = 1500") == [(99,)]
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer") == [(1999,)]
+
+def test_backup_incremental_busyWal(database, databasePath, tmp_path, monkeypatch):
+	database.setProfile("durable")
+	fill(database, 1, 200)
+	destination = str(tmp_path / "backup.db")
+	database.backup(destination, incremental = True)
+
+	snapshotList = []
+	snapshot = Database.Database._backup_snapshot
+	monkeypatch.setattr(Database.Database, "_backup_snapshot", lambda *args, **kwargs: snapshotList.append(args) or snapshot(*args, **kwargs))
+
+	#A reader holding an older snapshot keeps the newest pages in the WAL, so the online backup is used instead
+	reader = sqlite3.connect(databasePath, isolation_level = None)
+	try:
+		reader.execute("BEGIN")
+		reader.execute("SELECT COUNT(*) FROM Customer").fetchone()
+		database.changeTuple({"Customer": {"age": 77}}, {"id": 5})
+		database.changeTuple({"Customer": {"age": 77}}, {"id": 6})
+
+		answer = database.backup(destination, incremental = True)
+	finally:
+		reader.close()
+
+	assert answer["incremental"] is True
+	assert answer["pages"] > 0
+	assert len(snapshotList) == 1
+
+	database.restore(destination)
+	assert selectRows(databasePath, "SELECT id FROM Customer WHERE age = 77") == [(5,), (6,)]
@@ -0,0 +1,37 @@
+# pylint: skip-file
+
+from conftest import selectRows
+
+def test_addTuple_bulk(database, databasePath):
+	rowList = [{"id": i, "name": f"customer {i}", "age": i % 50} for i in range(1, 2501)]
+	rowList.append({"id": 2501, "name": "no age"})
+
+	answer = database.addTuple({"Customer": rowList}, bulk = True, bulkSize = 1000)
+
+	assert answer["Customer"]["rows"] == 2501
+	assert selectRows(databasePath, "SELECT COUNT(*), SUM(age IS NULL) FROM Customer") == [(2501, 1)]
+	assert selectRows(databasePath, "SELECT name, age FROM Customer WHERE id = 1234") == [("customer 1234", 34)]
+
+def test_changeTuple_bulk(database, databasePath, limitVariables):
+	database.addTuple({"Customer": [{"id": i, "name": f"customer {i}", "age": 0} for i in range(1, 2501)]}, bulk = True)
+
+	#Every row gets the same values, so the keys are sent in IN batches that must stay under the variable limit
+	answer = database.changeTuple_bulk({"Customer": [{"id": i, "age": 2, "name": "same"} for i in range(1, 2001)]}, bulkSize = 5000)
+	assert answer["Customer"]["rows"] == 2000
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer WHERE (age = 2) AND (name = 'same')") == [(2000,)]
+
+	#Every row gets its own value
+	database.changeTuple_bulk({"Customer": [{"id": i, "age": i} for i in range(2001, 2501)]})
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer WHERE (id > 2000) AND (age = id)") == [(500,)]
+
+def test_changeTuple_bulk_applyChanges(database, databasePath):
+	database.addTuple({"Customer": [{"id": i, "name": f"customer {i}", "age": 1} for i in range(1, 11)]}, bulk = True)
+
+	database.changeTuple_bulk({"Customer": [{"id": i, "age": 5} for i in range(1, 11)]}, applyChanges = False)
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer WHERE age = 5") == [(0,)]
+	database.closeDatabase()
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer WHERE age = 5") == [(0,)]
+
+	database.changeTuple_bulk({"Customer": [{"id": i, "age": 6} for i in range(1, 11)]}, applyChanges = False)
+	database.saveDatabase()
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer WHERE age = 6") == [(10,)]
@@ -0,0 +1,56 @@
+# pylint: skip-file
+
+import sqlite3
+
+import pytest
+
+def test_capture_yieldChanges(database):
+	database.addTuple({"Customer": {"id": 1, "name": "before", "age": 1}})
+	database.captureChanges(["Customer"])
+
+	database.addTuple({"Customer": [{"id": 2, "name": "a", "age": 2}, {"id": 3, "name": "b", "age": 3}]})
+	database.changeTuple({"Customer": {"age": 20}}, {"id": 2})
+	database.changeTuple({"Customer": {"id": 4}}, {"id": 3})
+	database.removeTuple({"Customer": {"id": 1}})
+
+	changeList = [(change["operation"], change["key"]) for change in database.yieldChanges()]
+	assert changeList == [("i", [2]), ("i", [3]), ("u", [2]), ("d", [3]), ("u", [4]), ("d", [1])]
+
+	#Reading in chunks gives the same changes
+	assert [change["sequence"] for change in database.yieldChanges(chunkSize = 2)] == [change["sequence"] for change in database.yieldChanges()]
+
+	sequence = database.getChangeSequence()
+	database.addTuple({"Customer": {"id": 5, "name": "c", "age": 5}})
+	assert [(change["operation"], change["key"]) for change in database.yieldChanges(sequence)] == [("i", [5])]
+
+	database.pruneChanges(sequence)
+	assert [change["sequence"] for change in database.yieldChanges()] == [sequence + 1]
+
+	database.stopCapture(["Customer"])
+	database.addTuple({"Customer": {"id": 6, "name": "d", "age": 6}})
+	assert database.getChangeSequence() == sequence + 1
+
+def test_capture_withoutRowId(database, databasePath):
+	#The relation is made after the database was opened, so it has not been reflected yet
+	connection = sqlite3.connect(databasePath)
+	with connection:
+		connection.execute("CREATE TABLE Pair (left TEXT, right TEXT, amount INTEGER, PRIMARY KEY (left, right)) WITHOUT ROWID")
+	connection.close()
+
+	try:
+		database.captureChanges(["Pair"])
+
+		connection = sqlite3.connect(databasePath)
+		with connection:
+			connection.execute("INSERT INTO Pair VALUES ('a', 'b', 1)")
+			connection.execute("UPDATE Pair SET amount = 2")
+			connection.execute("DELETE FROM Pair")
+		connection.close()
+
+		assert [(change["operation"], change["key"], change["rowId"]) for change in database.yieldChanges()] == [("i", ["a", "b"], None), ("u", ["a", "b"], None), ("d", ["a", "b"], None)]
+	finally:
+		database.metadata.remove(database.metadata.tables["Pair"])
+
+def test_capture_unknownRelation(database):
+	with pytest.raises(KeyError, match = "Lorem"):
+		database.captureChanges(["Lorem"])
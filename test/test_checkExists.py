@@ -0,0 +1,20 @@
+# pylint: skip-file
+
+import schema_sample
+
+def test_checkExistsMany(database):
+	database.addTuple({"City": [{"label": f"city {i}"} for i in range(1200)]}, bulk = True)
+
+	labelList = [f"city {i}" for i in range(0, 2400, 2)]
+	assert database.checkExistsMany("City", "label", labelList) == {f"city {i}" for i in range(0, 1200, 2)}
+	assert database.checkExistsMany("City", "label", ["city 1", "missing", "city 1"], asMask = True) == [True, False, True]
+
+def test_checkExistsMany_schema(database):
+	database.addTuple({"City": [{"id": i, "label": f"city {i}"} for i in range(1, 701)]}, bulk = True)
+
+	assert schema_sample.City.checkExistsMany(range(690, 1500)) == set(range(690, 701))
+	assert schema_sample.City.checkExistsMany(["city 3", "missing"], "label") == {"city 3"}
+
+	with schema_sample.City.makeSession() as session:
+		session.add(schema_sample.City(id = 2000, label = "new"))
+		assert schema_sample.City.checkExistsMany([2000, 2001], session = session) == {2000}
@@ -0,0 +1,27 @@
+# pylint: skip-file
+
+import sqlite3
+
+import API_Database.db_sql as Database
+
+def test_columnar_array(database):
+	database.addTuple({"Customer": [{"id": 1, "name": "a", "age": 5}, {"id": 2, "name": "b"}, {"id": 3, "name": "c", "age": 7}]}, bulk = True)
+
+	answer = database.getValue({"Customer": ["id", "age", "name"]}, columnar = "array", forceRelation = True)["Customer"]
+
+	assert isinstance(answer["age"], Database.ColumnArray)
+	assert list(answer["age"]) == [5, 0, 7]
+	assert list(answer["age"].mask) == [0, 1, 0]
+	assert answer["name"] == ["a", "b", "c"]
+
+def test_columnar_wrongType(database, databasePath):
+	#SQLite keeps whatever it is given, even if it does not match the column type
+	connection = sqlite3.connect(databasePath)
+	with connection:
+		connection.executemany("INSERT INTO Customer (id, name, age) VALUES (?, ?, ?)", [(1, "a", 5), (2, "b", None), (3, "c", "unknown"), (4, "d", 2 ** 63 - 1)])
+	connection.close()
+
+	answer = database.getValue({"Customer": ["id", "age"]}, columnar = "array", chunkSize = 2, forceRelation = True)["Customer"]
+
+	assert list(answer["id"]) == [1, 2, 3, 4]
+	assert answer["age"] == [5, None, "unknown", 2 ** 63 - 1]
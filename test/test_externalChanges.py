@@ -0,0 +1,54 @@
+# pylint: skip-file
+
+import sqlite3
+
+import schema_sample
+
+def changeExternally(filePath, sql, *args):
+	"""Runs 'sql' on its own sqlite3 connection, as another process would."""
+
+	connection = sqlite3.connect(filePath)
+	try:
+		with connection:
+			connection.execute(sql, args)
+	finally:
+		connection.close()
+
+def test_externalChanges(database, databasePath):
+	database.addTuple({"Customer": {"id": 1, "name": "a", "age": 1}, "City": {"id": 1, "label": "Paris"}})
+	database.watchRelations(["Customer", "City"], interval = None)
+	database.setResultCache()
+
+	assert database.getValue({"Customer": "name"}, {"id": 1}) == "a"
+	assert database.getValue({"City": "label"}, {"id": 1}) == "Paris"
+	assert database.checkExternalChanges(force = True) == []
+
+	changeExternally(databasePath, "UPDATE Customer SET name = 'b' WHERE id = 1")
+
+	#Nothing is looked for until asked, since the interval is None
+	assert database.getValue({"Customer": "name"}, {"id": 1}) == "a"
+	assert database.checkExternalChanges(force = True) == ["Customer"]
+	assert database.getValue({"Customer": "name"}, {"id": 1}) == "b"
+
+	#Answers for relations that did not change are kept
+	hits = database.getCacheInfo_result()["hits"]
+	assert database.getValue({"City": "label"}, {"id": 1}) == "Paris"
+	assert database.getCacheInfo_result()["hits"] == hits + 1
+
+def test_externalChanges_label(database, databasePath):
+	database.addTuple({"Person": {"name": "a", "city": "Paris"}})
+	database.watchRelations(["City"], interval = None)
+	assert "Paris" in schema_sample.City.getLabelCache()
+
+	changeExternally(databasePath, "UPDATE City SET label = 'Rome' WHERE label = 'Paris'")
+	assert database.checkExternalChanges(force = True) == ["City"]
+	assert "Paris" not in schema_sample.City.getLabelCache()
+
+def test_externalChanges_interval(database, databasePath):
+	database.addTuple({"Customer": {"id": 1, "name": "a", "age": 1}})
+	database.watchRelations(["Customer"], interval = 0)
+	database.setResultCache()
+
+	assert database.getValue({"Customer": "name"}, {"id": 1}) == "a"
+	changeExternally(databasePath, "UPDATE Customer SET name = 'b' WHERE id = 1")
+	assert database.getValue({"Customer": "name"}, {"id": 1}) == "b"
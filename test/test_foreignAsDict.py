@@ -0,0 +1,85 @@
+# pylint: skip-file
+
+import collections
+import re
+
+import pytest
+
+import API_Database.db_sql as Database
+
+def shapeRow(keyList, row):
+	"""Shapes a row by parsing every label, the way getValue() did before it used a plan."""
+
+	catalogue = collections.defaultdict(dict)
+	for key, value in zip(keyList, row):
+		foreignMatch = re.search("zfk_(.*)_zfk_(.*)", key)
+		if (foreignMatch):
+			attribute, foreign_attribute = foreignMatch.group(1), foreignMatch.group(2)
+		else:
+			attribute, foreign_attribute = key, None
+
+		if (attribute not in catalogue):
+			if (foreign_attribute is None):
+				catalogue[attribute] = value
+			else:
+				catalogue[attribute][foreign_attribute] = value
+			continue
+
+		if (not isinstance(catalogue[attribute], dict)):
+			catalogue[attribute] = {foreign_attribute: [catalogue[attribute], value]}
+		elif (foreign_attribute not in catalogue[attribute]):
+			catalogue[attribute][foreign_attribute] = value
+		elif (isinstance(catalogue[attribute][foreign_attribute], list)):
+			catalogue[attribute][foreign_attribute].append(value)
+		else:
+			catalogue[attribute][foreign_attribute] = [catalogue[attribute][foreign_attribute], value]
+	return dict(catalogue)
+
+@pytest.fixture
+def people(database):
+	database.addTuple({"Person": [{"name": "Lorem", "city": "Paris"}, {"name": "Ipsum", "city": "Rome"}]})
+	return database
+
+@pytest.mark.parametrize("keyList", [
+	("id", "name"),
+	("name", "zfk_city_zfk_id", "zfk_city_zfk_label"),
+	("zfk_city_zfk_label", "name", "zfk_city_zfk_id", "zfk_job_zfk_label"),
+	("name", "name"),
+	("name", "name", "name"),
+	("zfk_city_zfk_label", "zfk_city_zfk_label", "zfk_city_zfk_label"),
+	("city", "zfk_city_zfk_label"),
+	("zfk_city_zfk_label", "name", "zfk_city_zfk_id", "zfk_city_zfk_label"),
+])
+def test_shapingPlan_matchesLabels(keyList):
+	row = tuple(f"value {i}" for i in range(len(keyList)))
+	plan = Database.Database._getShapingPlan(keyList)
+	assert Database.Database._applyShapingPlan(plan, row) == shapeRow(keyList, row)
+
+def test_shapingPlan_merge():
+	#Repeated attributes are gathered into one list, however many times they repeat
+	keyList = ("name", "name", "name", "zfk_city_zfk_label", "zfk_city_zfk_label")
+	plan = Database.Database._getShapingPlan(keyList)
+	assert plan[0] is None
+
+	answer = Database.Database._applyShapingPlan(plan, ("a", "b", "c", "Paris", "Rome"))
+	assert answer == {"name": {None: ["a", "b", "c"]}, "city": {"label": ["Paris", "Rome"]}}
+
+@pytest.mark.parametrize("fromSchema", [False, None])
+def test_foreignAsDict_nested(people, fromSchema):
+	answer = people.getValue({"Person": ("name", "city")}, foreignAsDict = True, fromSchema = fromSchema)
+	assert answer == ({"name": "Lorem", "city": {"id": 1, "label": "Paris"}}, {"name": "Ipsum", "city": {"id": 2, "label": "Rome"}})
+
+	answer = people.getValue({"Person": ("name", {"city": ("label", "id")})}, foreignAsDict = True, fromSchema = fromSchema)
+	assert answer == ({"name": "Lorem", "city": {"label": "Paris", "id": 1}}, {"name": "Ipsum", "city": {"label": "Rome", "id": 2}})
+
+@pytest.mark.parametrize("fromSchema", [False, None])
+def test_foreignAsDict_foreignDefault(people, fromSchema):
+	answer = people.getValue({"Person": ("name", "city")}, foreignAsDict = True, foreignDefault = "label", fromSchema = fromSchema)
+	assert answer == ({"name": "Lorem", "city": {"label": "Paris"}}, {"name": "Ipsum", "city": {"label": "Rome"}})
+
+	answer = people.getValue({"Person": "city"}, {"name": "Ipsum"}, foreignAsDict = True, foreignDefault = ("label", "id"), fromSchema = fromSchema)
+	assert answer == {"city": {"label": "Rome", "id": 2}}
+
+def test_foreignAsDict_repeated(people):
+	answer = people.getValue({"Person": ("name", "name")}, foreignAsDict = True)
+	assert answer == ({"name": {None: ["Lorem", "Lorem"]}}, {"name": {None: ["Ipsum", "Ipsum"]}})
@@ -0,0 +1,59 @@
+# pylint: skip-file
+
+import pytest
+import sqlalchemy
+
+import API_Database.db_sql as Database
+
+from conftest import selectRows
+
+def makeAllocator(databasePath):
+	"""Returns an allocator with its own engine, like one in another process would have."""
+
+	return Database.IdAllocator(sqlalchemy.create_engine(f"sqlite:///{databasePath}"), "Customer", "id")
+
+def test_next_reusesGaps(database, databasePath):
+	database.addTuple({"Customer": [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}, {"id": 5, "name": "c"}]}, bulk = True)
+
+	allocator = makeAllocator(databasePath)
+	assert [allocator.next() for i in range(4)] == [3, 4, 6, 7]
+
+def test_rebuild_skipsReserved(database, databasePath):
+	first = makeAllocator(databasePath)
+	assert [first.next() for i in range(3)] == [1, 2, 3]
+	database.addTuple({"Customer": [{"id": 1, "name": "a"}, {"id": 3, "name": "c"}]}, bulk = True)
+
+	#2 looks like a gap, but the first allocator has handed it out already
+	second = makeAllocator(databasePath)
+	assert second.next() == first.blockSize + 1
+
+def test_next_rollback(database, databasePath):
+	with pytest.raises(RuntimeError):
+		with database.transaction():
+			database.addTuple({"Customer": {"name": "thrown away"}})
+			raise RuntimeError()
+
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM _db_id_allocation WHERE reserved > 1") == [(0,)]
+
+	#Another process claims the values that were given back by the rollback
+	other = makeAllocator(databasePath)
+	otherList = [other.next() for i in range(5)]
+
+	database.addTuple({"Customer": {"name": "kept"}})
+	(keptId,), = selectRows(databasePath, "SELECT id FROM Customer WHERE name = 'kept'")
+	assert keptId not in otherList
+
+def test_next_commit(database, databasePath):
+	with database.transaction():
+		database.addTuple({"Customer": [{"name": "a"}, {"name": "b"}]})
+	database.addTuple({"Customer": {"name": "c"}})
+
+	assert selectRows(databasePath, "SELECT id, name FROM Customer ORDER BY id") == [(1, "a"), (2, "b"), (3, "c")]
+
+def test_discard(database, databasePath):
+	database.addTuple({"Customer": {"id": 150, "name": "given"}})
+	database.addTuple({"Customer": [{"name": "a"}, {"name": "b"}]})
+
+	idList = [row[0] for row in selectRows(databasePath, "SELECT id FROM Customer ORDER BY id")]
+	assert len(set(idList)) == 3
+	assert 150 in idList
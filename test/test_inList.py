@@ -0,0 +1,39 @@
+# pylint: skip-file
+
+import pytest
+
+from conftest import selectRows
+
+@pytest.fixture
+def customers(database):
+	database.addTuple({"Customer": [{"id": i, "name": f"customer {i}", "age": i % 7} for i in range(1, 3001)]}, bulk = True)
+	return database
+
+@pytest.mark.parametrize("fromSchema", (False, None))
+def test_getValue_isIn(customers, limitVariables, fromSchema):
+	idList = list(range(2, 3001, 2))
+	answer = customers.getValue({"Customer": "id"}, isIn = {"id": idList}, forceRelation = True, fromSchema = fromSchema)
+	assert sorted(answer["Customer"]) == idList
+
+	answer = customers.getValue({"Customer": "id"}, isNotIn = {"id": idList}, forceRelation = True, fromSchema = fromSchema)
+	assert sorted(answer["Customer"]) == list(range(1, 3001, 2))
+
+def test_removeTuple_isIn_loadsOnce(customers, databasePath, limitVariables, monkeypatch):
+	createList = []
+	createInListTable = customers._createInListTable
+	def spy(*args, **kwargs):
+		createList.append(args)
+		return createInListTable(*args, **kwargs)
+	monkeypatch.setattr(customers, "_createInListTable", spy)
+
+	idList = list(range(1, 1201))
+	customers.removeTuple({"Customer": [{"age": 1}, {"age": 2}, {"age": 3}]}, isIn = {"id": idList})
+
+	assert len(createList) == 1
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer WHERE (id <= 1200) AND (age IN (1, 2, 3))") == [(0,)]
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer WHERE (id > 1200) AND (age IN (1, 2, 3))") == [(sum(1 for i in range(1201, 3001) if (i % 7 in (1, 2, 3))),)]
+
+def test_configureInList_needsConnection(customers):
+	table = customers.metadata.tables["Customer"]
+	with pytest.raises(ValueError):
+		customers.configureInList(table.columns.id, list(range(customers.inList_chunkSize + 1)))
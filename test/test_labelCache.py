@@ -0,0 +1,47 @@
+# pylint: skip-file
+
+import pytest
+
+import schema_sample
+
+from conftest import selectRows
+
+def test_labelCache_commit(database, databasePath):
+	database.addTuple({"Person": [{"name": "a", "city": "Paris"}, {"name": "b", "city": "Paris"}, {"name": "c", "city": "Rome"}]})
+
+	cityCatalogue = dict(selectRows(databasePath, "SELECT label, id FROM City"))
+	assert schema_sample.City.getLabelCache() == cityCatalogue
+	assert selectRows(databasePath, "SELECT Person.name, City.label FROM Person JOIN City ON Person.city_id = City.id ORDER BY Person.name") == [("a", "Paris"), ("b", "Paris"), ("c", "Rome")]
+
+def test_labelCache_rollback(database, databasePath):
+	with pytest.raises(RuntimeError):
+		with database.transaction():
+			database.addTuple({"Person": {"name": "a", "city": "Oslo"}})
+
+			#Other threads must not see a row that has not been committed
+			assert "Oslo" not in schema_sample.City.getLabelCache()
+			raise RuntimeError()
+
+	assert "Oslo" not in schema_sample.City.getLabelCache()
+
+	database.addTuple({"Person": {"name": "b", "city": "Oslo"}})
+	assert selectRows(databasePath, "SELECT Person.name, City.label FROM Person JOIN City ON Person.city_id = City.id") == [("b", "Oslo")]
+
+def test_labelCache_transaction(database, databasePath):
+	with database.transaction():
+		database.addTuple({"Person": {"name": "a", "city": "Lima"}})
+		database.addTuple({"Person": {"name": "b", "city": "Lima"}})
+		assert "Lima" not in schema_sample.City.getLabelCache()
+
+	assert schema_sample.City.getLabelCache()["Lima"] == selectRows(databasePath, "SELECT id FROM City WHERE label = 'Lima'")[0][0]
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM City") == [(1,)]
+
+def test_uniqueLabel(database):
+	database.addTuple({"City": [{"id": i, "label": label} for i, label in enumerate(("a_b_1", "a_b_2", "A_B_3", "axb_4", "a_b_x", "ab_1", "a%_c_1"), start = 1)]}, bulk = True)
+
+	with database.makeSession() as session:
+		assert schema_sample.Person.uniqueLabel(schema_sample.City, "a_b", session) == "a_b_4"
+		assert schema_sample.Person.uniqueLabel(schema_sample.City, "a%", session) == "a%_1"
+
+		session.add(schema_sample.City(label = "a%_1", session = session))
+		assert schema_sample.Person.uniqueLabel(schema_sample.City, "a%", session) == "a%_2"
@@ -0,0 +1,40 @@
+# pylint: skip-file
+
+import json
+import os
+import subprocess
+import sys
+
+
+#Modules that opening an SQLite database must not import
+lazyList = ("alembic", "unidecode", "pubsub", "forks.pypubsub.src.pubsub.pub", "sqlalchemy.dialects.mysql")
+
+script = """
+import json
+import sys
+
+def getLoaded():
+	return sorted(name for name in sys.modules if any((name == item) or name.startswith(item + ".") for item in LAZYLIST))
+
+import API_Database.db_sql as Database
+afterImport = getLoaded()
+
+database = Database.Database("lazy.db", schemaPath = "schema_sample", multiProcess = 0)
+database.addTuple({"Customer": {"name": "Lorem"}})
+database.getValue({"Customer": "name"})
+database.closeDatabase()
+print(json.dumps([afterImport, getLoaded()]))
+"""
+
+def runScript(tmp_path):
+	#A new interpreter, so modules other tests imported do not count
+	environment = {**os.environ, "PYTHONPATH": os.pathsep.join([os.path.dirname(__file__), *sys.path])}
+	process = subprocess.run([sys.executable, "-c", script.replace("LAZYLIST", repr(lazyList))], 
+		cwd = tmp_path, env = environment, capture_output = True, text = True, timeout = 60)
+	assert process.returncode == 0, process.stderr
+	return json.loads(process.stdout.strip().splitlines()[-1])
+
+def test_lazyImport(tmp_path):
+	afterImport, afterOpen = runScript(tmp_path)
+	assert afterImport == []
+	assert afterOpen == []
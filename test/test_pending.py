@@ -0,0 +1,46 @@
+# pylint: skip-file
+
+import threading
+
+import pytest
+import sqlalchemy
+
+from conftest import selectRows
+
+def test_pending_partialFailure(database, databasePath):
+	database.addTuple({"City": {"label": "Paris"}}, applyChanges = False)
+
+	#The second row breaks the unique constraint after the first one was already inserted
+	with pytest.raises(Exception):
+		database.addTuple({"City": [{"label": "Rome"}, {"label": "Rome"}]}, applyChanges = False)
+
+	database.saveDatabase()
+	assert selectRows(databasePath, "SELECT label FROM City") == [("Paris",)]
+
+def test_pending_partialFailure_session(database, databasePath):
+	database.addTuple({"Customer": {"name": "Lorem"}}, applyChanges = False)
+
+	#The automatic foreign key is added with a session, and the row itself cannot be
+	with pytest.raises(Exception):
+		database.addTuple({"Person": {"id": "not a number", "name": "a", "city": "Oslo"}}, applyChanges = False)
+
+	database.addTuple({"Customer": {"name": "Ipsum"}}, applyChanges = False)
+	database.saveDatabase()
+
+	assert selectRows(databasePath, "SELECT name FROM Customer ORDER BY name") == [("Ipsum",), ("Lorem",)]
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Person") == [(0,)]
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM City") == [(0,)]
+
+def test_pending_closeDatabase(database, databasePath):
+	def work():
+		database.addTuple({"Customer": {"name": "other thread"}}, applyChanges = False)
+
+	thread = threading.Thread(target = work)
+	thread.start()
+	thread.join()
+
+	assert len(database.pendingConnection) == 1
+
+	database.closeDatabase()
+	assert database.pendingConnection == {}
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer") == [(0,)]
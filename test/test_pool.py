@@ -0,0 +1,68 @@
+# pylint: skip-file
+
+import threading
+
+import API_Database.db_sql as Database
+
+from conftest import selectRows
+
+def test_pool_nestedCommit(database, databasePath):
+	with database.engine.connect() as outer:
+		transaction = outer.begin()
+		outer.execute("INSERT INTO Customer (name, age) VALUES ('Lorem', 1)")
+
+		#Something nested, like reading the schema epoch, commits its own work
+		with database.engine.connect() as inner:
+			with inner.begin():
+				inner.execute("SELECT COUNT(*) FROM Customer").scalar()
+
+		transaction.rollback()
+
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer") == [(0,)]
+
+def test_pool_manyThreads(databasePath):
+	#More threads than the pool keeps must not close connections that are still in use
+	database = Database.Database(databasePath, schemaPath = "schema_sample", multiProcess = 0, poolSize = 2)
+	try:
+		errorList = []
+		barrier = threading.Barrier(6)
+
+		def work(index):
+			try:
+				with database.engine.connect() as connection:
+					barrier.wait(timeout = 10)
+					assert connection.execute("SELECT ?", (index,)).scalar() == index
+			except Exception as error:
+				errorList.append(error)
+
+		threadList = [threading.Thread(target = work, args = (index,)) for index in range(6)]
+		for thread in threadList:
+			thread.start()
+		for thread in threadList:
+			thread.join()
+
+		assert errorList == []
+		assert database.getPoolStats()["pool"] == "QueuePool"
+	finally:
+		database.closeDatabase()
+		database.engine.dispose()
+
+def test_pool_otherThread(database, databasePath):
+	#Connections opened on one thread are handed to another without 'multiThread'
+	with database.engine.connect() as connection:
+		connection.execute("SELECT 1")
+
+	errorList = []
+	def work():
+		try:
+			database.addTuple({"Customer": {"name": "Lorem"}})
+		except Exception as error:
+			errorList.append(error)
+
+	thread = threading.Thread(target = work)
+	thread.start()
+	thread.join()
+
+	assert errorList == []
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer") == [(1,)]
+	assert not database.engine.pool._pre_ping
@@ -0,0 +1,18 @@
+# pylint: skip-file
+
+from conftest import selectRows
+
+def test_profile_busyTimeout(database):
+	with database.engine.connect() as connection:
+		assert connection.execute("PRAGMA busy_timeout").scalar() >= 5000
+
+def test_profile_journalMode(database, databasePath):
+	assert database.getJournalMode() == "delete"
+
+	with database.profile("bulk-load"):
+		database.addTuple({"Customer": [{"name": "Lorem", "age": 1}]})
+		assert database.getJournalMode() == "wal"
+
+	assert database.getJournalMode() == "delete"
+	assert selectRows(databasePath, "PRAGMA journal_mode") == [("delete",)]
+	assert selectRows(databasePath, "SELECT name FROM Customer") == [("Lorem",)]
@@ -0,0 +1,93 @@
+# pylint: skip-file
+
+import sqlite3
+
+import pytest
+
+import schema_sample
+
+from conftest import selectRows
+
+def describe(filePath):
+	"""Returns every row, index, and trigger in the database at 'filePath'."""
+
+	answer = {"schema": selectRows(filePath, "SELECT type, name, sql FROM sqlite_master WHERE (type IN ('index', 'trigger')) AND (sql IS NOT NULL) ORDER BY name")}
+	for relation in ("Customer", "City", "Person"):
+		answer[relation] = selectRows(filePath, f"SELECT * FROM {relation} ORDER BY id")
+	return answer
+
+def fill(database, databasePath):
+	database.addTuple({"Customer": [{"name": f"customer {i}", "age": i % 7} for i in range(300)]})
+	database.addTuple({"Person": [{"name": "a", "city": "Paris"}, {"name": "b", "city": "Rome"}]})
+
+	connection = sqlite3.connect(databasePath)
+	with connection:
+		connection.execute("CREATE INDEX ix_customer_age ON Customer (age)")
+		connection.execute("CREATE TRIGGER tr_customer_age AFTER UPDATE OF age ON Customer BEGIN UPDATE Customer SET name = name || '!' WHERE id = new.id; END")
+	connection.close()
+
+@pytest.mark.parametrize("mode, compress", (("sql", None), ("sql", "gzip"), ("binary", None), ("binary", "bz2"), ("incremental", None), ("incremental", "lzma")))
+def test_restore_roundTrip(database, databasePath, tmp_path, mode, compress):
+	fill(database, databasePath)
+	destination = str(tmp_path / "backup")
+
+	if (mode == "incremental"):
+		database.backup(destination, incremental = True, compress = compress)
+		database.changeTuple({"Customer": {"age": 100}}, {"id": 3})
+		database.addTuple({"City": {"label": "Oslo"}})
+		assert database.backup(destination, incremental = True, compress = compress)["incremental"] is True
+	else:
+		database.backup(destination, binary = mode == "binary", compress = compress)
+	expected = describe(databasePath)
+
+	allocator = schema_sample.Customer.getIdAllocator()
+	allocator.next()
+
+	connection = sqlite3.connect(databasePath)
+	with connection:
+		connection.execute("DROP TRIGGER tr_customer_age")
+		connection.execute("DROP INDEX ix_customer_age")
+		connection.execute("DELETE FROM Customer WHERE id > 100")
+		connection.execute("UPDATE City SET label = 'changed' WHERE label = 'Paris'")
+	connection.close()
+
+	answer = database.restore(destination)
+	if (mode == "sql"):
+		assert answer["foreignKeyErrors"] == 0
+	assert describe(databasePath) == expected
+
+	#Values the allocators were holding may not be free anymore
+	assert (allocator.gapList is None) and (not allocator.block)
+	database.addTuple({"Customer": {"name": "new"}})
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer") == [(len(expected["Customer"]) + 1,)]
+
+@pytest.mark.parametrize("replace", (True, False))
+def test_restore_failure(database, databasePath, tmp_path, replace):
+	fill(database, databasePath)
+	destination = str(tmp_path / "backup.sql")
+	database.backup(destination)
+
+	with open(destination, "a") as fileHandle:
+		fileHandle.write("INSERT INTO Lorem VALUES (1);\n")
+
+	database.changeTuple({"Customer": {"name": "after the backup"}}, {"id": 1})
+	expected = describe(databasePath)
+
+	#Small batches would commit what was done before the error if the database was loaded directly
+	with pytest.raises(sqlite3.OperationalError):
+		database.restore(destination, replace = replace, batchSize = 10)
+	assert describe(databasePath) == expected
+
+def test_restore_foreignKeys(database, databasePath, tmp_path):
+	fill(database, databasePath)
+	destination = str(tmp_path / "backup.sql")
+	with open(destination, "w") as fileHandle:
+		fileHandle.write("BEGIN TRANSACTION;\nINSERT INTO Person (id, name, city_id) VALUES (1000, 'c', 1000);\nCOMMIT;\n")
+
+	database.engine.dispose()
+	with database.makeConnection(raw = True) as connection:
+		connection.execute("PRAGMA foreign_keys = OFF")
+
+	assert database._restore_sql(destination, replace = False)["foreignKeyErrors"] == 1
+	with database.makeConnection(raw = True) as connection:
+		assert connection.execute("PRAGMA foreign_keys").fetchone()[0] == 0
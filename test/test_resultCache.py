@@ -0,0 +1,43 @@
+# pylint: skip-file
+
+import pytest
+import sqlalchemy
+
+@pytest.fixture
+def cachedDatabase(database):
+	database.setResultCache()
+	database.addTuple({"Customer": [{"id": 1, "name": "a", "age": 1}, {"id": 2, "name": "b", "age": 2}]})
+	return database
+
+@pytest.mark.parametrize("fromSchema", (False, None))
+def test_resultCache_hit(cachedDatabase, fromSchema, monkeypatch):
+	first = cachedDatabase.getValue({"Customer": None}, {"age": 1}, fromSchema = fromSchema)
+
+	#A hit must not compile the query again
+	compileList = []
+	compile = sqlalchemy.sql.expression.ClauseElement.compile
+	monkeypatch.setattr(sqlalchemy.sql.expression.ClauseElement, "compile", lambda *args, **kwargs: compileList.append(args) or compile(*args, **kwargs))
+
+	assert cachedDatabase.getValue({"Customer": None}, {"age": 1}, fromSchema = fromSchema) == first
+	assert cachedDatabase.getCacheInfo_result()["hits"] == 1
+	assert compileList == []
+
+def test_resultCache_copy(cachedDatabase):
+	answer = cachedDatabase.getValue({"Customer": None}, {"age": 1}, forceTuple = True)
+	answer[0]["name"] = "changed"
+
+	assert cachedDatabase.getValue({"Customer": None}, {"age": 1}, forceTuple = True)[0]["name"] == "a"
+	assert cachedDatabase.getCacheInfo_result()["hits"] == 1
+
+def test_resultCache_invalidate(cachedDatabase):
+	assert cachedDatabase.getValue({"Customer": "name"}, {"age": 1}) == "a"
+
+	cachedDatabase.changeTuple({"Customer": {"name": "c"}}, {"id": 1})
+	assert cachedDatabase.getValue({"Customer": "name"}, {"age": 1}) == "c"
+
+	cachedDatabase.addTuple({"Customer": {"id": 3, "name": "d", "age": 1}})
+	assert set(cachedDatabase.getValue({"Customer": "name"}, {"age": 1})) == {"c", "d"}
+
+	cachedDatabase.removeTuple({"Customer": {"id": 1}})
+	assert cachedDatabase.getValue({"Customer": "name"}, {"age": 1}) == "d"
+	assert cachedDatabase.getCacheInfo_result()["hits"] == 0
@@ -0,0 +1,140 @@
+# pylint: skip-file
+
+import sqlite3
+import threading
+
+import pytest
+import sqlalchemy
+
+import API_Database.db_sql as Database
+
+from conftest import selectRows
+
+def makeLockError():
+	return sqlalchemy.exc.OperationalError("INSERT INTO Customer", {}, sqlite3.OperationalError("database is locked"))
+
+@pytest.fixture
+def eventList(monkeypatch):
+	"""Records the start and end waiting events instead of sending them."""
+
+	eventList = []
+	class Publisher:
+		def sendMessage(self, topic, **kwargs):
+			eventList.append((topic, kwargs))
+
+	monkeypatch.setattr(Database, "pubsub_pub", Publisher())
+	return eventList
+
+@pytest.fixture
+def lockedDatabase(databasePath, monkeypatch):
+	#Give up on the lock quickly, so the retries are what is being tested
+	monkeypatch.setitem(Database.Database.pragmaProfile_default, "busy_timeout", 10)
+	database_API = Database.Database(databasePath, schemaPath = "schema_sample", multiProcess = 3, multiProcess_delay = 5, multiProcess_maxDelay = 20)
+	yield database_API
+	database_API.closeDatabase()
+	database_API.engine.dispose()
+
+@pytest.fixture
+def blocker(lockedDatabase, databasePath):
+	"""Another connection that holds the write lock until it is rolled back."""
+
+	connection = sqlite3.connect(databasePath, check_same_thread = False, isolation_level = None)
+	connection.execute("BEGIN IMMEDIATE")
+	yield connection
+	if (connection.in_transaction):
+		connection.rollback()
+	connection.close()
+
+def test_isLockError(database):
+	assert database.isLockError(makeLockError())
+	assert not database.isLockError(sqlalchemy.exc.OperationalError("SELECT", {}, sqlite3.OperationalError("no such table: Lorem")))
+	assert not database.isLockError(ValueError("database is locked"))
+
+def test_getRetryDelay(database):
+	database.multiProcess_delay = 100
+	database.multiProcess_maxDelay = 5000
+
+	assert 0.05 <= database.getRetryDelay(0) <= 0.15
+	assert 0.4 <= database.getRetryDelay(3) <= 1.2
+	assert 2.5 <= database.getRetryDelay(100) <= 7.5
+
+	database.multiProcess_delay = 0
+	assert database.getRetryDelay(5) == 0
+
+def test_retry_success(lockedDatabase, blocker, databasePath, eventList):
+	lockedDatabase.multiProcess = -1
+	timer = threading.Timer(0.2, blocker.rollback)
+	timer.start()
+	try:
+		lockedDatabase.addTuple({"Customer": {"name": "Lorem"}})
+	finally:
+		timer.join()
+
+	assert selectRows(databasePath, "SELECT name FROM Customer") == [("Lorem",)]
+
+	stats = lockedDatabase.getLockStats()
+	assert (stats["waits"], stats["failures"]) == (1, 0)
+	assert stats["attempts"] >= 1
+	assert stats["seconds"] == stats["longest"] > 0
+
+	assert [topic for topic, kwargs in eventList] == ["event_cmd_startWaiting", "event_cmd_endWaiting"]
+	assert eventList[1][1]["success"] is True
+	assert eventList[1][1]["attempts"] == stats["attempts"]
+	assert not lockedDatabase.waiting
+
+def test_retry_giveUp(lockedDatabase, blocker, databasePath, eventList):
+	with pytest.raises(sqlalchemy.exc.OperationalError, match = "database is locked"):
+		lockedDatabase.addTuple({"Customer": {"name": "Lorem"}})
+
+	stats = lockedDatabase.getLockStats(reset = True)
+	assert (stats["waits"], stats["attempts"], stats["failures"]) == (1, 3, 1)
+	assert lockedDatabase.getLockStats()["waits"] == 0
+
+	assert [topic for topic, kwargs in eventList] == ["event_cmd_startWaiting", "event_cmd_endWaiting"]
+	assert (eventList[1][1]["success"], eventList[1][1]["attempts"]) == (False, 3)
+
+	blocker.rollback()
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer") == [(0,)]
+
+def test_retry_noRetry(database):
+	#Without 'multiProcess' a lock error is raised right away
+	callList = []
+	def locked():
+		callList.append(None)
+		raise makeLockError()
+
+	with pytest.raises(sqlalchemy.exc.OperationalError):
+		database._retryLocked(locked)
+	assert len(callList) == 1
+	assert database.getLockStats()["waits"] == 0
+
+def test_retry_nested(lockedDatabase, eventList):
+	#Only the outermost call retries, and it starts the whole function over
+	callList = []
+	def inner():
+		callList.append("inner")
+		raise makeLockError()
+
+	def outer():
+		callList.append("outer")
+		return lockedDatabase._retryLocked(inner)
+
+	with pytest.raises(sqlalchemy.exc.OperationalError):
+		lockedDatabase._retryLocked(outer)
+
+	assert callList == ["outer", "inner"] * 4
+	assert lockedDatabase.getLockStats()["waits"] == 1
+
+def test_retry_shared(lockedDatabase, blocker, eventList):
+	#A shared connection's transaction cannot be repeated from the middle, so its lock errors are raised right away
+	statementList = []
+	sqlalchemy.event.listen(lockedDatabase.engine, "before_cursor_execute", lambda *args: statementList.append(args[2]))
+
+	with pytest.raises(sqlalchemy.exc.OperationalError, match = "database is locked"):
+		with lockedDatabase.transaction():
+			lockedDatabase.addTuple({"Customer": {"name": "Lorem"}})
+
+	#The first write is the one that found the lock, and it was not tried again
+	assert len([statement for statement in statementList if statement.startswith("INSERT")]) == 1
+	assert lockedDatabase.getLockStats()["waits"] == 0
+	assert eventList == []
@@ -0,0 +1,61 @@
+# pylint: skip-file
+
+import sqlite3
+import time
+
+import API_Database.db_sql as Database
+
+from conftest import selectRows
+
+def test_schemaEpoch_addAttribute(database, databasePath):
+	assert database.getAttributeNames("Customer") == ("id", "name", "age")
+	epoch = database.getSchemaEpoch()
+
+	database.addAttribute("Customer", "email")
+	database.addAttribute("Customer", "active", dataType = bool, default = 1, notNull = True)
+
+	assert database.getSchemaEpoch() > epoch
+	assert database.getAttributeNames("Customer") == ("id", "name", "age", "email", "active")
+
+	database.addTuple({"Customer": {"name": "Lorem"}})
+	assert selectRows(databasePath, "SELECT name, email, active FROM Customer") == [("Lorem", None, 1)]
+
+def test_schemaEpoch_removeRelation(database):
+	assert database.getRelationNames() == ("City", "Customer", "Person")
+	assert database.getAttributeNames("Person") == ("id", "name", "city")
+
+	database.removeRelation("Person")
+
+	assert database.getRelationNames() == ("City", "Customer")
+	assert database.getAttributeNames("Person") == ()
+
+def test_schemaEpoch_external(database, databasePath):
+	database.setSchemaEpochInterval(0.5)
+	database.getSchemaEpoch()
+	assert database.getAttributeNames("Customer") == ("id", "name", "age")
+
+	connection = sqlite3.connect(databasePath)
+	try:
+		connection.execute("ALTER TABLE Customer ADD COLUMN email TEXT")
+		connection.commit()
+	finally:
+		connection.close()
+
+	#Other processes are only looked for once 'schemaEpoch_interval' has passed
+	assert database.getAttributeNames("Customer") == ("id", "name", "age")
+	time.sleep(0.6)
+	assert database.getAttributeNames("Customer") == ("id", "name", "age", "email")
+
+def test_schemaEpoch_instances(database, tmp_path):
+	other = Database.Database(str(tmp_path / "other.db"), schemaPath = "schema_sample", multiProcess = 0)
+	try:
+		assert other.cacheToken != database.cacheToken
+		assert other.getAttributeNames("Customer") == database.getAttributeNames("Customer") == ("id", "name", "age")
+
+		#A change to one database is not seen through the other's cache entries
+		database.addAttribute("Customer", "email")
+		assert database.getAttributeNames("Customer") == ("id", "name", "age", "email")
+		assert other.getAttributeNames("Customer") == ("id", "name", "age")
+	finally:
+		other.closeDatabase()
+		other.engine.dispose()
@@ -0,0 +1,59 @@
+# pylint: skip-file
+
+import os
+import json
+import sqlite3
+
+import sqlalchemy
+
+import API_Database.db_sql as Database
+
+def describe(table):
+	return {
+		"columns": sorted((column.name, type(column.type).__name__, str(getattr(column.type, "length", None)), column.nullable, column.primary_key) for column in table.columns),
+		"foreignKeys": sorted((element.parent.name, element.target_fullname) for element in table.foreign_keys),
+		"indexes": sorted((index.name, tuple(column.name for column in index.columns), bool(index.unique)) for index in table.indexes),
+	}
+
+def test_snapshot_roundTrip(database, databasePath, monkeypatch):
+	connection = sqlite3.connect(databasePath)
+	with connection:
+		connection.execute("CREATE TABLE Extra (id INTEGER PRIMARY KEY, label VARCHAR(64) NOT NULL UNIQUE, amount REAL DEFAULT 0, customer INTEGER REFERENCES Customer(id), note)")
+		connection.execute("CREATE INDEX ix_extra_amount ON Extra (amount)")
+	connection.close()
+
+	database.refresh()
+	expected = describe(database.metadata.tables["Extra"])
+	snapshotPath = database.getSnapshotPath()
+	assert os.path.exists(snapshotPath)
+
+	#The snapshot is plain JSON
+	with open(snapshotPath) as fileHandle:
+		assert "Extra" in json.load(fileHandle)["tables"]
+
+	database.closeDatabase()
+	database.engine.dispose()
+	database.metadata.remove(database.metadata.tables["Extra"])
+
+	reflectList = []
+	reflect = Database.CustomMetaData.reflect
+	def spy(self, *args, only = None, **kwargs):
+		reflectList.append(only)
+		return reflect(self, *args, only = only, **kwargs)
+	monkeypatch.setattr(Database.CustomMetaData, "reflect", spy)
+
+	reopened = Database.Database(databasePath, schemaPath = "schema_sample", multiProcess = 0)
+	try:
+		assert describe(reopened.metadata.tables["Extra"]) == expected
+		assert not any(("Extra" in only) for only in reflectList if isinstance(only, list))
+	finally:
+		#The schema's metadata is shared by every test
+		reopened.metadata.remove(reopened.metadata.tables["Extra"])
+		reopened.engine.dispose()
+
+def test_snapshot_ignoresBadFile(database, databasePath):
+	with open(database.getSnapshotPath(), "wb") as fileHandle:
+		fileHandle.write(b"\x80\x04\x95not json")
+
+	database.refresh()
+	assert "Customer" in database.metadata.tables
@@ -0,0 +1,20 @@
+# pylint: skip-file
+
+import concurrent.futures
+
+def test_statementCache_threads(database):
+	database.addTuple({"Customer": [{"id": i, "name": f"customer {i}", "age": i % 10} for i in range(1, 101)]}, bulk = True)
+	database.clearCache_statement()
+
+	def lookup(i):
+		return database.getValue({"Customer": "name"}, {"id": i % 100 + 1}, forceRelation = True, fromSchema = None)["Customer"]
+
+	with concurrent.futures.ThreadPoolExecutor(8) as executor:
+		answerList = list(executor.map(lookup, range(400)))
+
+	assert answerList == [f"customer {i % 100 + 1}" for i in range(400)]
+
+	info = database.getCacheInfo_statement()
+	assert info["hits"] + info["misses"] == 400
+	assert info["size"] == 1
+	assert 1 <= len(database.cache_compiled) <= 8
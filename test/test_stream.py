@@ -0,0 +1,75 @@
+# pylint: skip-file
+
+import pytest
+import sqlalchemy
+
+@pytest.fixture
+def customers(database):
+	database.addTuple({"Customer": [{"id": i, "name": f"customer {i}", "age": i % 90} for i in range(1, 2501)]}, bulk = True)
+	return database
+
+@pytest.fixture
+def checkedOut(customers):
+	"""Returns a function that says how many connections 'customers' has checked out of its pool."""
+
+	counter = {"connections": 0}
+	def onCheckout(*args):
+		counter["connections"] += 1
+	def onCheckin(*args):
+		counter["connections"] -= 1
+
+	sqlalchemy.event.listen(customers.engine, "checkout", onCheckout)
+	sqlalchemy.event.listen(customers.engine, "checkin", onCheckin)
+	return lambda: counter["connections"]
+
+@pytest.fixture
+def fetchList(monkeypatch):
+	"""Records how many rows each fetchmany() asks for."""
+
+	fetchList = []
+	fetchmany = sqlalchemy.engine.ResultProxy.fetchmany
+	def spy(self, size = None):
+		fetchList.append(size)
+		return fetchmany(self, size)
+
+	monkeypatch.setattr(sqlalchemy.engine.ResultProxy, "fetchmany", spy)
+	return fetchList
+
+def getName(row):
+	return row.name if hasattr(row, "name") else row["name"]
+
+@pytest.mark.parametrize("fromSchema", [None, False, True])
+def test_stream_chunks(customers, checkedOut, fetchList, fromSchema):
+	stream = customers.getValue({"Customer": None}, orderBy = "id", stream = True, chunkSize = 1000, fromSchema = fromSchema)
+	assert checkedOut() == 0 #Nothing is read until the generator is started
+
+	nameList = [getName(row) for row in stream]
+	assert nameList == [f"customer {i}" for i in range(1, 2501)]
+
+	#Schema objects are read with yield_per(), and rows straight from the cursor; both read 'chunkSize' rows at a time
+	assert fetchList[:3] == [1000, 1000, 1000]
+	assert checkedOut() == 0
+
+@pytest.mark.parametrize("fromSchema", [None, False, True])
+def test_stream_close(customers, checkedOut, fromSchema):
+	stream = customers.getValue({"Customer": None}, orderBy = "id", stream = True, chunkSize = 1000, fromSchema = fromSchema)
+	nameList = [getName(row) for row, i in zip(stream, range(1500))]
+	assert nameList[-1] == "customer 1500"
+	assert checkedOut() == 1
+
+	stream.close()
+	assert checkedOut() == 0
+
+def test_stream_yieldAllValues(customers, checkedOut):
+	with customers.engine.begin() as connection:
+		connection.execute("CREATE TABLE Town (id INTEGER PRIMARY KEY, label TEXT)")
+		connection.execute("INSERT INTO Town (label) VALUES ('Paris'), ('Rome')")
+	customers.refresh()
+
+	rowList = list(customers.yieldAllValues("Customer", stream = True, chunkSize = 1000, fromSchema = None))
+	assert len(rowList) == 2500
+	assert {row["name"] for row in rowList} == {f"customer {i}" for i in range(1, 2501)}
+
+	relationList = [relation for relation, row in customers.yieldAllValues(("Town", "Customer"), stream = True, chunkSize = 100, fromSchema = None)]
+	assert (relationList.count("Town"), relationList.count("Customer")) == (2, 2500)
+	assert checkedOut() == 0
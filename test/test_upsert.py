@@ -0,0 +1,35 @@
+# pylint: skip-file
+
+from conftest import selectRows
+
+def test_upsertTuple_counts(database, databasePath):
+	database.addTuple({"Customer": [{"id": 1, "name": "a", "age": 1}, {"id": 2, "name": "b", "age": 2}]})
+
+	answer = database.upsertTuple({"Customer": [{"id": 2, "name": "B", "age": 20}, {"id": 3, "name": "c", "age": 3}, {"id": 3, "name": "C", "age": 30}]})
+	assert answer["Customer"] == {"inserted": 1, "updated": 2, "skipped": 0}
+	assert selectRows(databasePath, "SELECT id, name, age FROM Customer ORDER BY id") == [(1, "a", 1), (2, "B", 20), (3, "C", 30)]
+
+def test_upsertTuple_noReplace(database, databasePath):
+	database.addTuple({"Customer": {"id": 1, "name": "a", "age": 1}})
+
+	answer = database.upsertTuple({"Customer": [{"id": 1, "name": "A", "age": 10}, {"id": 2, "name": "b", "age": 2}]}, replace = False)
+	assert answer["Customer"] == {"inserted": 1, "updated": 0, "skipped": 1}
+	assert selectRows(databasePath, "SELECT id, name, age FROM Customer ORDER BY id") == [(1, "a", 1), (2, "b", 2)]
+
+def test_upsertTuple_conflict(database, databasePath):
+	database.addTuple({"City": {"id": 1, "label": "Paris"}})
+
+	answer = database.upsertTuple({"City": [{"id": 5, "label": "Paris"}, {"id": 6, "label": "Rome"}]}, conflict = "label", update = ())
+	assert answer["City"] == {"inserted": 1, "updated": 0, "skipped": 1}
+	assert selectRows(databasePath, "SELECT id, label FROM City ORDER BY id") == [(1, "Paris"), (6, "Rome")]
+
+def test_upsertTuple_variableLimit(database, databasePath, limitVariables):
+	database.addTuple({"Customer": [{"id": i, "name": f"customer {i}", "age": 0} for i in range(1, 601)]}, bulk = True)
+
+	#The rows that already exist are looked up in chunks that stay under the variable limit
+	answer = database.upsertTuple({"Customer": [{"id": i, "name": f"customer {i}", "age": 1} for i in range(1, 1201)]})
+	assert answer["Customer"] == {"inserted": 600, "updated": 600, "skipped": 0}
+
+	answer = database.addTuple({"Customer": [{"id": i, "name": f"customer {i}", "age": 2} for i in range(1, 1301)]}, unique = None)
+	assert answer["Customer"] == {"inserted": 100, "updated": 0, "skipped": 1200}
+	assert selectRows(databasePath, "SELECT age, COUNT(*) FROM Customer GROUP BY age") == [(1, 1200), (2, 100)]
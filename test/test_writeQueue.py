@@ -0,0 +1,71 @@
+# pylint: skip-file
+
+import concurrent.futures
+
+import pytest
+import sqlalchemy
+
+from conftest import selectRows
+
+@pytest.fixture
+def writeQueue(database):
+	database.startWriteQueue(maxBatch = 100, maxLatency = 500)
+	yield database
+	database.stopWriteQueue()
+
+def test_writeQueue_group(writeQueue, databasePath):
+	commitList = []
+	sqlalchemy.event.listen(writeQueue.engine, "commit", commitList.append)
+
+	futureList = [writeQueue.addTuple({"Customer": {"id": i, "name": f"customer {i}"}}) for i in range(1, 21)]
+	assert all(isinstance(future, concurrent.futures.Future) for future in futureList)
+
+	writeQueue.flushWriteQueue()
+	assert all(future.done() and (future.exception() is None) for future in futureList)
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer") == [(20,)]
+
+	#The flush joins the same group
+	assert writeQueue.getWriteQueueStats() == {"operations": 21, "commits": 1, "failures": 0}
+	assert len(commitList) == 1
+
+def test_writeQueue_failure(writeQueue, databasePath):
+	futureList = [writeQueue.addTuple({"City": {"id": i, "label": "same" if (i in (2, 4)) else f"city {i}"}}) for i in range(1, 6)]
+	concurrent.futures.wait(futureList)
+
+	#Only the write that broke the unique constraint gets an error; the group is replayed one write at a time to find it
+	assert [future.exception() is None for future in futureList] == [True, True, True, False, True]
+	assert isinstance(futureList[3].exception(), sqlalchemy.exc.IntegrityError)
+	assert selectRows(databasePath, "SELECT id FROM City ORDER BY id") == [(1,), (2,), (3,), (5,)]
+
+	stats = writeQueue.getWriteQueueStats()
+	assert (stats["operations"], stats["failures"]) == (5, 1)
+	assert stats["commits"] == 4
+
+def test_writeQueue_inline(writeQueue, databasePath):
+	#Changes that wait for saveDatabase() must stay on this thread's transaction
+	answer = writeQueue.addTuple({"Customer": {"id": 1, "name": "a"}}, applyChanges = False)
+	assert not isinstance(answer, concurrent.futures.Future)
+	assert not isinstance(writeQueue.addTuple({"Customer": {"id": 2, "name": "b"}}), concurrent.futures.Future)
+	writeQueue.saveDatabase()
+
+	with writeQueue.transaction():
+		assert not isinstance(writeQueue.addTuple({"Customer": {"id": 3, "name": "c"}}), concurrent.futures.Future)
+
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer") == [(3,)]
+	assert writeQueue.getWriteQueueStats()["operations"] == 0
+
+def test_writeQueue_stop(database, databasePath):
+	database.startWriteQueue(maxLatency = 500)
+	writeQueue = database.writeQueue
+	future = database.addTuple({"Customer": {"id": 1, "name": "a"}})
+
+	#Stopping waits for what was already queued
+	database.stopWriteQueue()
+	assert future.done()
+	assert selectRows(databasePath, "SELECT COUNT(*) FROM Customer") == [(1,)]
+
+	assert database.writeQueue is None
+	assert database.getWriteQueueStats() == {"operations": 0, "commits": 0, "failures": 0}
+	assert not isinstance(database.addTuple({"Customer": {"id": 2, "name": "b"}}), concurrent.futures.Future)
+	with pytest.raises(RuntimeError):
+		writeQueue.submit(print)